@@ -0,0 +1,352 @@
+"""Sustitutos de `nmcli`, `ip`, `netsh`, `ipconfig` y `getmac` para benchmarks.
+
+`install(bin_dir)` genera pequeños ejecutables en `bin_dir` que delegan en
+`main(tool)` de este módulo. Su comportamiento se controla por variables de
+entorno, de modo que el harness puede anteponer `bin_dir` al PATH y ejecutar
+el analizador real sin tocar su código:
+
+    WIFI_BENCH_PROFILES   número de perfiles Wi‑Fi simulados (por defecto 10)
+    WIFI_BENCH_LATENCY    segundos de espera por invocación (por defecto 0)
+    WIFI_BENCH_SPAWN_LOG  archivo donde se anota una línea por invocación
+"""
+
+import json
+import os
+import stat
+import sys
+import time
+
+TOOLS = ('nmcli', 'ip', 'netsh', 'ipconfig', 'getmac')
+
+WIFI_DEVICES = ('wlan0', 'wlan1')
+
+
+def profile_names(count: int) -> list[str]:
+    return [f"Red-{i:04d}" for i in range(count)]
+
+
+def profile_uuid(index: int) -> str:
+    return f"00000000-0000-4000-8000-{index:012d}"
+
+
+def profile_psk(name: str) -> str:
+    return f"clave-{name.lower()}"
+
+
+def install(bin_dir: str) -> list[str]:
+    """Crea un ejecutable por herramienta en `bin_dir` y devuelve sus rutas."""
+    os.makedirs(bin_dir, exist_ok=True)
+    here = os.path.dirname(os.path.abspath(__file__))
+    paths = []
+    for tool in TOOLS:
+        path = os.path.join(bin_dir, tool)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"#!{sys.executable}\n"
+                    "import sys\n"
+                    f"sys.path.insert(0, {here!r})\n"
+                    "from fake_tools import main\n"
+                    f"sys.exit(main({tool!r}))\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        paths.append(path)
+    return paths
+
+
+def write_keyfiles(directory: str, count: int) -> None:
+    """Genera keyfiles de NetworkManager equivalentes a la salida de `nmcli`."""
+    os.makedirs(directory, exist_ok=True)
+    for i, name in enumerate(profile_names(count)):
+        with open(os.path.join(directory, f"{name}.nmconnection"), 'w', encoding='utf-8') as f:
+            f.write(f"[connection]\nid={name}\nuuid={profile_uuid(i)}\ntype=wifi\n\n"
+                    f"[wifi]\nmode=infrastructure\nssid={name}\n\n"
+                    f"[wifi-security]\nkey-mgmt=wpa-psk\npsk={profile_psk(name)}\n")
+
+
+def _windows_profile_xml(name: str) -> str:
+    return ('<?xml version="1.0"?>\n'
+            '<WLANProfile xmlns="http://www.microsoft.com/networking/WLAN/profile/v1">\n'
+            f'\t<name>{name}</name>\n'
+            f'\t<SSIDConfig><SSID><name>{name}</name></SSID></SSIDConfig>\n'
+            '\t<connectionType>ESS</connectionType>\n'
+            '\t<connectionMode>auto</connectionMode>\n'
+            '\t<MSM><security>\n'
+            '\t\t<authEncryption><authentication>WPA2PSK</authentication>'
+            '<encryption>AES</encryption><useOneX>false</useOneX></authEncryption>\n'
+            '\t\t<sharedKey><keyType>passPhrase</keyType><protected>false</protected>'
+            f'<keyMaterial>{profile_psk(name)}</keyMaterial></sharedKey>\n'
+            '\t</security></MSM>\n'
+            '</WLANProfile>\n')
+
+
+# --- nmcli ---------------------------------------------------------------
+
+def _nmcli_connection_fields(index: int, name: str, secrets: bool) -> list[tuple[str, str]]:
+    return [
+        ('connection.id', name),
+        ('connection.uuid', profile_uuid(index)),
+        ('connection.type', '802-11-wireless'),
+        ('connection.autoconnect', 'yes'),
+        ('connection.timestamp', str(1700000000 + index)),
+        ('connection.metered', 'unknown'),
+        ('802-11-wireless.ssid', name),
+        ('802-11-wireless.mode', 'infrastructure'),
+        ('802-11-wireless-security.key-mgmt', 'wpa-psk'),
+        ('802-11-wireless-security.pairwise', 'ccmp'),
+        ('802-11-wireless-security.psk', profile_psk(name) if secrets else ''),
+        ('ipv4.method', 'auto'),
+        ('ipv6.method', 'auto'),
+    ]
+
+
+def _nmcli(args: list[str], names: list[str]) -> int:
+    out = sys.stdout.write
+    secrets = '-s' in args
+    terse = '-t' in args
+    fields = args[args.index('-f') + 1] if '-f' in args else None
+    getter = args[args.index('-g') + 1] if '-g' in args else None
+    rest = [a for i, a in enumerate(args)
+            if a not in ('-s', '-t', '-f', '-g') and (i == 0 or args[i - 1] not in ('-f', '-g'))]
+
+    if rest[:2] == ['connection', 'show']:
+        targets = rest[2:]
+        if not targets:
+            rows = [{'NAME': name, 'UUID': profile_uuid(i), 'TYPE': '802-11-wireless',
+                     'AUTOCONNECT': 'yes', 'TIMESTAMP': str(1700000000 + i),
+                     'FILENAME': f"/etc/NetworkManager/system-connections/{name}.nmconnection"}
+                    for i, name in enumerate(names)]
+            # Una conexión cableada para ejercitar el filtrado por tipo
+            rows.append({'NAME': 'Cableada', 'UUID': profile_uuid(999999), 'TYPE': '802-3-ethernet',
+                         'AUTOCONNECT': 'yes', 'TIMESTAMP': '0',
+                         'FILENAME': "/etc/NetworkManager/system-connections/Cableada.nmconnection"})
+            cols = (fields or 'NAME,UUID,TYPE').split(',')
+            for values in rows:
+                out(':'.join(values.get(c, '') for c in cols) + "\n")
+            return 0
+        # Pares [uuid|id] VALOR o nombres sueltos
+        selected = []
+        i = 0
+        while i < len(targets):
+            if targets[i] in ('uuid', 'id') and i + 1 < len(targets):
+                kind, value = targets[i], targets[i + 1]
+                i += 2
+            else:
+                kind, value = 'id', targets[i]
+                i += 1
+            for idx, name in enumerate(names):
+                if (kind == 'id' and name == value) or (kind == 'uuid' and profile_uuid(idx) == value):
+                    selected.append((idx, name))
+        if not selected:
+            sys.stderr.write("Error: conexión no encontrada\n")
+            return 10
+        for idx, name in selected:
+            pairs = _nmcli_connection_fields(idx, name, secrets)
+            if getter:
+                wanted = getter.split(',')
+                values = dict(pairs)
+                for key in wanted:
+                    out(values.get(key, '') + "\n")
+                continue
+            if fields:
+                wanted = fields.split(',')
+                pairs = [(key, value) for key, value in pairs if key in wanted]
+            for key, value in pairs:
+                out(f"{key}:{value}\n" if terse else f"{key + ':':<40}{value}\n")
+        return 0
+
+    if rest[:2] == ['device', 'status']:
+        if terse:
+            for dev in WIFI_DEVICES:
+                out(f"{dev}:wifi\n")
+            out("eth0:ethernet\nlo:loopback\n")
+        else:
+            out("DEVICE  TYPE      STATE      CONNECTION\n")
+            for dev in WIFI_DEVICES:
+                out(f"{dev:<7} wifi      connected  {names[0] if names else '--'}\n")
+            out("eth0    ethernet  unmanaged  --\nlo      loopback  unmanaged  --\n")
+        return 0
+
+    if rest[:2] == ['device', 'show']:
+        devs = rest[2:] or list(WIFI_DEVICES) + ['eth0']
+        for n, dev in enumerate(devs):
+            values = {
+                'GENERAL.DEVICE': dev,
+                'GENERAL.TYPE': 'wifi' if dev.startswith('wlan') else 'ethernet',
+                'GENERAL.DRIVER': 'iwlwifi' if dev.startswith('wlan') else 'e1000e',
+                'GENERAL.HWADDR': f"02:00:00:00:00:{n + 1:02X}",
+                'GENERAL.STATE': '100 (connected)',
+            }
+            if getter:
+                for key in getter.split(','):
+                    out(values.get(key, '') + "\n")
+            else:
+                cols = fields.split(',') if fields else list(values)
+                for key in cols:
+                    out(f"{key}:{values.get(key, '')}\n")
+                out("\n")
+        return 0
+
+    sys.stderr.write(f"nmcli (fake): argumentos no soportados: {args}\n")
+    return 2
+
+
+# --- ip ------------------------------------------------------------------
+
+def _ip_links() -> list[dict]:
+    links = [{'ifindex': 1, 'ifname': 'lo', 'operstate': 'UNKNOWN', 'address': '00:00:00:00:00:00',
+              'flags': ['LOOPBACK', 'UP', 'LOWER_UP'], 'mtu': 65536, 'link_type': 'loopback'}]
+    for n, dev in enumerate(('eth0',) + WIFI_DEVICES):
+        links.append({'ifindex': n + 2, 'ifname': dev, 'operstate': 'UP',
+                      'address': f"02:00:00:00:00:{n + 1:02X}",
+                      'flags': ['BROADCAST', 'MULTICAST', 'UP', 'LOWER_UP'], 'mtu': 1500,
+                      'link_type': 'ether'})
+    return links
+
+
+def _ip(args: list[str]) -> int:
+    out = sys.stdout.write
+    as_json = '-j' in args
+    brief = '-br' in args
+    rest = [a for a in args if not a.startswith('-')]
+    links = _ip_links()
+    if rest[:1] in (['address'], ['addr'], ['a']):
+        for link in links:
+            link['addr_info'] = [{'family': 'inet', 'local': f"192.168.1.{link['ifindex']}",
+                                  'prefixlen': 24}]
+        if as_json:
+            out(json.dumps(links) + "\n")
+            return 0
+        for link in links:
+            out(f"{link['ifindex']}: {link['ifname']}: <{','.join(link['flags'])}> mtu {link['mtu']} "
+                f"state {link['operstate']}\n    link/{link['link_type']} {link['address']}\n"
+                f"    inet {link['addr_info'][0]['local']}/24 scope global\n")
+        return 0
+    if rest[:1] == ['link']:
+        if as_json:
+            out(json.dumps(links) + "\n")
+            return 0
+        for link in links:
+            if brief:
+                out(f"{link['ifname']:<16} {link['operstate']:<14} {link['address']} "
+                    f"<{','.join(link['flags'])}>\n")
+            else:
+                out(f"{link['ifindex']}: {link['ifname']}: <{','.join(link['flags'])}> mtu {link['mtu']}\n"
+                    f"    link/{link['link_type']} {link['address']}\n")
+        return 0
+    if rest[:1] == ['monitor']:
+        # Dos cambios de wlan1 y luego silencio, como un `ip monitor` real en reposo
+        out("4: wlan1: <NO-CARRIER,BROADCAST,MULTICAST,UP> mtu 1500 qdisc noqueue state DOWN "
+            "group default \\    link/ether 02:00:00:00:00:03 brd ff:ff:ff:ff:ff:ff\n")
+        out("Deleted 4: wlan1    inet 192.168.1.4/24 brd 192.168.1.255 scope global wlan1\\"
+            "       valid_lft forever preferred_lft forever\n")
+        sys.stdout.flush()
+        while True:
+            time.sleep(3600)
+    sys.stderr.write(f"ip (fake): argumentos no soportados: {args}\n")
+    return 2
+
+
+# --- Windows -------------------------------------------------------------
+
+def _netsh(args: list[str], names: list[str]) -> int:
+    out = sys.stdout.write
+    lowered = [a.lower() for a in args]
+    if lowered[:3] == ['wlan', 'show', 'profiles']:
+        out("Perfiles en la interfaz Wi-Fi:\n\nPerfiles de usuario\n-------------------\n")
+        for name in names:
+            out(f"    Perfil de todos los usuarios   : {name}\n")
+        return 0
+    if lowered[:3] == ['wlan', 'show', 'profile'] and len(args) > 3:
+        name = args[3]
+        if name not in names:
+            out(f'No se encuentra el perfil "{name}" en el sistema.\n')
+            return 1
+        out(f"El perfil {name} en la interfaz Wi-Fi:\n"
+            "=======================================================================\n\n"
+            "Perfil aplicado por: Directiva de grupo\n\n"
+            "Información de perfil\n-------------------\n"
+            "    Versión                : 1\n    Tipo                   : LAN inalámbrica\n"
+            f"    Nombre                 : {name}\n"
+            "    Opciones de control    :\n        Modo de conexión   : Conectar automáticamente\n\n"
+            "Configuración de conectividad\n---------------------\n"
+            f'    Número de SSID         : 1\n    Nombre de SSID         : "{name}"\n'
+            "    Tipo de red            : Infraestructura\n\n"
+            "Configuración de seguridad\n-----------------\n"
+            "    Autenticación          : WPA2-Personal\n    Cifrado                : CCMP\n"
+            "    Clave de seguridad     : Presente\n"
+            f"    Contenido de la clave  : {profile_psk(name)}\n\n"
+            "Configuración de costos\n-------------\n    Costo                  : Sin restricciones\n")
+        return 0
+    if lowered[:3] == ['wlan', 'export', 'profile']:
+        folder = next((a.split('=', 1)[1] for a in args if a.lower().startswith('folder=')), '.')
+        for name in names:
+            with open(os.path.join(folder, f"Wi-Fi-{name}.xml"), 'w', encoding='utf-8') as f:
+                f.write(_windows_profile_xml(name))
+            out(f'El perfil "{name}" de la interfaz "Wi-Fi" se guardó correctamente.\n')
+        return 0
+    if lowered[:3] == ['wlan', 'show', 'interfaces']:
+        out("Hay 1 interfaz en el sistema:\n\n    Nombre                 : Wi-Fi\n"
+            "    Estado                 : conectado\n")
+        return 0
+    if lowered[:3] == ['wlan', 'show', 'drivers']:
+        out("Nombre de interfaz: Wi-Fi\n\n    Controlador            : Intel(R) Wi-Fi 6 AX201\n")
+        return 0
+    sys.stderr.write(f"netsh (fake): argumentos no soportados: {args}\n")
+    return 1
+
+
+def _ipconfig(args: list[str]) -> int:
+    sys.stdout.write("Configuración IP de Windows\n\n"
+                     "Adaptador de LAN inalámbrica Wi-Fi:\n\n"
+                     "   Dirección física. . . . . . . . . : 02-00-00-00-00-01\n"
+                     "   Dirección IPv4. . . . . . . . . . : 192.168.1.2\n")
+    return 0
+
+
+# Adaptadores de `getmac`: conexión, adaptador, MAC y transporte (o estado).
+GETMAC_ADAPTERS = (
+    ("Wi-Fi", "Intel(R) Wi-Fi 6 AX201 160MHz", "02-00-00-00-00-01",
+     "\\Device\\Tcpip_{00000000-0000-0000-0000-000000000001}"),
+    ("Ethernet", "Intel(R) Ethernet Connection I219-V", "02-00-00-00-00-02", "Medios desconectados"),
+)
+
+
+def _getmac(args: list[str]) -> int:
+    flags = [a.lower() for a in args]
+    if 'csv' in flags:
+        # Como `getmac /v /fo csv [/nh]`: cuatro columnas entre comillas
+        if '/nh' not in flags:
+            sys.stdout.write('"Nombre de conexión","Adaptador de red","Dirección física",'
+                             '"Nombre de transporte"\n')
+        for row in GETMAC_ADAPTERS:
+            sys.stdout.write(",".join(f'"{c}"' for c in row) + "\n")
+        return 0
+    sys.stdout.write("Dirección física    Nombre de transporte\n"
+                     "=================== ==========================\n")
+    for _name, _adapter, mac, transport in GETMAC_ADAPTERS:
+        sys.stdout.write(f"{mac:<19} {transport}\n")
+    return 0
+
+
+def main(tool: str) -> int:
+    log = os.environ.get('WIFI_BENCH_SPAWN_LOG')
+    if log:
+        with open(log, 'a', encoding='utf-8') as f:
+            f.write(tool + ' ' + ' '.join(sys.argv[1:]) + "\n")
+    latency = float(os.environ.get('WIFI_BENCH_LATENCY', '0') or 0)
+    if latency:
+        time.sleep(latency)
+    names = profile_names(int(os.environ.get('WIFI_BENCH_PROFILES', '10')))
+    args = sys.argv[1:]
+    if tool in ('netsh', 'ipconfig', 'getmac'):
+        # Las herramientas de Windows escriben en la página de códigos del sistema
+        sys.stdout.reconfigure(encoding='cp1252')
+    if tool == 'nmcli':
+        return _nmcli(args, names)
+    if tool == 'ip':
+        return _ip(args)
+    if tool == 'netsh':
+        return _netsh(args, names)
+    if tool == 'ipconfig':
+        return _ipconfig(args)
+    if tool == 'getmac':
+        return _getmac(args)
+    return 127
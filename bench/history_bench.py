@@ -0,0 +1,112 @@
+"""Benchmark del historial SQLite: inserción por ejecución y consultas.
+
+Llena una base temporal con `--runs` ejecuciones simuladas (por defecto
+cuatro al día durante seis meses) de `--profiles` perfiles e `--interfaces`
+interfaces, y mide la mediana de cada consulta de `history`.
+
+Ejemplos:
+
+    python bench/history_bench.py
+    python bench/history_bench.py --runs 2000 --profiles 200 --json
+
+Con `--max-query-ms` el proceso termina con código 1 si la mediana de
+alguna consulta supera ese límite.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from wifi_analyzer.history import HistoryStore  # noqa: E402
+from wifi_analyzer.records import InterfaceRecord, ProfileRecord  # noqa: E402
+
+
+def populate(store: HistoryStore, runs: int, profiles: int, interfaces: int) -> list[float]:
+    """Inserta las ejecuciones simuladas; devuelve los segundos de cada inserción."""
+    start = datetime(2026, 1, 1)
+    samples = []
+    for run in range(runs):
+        # Un perfil nuevo cada 10 ejecuciones y un cambio de driver a mitad del periodo
+        data = {
+            f"Red-{i:04d}": ProfileRecord(f"Red-{i:04d}", f"clave-{i}", ssid=f"Red-{i:04d}",
+                                          auth='wpa-psk', cipher='ccmp', autoconnect=True)
+            for i in range(profiles + run // 10)
+        }
+        ifaces = [InterfaceRecord(f"wlan{i}", kind='ether', state='UP', mtu=1500,
+                                  mac=f"02:00:00:00:00:{i:02x}",
+                                  driver='iwlwifi' if run < runs // 2 else 'ath9k',
+                                  addresses=(f"192.168.1.{i + 2}/24",))
+                  for i in range(interfaces)]
+        taken_at = (start + timedelta(hours=6 * run)).isoformat(timespec='seconds')
+        started = time.perf_counter()
+        store.record(data, ifaces, system='Linux', computer='bench', taken_at=taken_at)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def time_query(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark del historial SQLite")
+    parser.add_argument('--runs', type=int, default=720, help="Ejecuciones simuladas")
+    parser.add_argument('--profiles', type=int, default=50, help="Perfiles por ejecucion")
+    parser.add_argument('--interfaces', type=int, default=3, help="Interfaces por ejecucion")
+    parser.add_argument('--repeat', type=int, default=20, help="Repeticiones por consulta")
+    parser.add_argument('--max-query-ms', type=float, help="Limite de la mediana por consulta")
+    parser.add_argument('--json', action='store_true', help="Imprimir resultados en JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='wifi_history_') as workdir:
+        with HistoryStore(os.path.join(workdir, 'history.sqlite3')) as store:
+            inserts = populate(store, args.runs, args.profiles, args.interfaces)
+            queries = {
+                'runs (ultimas 50)': lambda: store.runs(limit=50),
+                'profile (todo)': lambda: store.profile_history('Red-0001'),
+                'profile (un mes)': lambda: store.profile_history(
+                    'Red-0001', '2026-03-01T00:00:00', '2026-03-31T23:59:59'),
+                'profile (punto)': lambda: store.first_seen('Red-0060'),
+                'interface (todo)': lambda: store.interface_history('wlan0'),
+            }
+            results = {
+                'runs': args.runs,
+                'rows': args.runs * (args.profiles + args.interfaces),
+                'insert_ms_median': round(statistics.median(inserts) * 1000, 3),
+                'queries_ms': {name: round(time_query(func, args.repeat), 3)
+                               for name, func in queries.items()},
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['runs']} ejecuciones, ~{results['rows']} filas; "
+              f"insercion por ejecucion: {results['insert_ms_median']} ms")
+        for name, ms in results['queries_ms'].items():
+            print(f"    {ms:>8.3f} ms  {name}")
+
+    if args.max_query_ms is not None:
+        slow = [n for n, ms in results['queries_ms'].items() if ms > args.max_query_ms]
+        for name in slow:
+            print(f"[REGRESION] {name}: mediana mayor a {args.max_query_ms} ms")
+        if slow:
+            return 1
+        print("[OK] Todas las consultas dentro del limite")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
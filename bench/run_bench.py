@@ -0,0 +1,233 @@
+"""Benchmark del analizador con herramientas del sistema simuladas.
+
+Instala sustitutos de `nmcli`, `ip`, `netsh`, `ipconfig` y `getmac` (ver
+`fake_tools.py`) al inicio del PATH y mide, por etapa y por número de
+perfiles, el tiempo total, los procesos lanzados y la memoria (pico de
+memoria Python con `tracemalloc` y pico de RSS del proceso):
+
+    analyze   WiFiAnalyzer.analyze_wifi_profiles()
+    extras    WiFiAnalyzer.collect_optional_info(refresh=True)
+    format    report.format_results(profiles_data, extra)
+
+Ejemplos:
+
+    python bench/run_bench.py --profiles 10,100,1000 --latency 0.01
+    python bench/run_bench.py --platform windows --save-baseline win
+    python bench/run_bench.py --compare win --tolerance 0.25
+    python bench/run_bench.py --fixture-mode record --fixtures /tmp/fx
+    python bench/run_bench.py --fixture-mode replay --fixtures /tmp/fx
+
+En modo `replay` las salidas grabadas se reproducen sin lanzar procesos,
+de modo que solo se mide el análisis y el renderizado.
+
+El pico de RSS es por etapa en Linux: antes de cada etapa se reinicia
+VmHWM escribiendo `5` en `/proc/self/clear_refs`. Donde eso no es posible
+se informa `ru_maxrss`, acumulado desde el inicio del proceso, y la columna
+lo marca con `*` (`rss_scope` = 'process' en JSON).
+
+Las líneas base se guardan en `bench/baselines/<nombre>.json`; con
+`--compare` el proceso termina con código 1 si alguna etapa empeora más
+de la tolerancia indicada.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import fake_tools  # noqa: E402
+from main import WiFiAnalyzer  # noqa: E402
+from wifi_analyzer import commands  # noqa: E402
+from wifi_analyzer import platform_linux  # noqa: E402
+from wifi_analyzer import report as report_mod  # noqa: E402
+
+BASELINE_DIR = os.path.join(BENCH_DIR, 'baselines')
+STAGES = ('analyze', 'extras', 'format')
+
+
+def _spawn_count(log_path: str) -> int:
+    try:
+        with open(log_path, 'r', encoding='utf-8') as f:
+            return sum(1 for _ in f)
+    except FileNotFoundError:
+        return 0
+
+
+def _reset_peak_rss() -> bool:
+    """Reinicia el pico de RSS (VmHWM) del proceso; False si no es posible."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_kib() -> int:
+    """VmHWM de `/proc/self/status` o, sin él, `ru_maxrss` (KiB en Linux)."""
+    try:
+        with open('/proc/self/status', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _measure(stage_fn, log_path: str) -> tuple[dict, object]:
+    before = _spawn_count(log_path)
+    per_stage = _reset_peak_rss()
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        value = stage_fn()
+    elapsed = time.perf_counter() - started
+    _current, peak = tracemalloc.get_traced_memory()
+    return {
+        'wall_s': round(elapsed, 4),
+        'spawns': _spawn_count(log_path) - before,
+        'py_peak_kib': round(peak / 1024, 1),
+        'rss_peak_kib': _peak_rss_kib(),
+        'rss_scope': 'stage' if per_stage else 'process',
+    }, value
+
+
+def run_case(count: int, latency: float, target: str, backend: str, workdir: str,
+             fixture_mode: str | None = None, fixtures: str | None = None) -> dict:
+    """Ejecuta las tres etapas para `count` perfiles y devuelve sus métricas."""
+    # Un directorio de fixtures por plataforma y tamaño: las salidas difieren
+    commands.configure(fixture_mode, fixtures and os.path.join(fixtures, f"{target}-{backend}-{count}"))
+    case_dir = tempfile.mkdtemp(prefix=f'case{count}_', dir=workdir)
+    log_path = os.path.join(case_dir, 'spawns.log')
+    keyfile_dir = os.path.join(case_dir, 'system-connections')
+    if backend == 'keyfile':
+        fake_tools.write_keyfiles(keyfile_dir, count)
+
+    env = {
+        'WIFI_BENCH_PROFILES': str(count),
+        'WIFI_BENCH_LATENCY': str(latency),
+        'WIFI_BENCH_SPAWN_LOG': log_path,
+        # Sin D-Bus: las mediciones comparan siempre keyfiles/nmcli simulados
+        'WIFI_ANALYZER_NM_BACKEND': 'nmcli',
+    }
+    system = 'Windows' if target == 'windows' else 'Linux'
+    with mock.patch.dict(os.environ, env), \
+            mock.patch('platform.system', return_value=system), \
+            mock.patch.object(platform_linux, 'NM_CONNECTIONS_DIR', keyfile_dir), \
+            mock.patch.object(platform_linux, 'NM_RUNTIME_CONNECTIONS_DIR', keyfile_dir), \
+            contextlib.chdir(case_dir):
+        analyzer = WiFiAnalyzer(use_cache=False)
+        results = {}
+        results['analyze'], ok = _measure(analyzer.analyze_wifi_profiles, log_path)
+        if not ok or len(analyzer.profiles_data) != count:
+            raise RuntimeError(f"analisis incompleto: {len(analyzer.profiles_data)}/{count} perfiles")
+        results['extras'], extra = _measure(lambda: analyzer.collect_optional_info(refresh=True), log_path)
+        results['format'], text = _measure(
+            lambda: report_mod.format_results(analyzer.profiles_data, extra), log_path)
+        results['format']['bytes'] = len(text.encode('utf-8'))
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Lista de regresiones (tiempo o procesos) respecto a la línea base."""
+    problems = []
+    for count, stages in current.items():
+        base_stages = baseline.get(count)
+        if not base_stages:
+            continue
+        for stage, metrics in stages.items():
+            base = base_stages.get(stage)
+            if not base:
+                continue
+            if metrics['spawns'] > base['spawns']:
+                problems.append(f"{count}/{stage}: procesos {base['spawns']} -> {metrics['spawns']}")
+            # Se ignoran variaciones absolutas menores a 5 ms (ruido)
+            if metrics['wall_s'] > base['wall_s'] * (1 + tolerance) and metrics['wall_s'] - base['wall_s'] > 0.005:
+                problems.append(f"{count}/{stage}: tiempo {base['wall_s']}s -> {metrics['wall_s']}s")
+    return problems
+
+
+def print_table(results: dict) -> None:
+    print(f"{'perfiles':>8} {'etapa':<8} {'tiempo(s)':>10} {'procesos':>9} {'py_pico(KiB)':>13} {'rss_pico(KiB)':>14}")
+    cumulative = False
+    for count, stages in results.items():
+        for stage in STAGES:
+            m = stages[stage]
+            mark = '*' if m['rss_scope'] == 'process' else ' '
+            cumulative = cumulative or mark == '*'
+            print(f"{count:>8} {stage:<8} {m['wall_s']:>10.4f} {m['spawns']:>9} "
+                  f"{m['py_peak_kib']:>13.1f} {m['rss_peak_kib']:>13}{mark}")
+    if cumulative:
+        print("* pico de RSS acumulado del proceso (no se pudo reiniciar por etapa)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark con herramientas simuladas")
+    parser.add_argument('--profiles', default='10,100,1000',
+                        help="Lista de cantidades de perfiles separadas por comas (10 a 5000)")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="Latencia simulada por invocación, en segundos")
+    parser.add_argument('--platform', choices=('linux', 'windows'), default='linux')
+    parser.add_argument('--linux-backend', choices=('nmcli', 'keyfile'), default='nmcli',
+                        help="Origen de la instantánea en Linux (keyfiles legibles o nmcli)")
+    parser.add_argument('--save-baseline', metavar='NOMBRE')
+    parser.add_argument('--compare', metavar='NOMBRE')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Empeoramiento relativo de tiempo tolerado (0.2 = 20%%)")
+    parser.add_argument('--json', action='store_true', help="Imprimir resultados en JSON")
+    parser.add_argument('--fixture-mode', choices=('record', 'replay'),
+                        help="Grabar o reproducir las salidas de los comandos")
+    parser.add_argument('--fixtures', metavar='DIR', help="Directorio de fixtures")
+    args = parser.parse_args(argv)
+    if args.fixture_mode and not args.fixtures:
+        parser.error("--fixture-mode requiere --fixtures")
+
+    counts = [int(c) for c in args.profiles.split(',') if c.strip()]
+    tracemalloc.start()
+    with tempfile.TemporaryDirectory(prefix='wifi_bench_') as workdir:
+        bin_dir = os.path.join(workdir, 'bin')
+        fake_tools.install(bin_dir)
+        path = bin_dir + os.pathsep + os.environ.get('PATH', '')
+        with mock.patch.dict(os.environ, {'PATH': path}):
+            results = {str(c): run_case(c, args.latency, args.platform, args.linux_backend, workdir,
+                                        args.fixture_mode, args.fixtures)
+                       for c in counts}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        target = os.path.join(BASELINE_DIR, f"{args.save_baseline}.json")
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': results}, f, indent=2)
+        print(f"[OK] Linea base guardada en {target}")
+
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json"), 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        problems = compare(results, baseline, args.tolerance)
+        for problem in problems:
+            print(f"[REGRESION] {problem}")
+        if problems:
+            return 1
+        print("[OK] Sin regresiones respecto a la linea base")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Benchmark de arranque: importaciones y tiempo hasta la primera salida.
+
+Mide tres cosas:
+
+    imports   `python -X importtime -c "import main"`: tiempo acumulado de
+              importación y módulos pesados que no deberían cargarse al inicio
+              (SMTP/MIME, tkinter, módulos de plataforma).
+    cli       tiempo hasta el primer byte de stdout de `python main.py ...`
+              para cada comando de `--cases` (con herramientas simuladas).
+    binary    lo mismo con el ejecutable de PyInstaller (`--binary dist/main`);
+              cada ejecución es un arranque en frío del binario.
+
+Ejemplos:
+
+    python bench/startup_bench.py
+    python bench/startup_bench.py --runs 20 --save-baseline startup
+    python bench/startup_bench.py --binary dist/main --compare startup
+
+Las líneas base se guardan en `bench/baselines/<nombre>.json`; con
+`--compare` el proceso termina con código 1 si la mediana de algún caso
+empeora más de la tolerancia indicada o si aparece un módulo pesado.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import fake_tools  # noqa: E402
+
+BASELINE_DIR = os.path.join(BENCH_DIR, 'baselines')
+
+# Módulos que `import main` no debe cargar (se importan solo al usarse).
+HEAVY_MODULES = ('smtplib', 'email.mime', 'tkinter', 'wifi_analyzer.platform_windows',
+                 'wifi_analyzer.platform_linux', 'wifi_analyzer.email_utils',
+                 'wifi_analyzer.ui', 'concurrent.futures')
+
+# Comandos medidos por defecto (separados por ';').
+DEFAULT_CASES = '--help;section getmac;--no-cache --metadata-only analyze'
+
+
+def import_profile(python: str = sys.executable) -> dict:
+    """Ejecuta `-X importtime` y devuelve el total y los módulos pesados cargados."""
+    r = subprocess.run([python, '-X', 'importtime', '-c', 'import main'],
+                       cwd=REPO_DIR, capture_output=True, text=True)
+    modules = {}
+    for line in r.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = [p.strip() for p in line[len('import time:'):].split('|')]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        modules[parts[2]] = int(parts[1])
+    heavy = sorted(m for m in modules if m.startswith(HEAVY_MODULES))
+    return {
+        'main_cumulative_ms': round(modules.get('main', 0) / 1000, 2),
+        'modules': len(modules),
+        'heavy': heavy,
+        'slowest': sorted(((m, round(us / 1000, 2)) for m, us in modules.items() if m != 'main'),
+                          key=lambda kv: -kv[1])[:10],
+    }
+
+
+def first_output_seconds(argv: list[str], env: dict) -> float:
+    """Segundos desde el lanzamiento hasta el primer byte de stdout (o el fin)."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(argv, cwd=REPO_DIR, env=env, stdin=subprocess.DEVNULL,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    proc.stdout.read(1)
+    elapsed = time.perf_counter() - started
+    proc.stdout.read()
+    proc.wait()
+    return elapsed
+
+
+def time_cases(command: list[str], cases: list[str], runs: int, env: dict) -> dict:
+    results = {}
+    for case in cases:
+        samples = [first_output_seconds(command + case.split(), env) for _ in range(runs)]
+        results[case] = {
+            'median_s': round(statistics.median(samples), 4),
+            'min_s': round(min(samples), 4),
+            'max_s': round(max(samples), 4),
+        }
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Lista de regresiones respecto a la línea base."""
+    problems = []
+    extra = set(current['imports']['heavy']) - set(baseline.get('imports', {}).get('heavy', []))
+    if extra:
+        problems.append(f"imports: nuevos modulos pesados al inicio: {', '.join(sorted(extra))}")
+    for target in ('cli', 'binary'):
+        for case, metrics in current.get(target, {}).items():
+            base = baseline.get(target, {}).get(case)
+            if not base:
+                continue
+            # Se ignoran variaciones absolutas menores a 10 ms (ruido del sistema)
+            if metrics['median_s'] > base['median_s'] * (1 + tolerance) and \
+                    metrics['median_s'] - base['median_s'] > 0.01:
+                problems.append(f"{target}/{case}: {base['median_s']}s -> {metrics['median_s']}s")
+    return problems
+
+
+def print_report(results: dict) -> None:
+    imports = results['imports']
+    print(f"import main: {imports['main_cumulative_ms']} ms, {imports['modules']} modulos")
+    print("modulos pesados cargados: " + (', '.join(imports['heavy']) or 'ninguno'))
+    for name, ms in imports['slowest']:
+        print(f"    {ms:>8.2f} ms  {name}")
+    print(f"\n{'destino':<8} {'comando':<40} {'mediana(s)':>11} {'min(s)':>8} {'max(s)':>8}")
+    for target in ('cli', 'binary'):
+        for case, m in results.get(target, {}).items():
+            print(f"{target:<8} {case[:40]:<40} {m['median_s']:>11.4f} {m['min_s']:>8.4f} {m['max_s']:>8.4f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de arranque")
+    parser.add_argument('--runs', type=int, default=10, help="Ejecuciones por comando")
+    parser.add_argument('--cases', default=DEFAULT_CASES,
+                        help="Comandos a medir separados por ';'")
+    parser.add_argument('--binary', metavar='RUTA',
+                        help="Ejecutable de PyInstaller a medir en frío (ej. dist/main)")
+    parser.add_argument('--save-baseline', metavar='NOMBRE')
+    parser.add_argument('--compare', metavar='NOMBRE')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Empeoramiento relativo tolerado (0.25 = 25%%)")
+    parser.add_argument('--json', action='store_true', help="Imprimir resultados en JSON")
+    args = parser.parse_args(argv)
+
+    cases = [c.strip() for c in args.cases.split(';') if c.strip()]
+    results = {'imports': import_profile()}
+    with tempfile.TemporaryDirectory(prefix='wifi_startup_') as workdir:
+        bin_dir = os.path.join(workdir, 'bin')
+        fake_tools.install(bin_dir)
+        env = dict(os.environ,
+                   PATH=bin_dir + os.pathsep + os.environ.get('PATH', ''),
+                   WIFI_ANALYZER_NM_BACKEND='nmcli',
+                   XDG_CACHE_HOME=os.path.join(workdir, 'cache'))
+        results['cli'] = time_cases([sys.executable, 'main.py'], cases, args.runs, env)
+        if args.binary:
+            results['binary'] = time_cases([os.path.abspath(args.binary)], cases, args.runs, env)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        target = os.path.join(BASELINE_DIR, f"{args.save_baseline}.json")
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"[OK] Linea base guardada en {target}")
+
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json"), 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline, args.tolerance)
+        for problem in problems:
+            print(f"[REGRESION] {problem}")
+        if problems:
+            return 1
+        print("[OK] Sin regresiones respecto a la linea base")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,102 +4,149 @@ Analiza perfiles de redes Wi‑Fi y permite enviar un informe por correo electr
 USO AUTORIZADO: Herramienta con fines educativos. Úsela únicamente en equipos propios o con autorización expresa del titular.
 """
 
+import argparse
+import contextlib
 import os
 import platform
 import sys
-from wifi_analyzer import platform_windows as win_mod
-from wifi_analyzer import platform_linux as lin_mod
+import time
+# Los módulos de plataforma, la caché, SMTP/MIME y tkinter se importan al
+# usarse: `--help` no carga ninguno y el análisis no carga SMTP ni tkinter.
 from wifi_analyzer import report as report_mod
-from wifi_analyzer import email_utils
+from wifi_analyzer import workers
+from wifi_analyzer import formatters
+from wifi_analyzer import trace
+from wifi_analyzer.records import ProfileRecord, coerce as coerce_record
+
+# Tiempo máximo (segundos) para extraer la clave de un único perfil.
+PASSWORD_TIMEOUT = 20
+# Vigencia (segundos) de las secciones opcionales recolectadas en la sesión.
+SECTION_TTL = 300
+# Plazo global (segundos) para recolectar las secciones opcionales en paralelo.
+SECTION_TIMEOUT = 45
+# Valor mostrado en lugar de la clave en el modo solo metadatos.
+METADATA_ONLY_VALUE = formatters.METADATA_ONLY_VALUE
 
 
 class WiFiAnalyzer:
-    def __init__(self):
+    def __init__(self, max_workers: int = workers.DEFAULT_MAX_WORKERS,
+                 password_timeout: float | None = PASSWORD_TIMEOUT,
+                 use_cache: bool = True, section_ttl: float = SECTION_TTL,
+                 section_timeout: float | None = SECTION_TIMEOUT,
+                 metadata_only: bool = False):
         self.profiles_data = {}
+        # Metadatos por perfil para salidas estructuradas: auth, origen y tiempo
+        self.profiles_meta = {}
+        # Caché persistente y cifrada de claves entre ejecuciones.
+        self.cache = None
+        if use_cache:
+            from wifi_analyzer.cache import SnapshotCache
+            self.cache = SnapshotCache()
+        # Concurrencia de la extracción de claves (1 = modo serie).
+        self.max_workers = max_workers
+        self.password_timeout = password_timeout
+        # Secciones opcionales de la sesión: {seccion: (instante, contenido)}
+        self._sections = {}
+        self.section_ttl = section_ttl
+        self.section_timeout = section_timeout
+        # Instantánea en bloque de conexiones (Linux) reutilizada por las exportaciones.
+        self._snapshot = None
+        # Solo inventario (SSID, seguridad, autoconexión, último uso): nunca pide claves.
+        self.metadata_only = metadata_only
         
-    def collect_optional_info(self):
-        """Recolecta información adicional opcional (solo Windows)."""
-        try:
-            sysname = platform.system()
-            extra = {}
-            if sysname == 'Windows':
-                extra['interfaces'] = win_mod.get_interfaces()
-                extra['drivers'] = win_mod.get_drivers()
-                extra['ipconfig'] = win_mod.get_ipconfig_all()
-                extra['getmac'] = win_mod.get_mac_addresses()
+    def _fetch_section(self, section: str) -> str:
+        """Ejecuta los comandos del sistema para una sección opcional."""
+        if platform.system() == 'Windows':
+            from wifi_analyzer import platform_windows as win_mod
+            if section == 'interfaces':
+                return win_mod.get_interfaces()
+            if section == 'drivers':
+                return win_mod.get_drivers()
+            if section == 'ipconfig':
+                return win_mod.get_ipconfig_all()
+            if section == 'getmac':
+                return win_mod.get_mac_addresses()
+            if section == 'exports':
                 # Exportar perfiles a un directorio local (Windows)
                 export_dir = os.path.join(os.getcwd(), 'wifi_exports')
                 os.makedirs(export_dir, exist_ok=True)
-                extra['exports'] = win_mod.export_profiles(export_dir)
-            else:
-                # Equivalentes en Linux
-                extra['interfaces'] = lin_mod.get_interfaces()
-                extra['drivers'] = lin_mod.get_drivers()
-                extra['ipconfig'] = lin_mod.get_ipconfig_all()
-                extra['getmac'] = lin_mod.get_mac_addresses()
-                extra['exports'] = lin_mod.export_profiles()
+                return win_mod.export_profiles(export_dir, key_clear=not self.metadata_only)
+        else:
+            # Equivalentes en Linux
+            from wifi_analyzer import platform_linux as lin_mod
+            if section == 'interfaces':
+                return lin_mod.get_interfaces()
+            if section == 'drivers':
+                return lin_mod.get_drivers()
+            if section == 'ipconfig':
+                return lin_mod.get_ipconfig_all()
+            if section == 'getmac':
+                return lin_mod.get_mac_addresses()
+            if section == 'exports':
+                # En modo solo metadatos no se reutiliza la instantánea con secretos
+                if self.metadata_only:
+                    return lin_mod.export_profiles(secrets=False)
+                return lin_mod.export_profiles(snapshot=self._snapshot)
+        return ""
+
+    @trace.traced('extras')
+    def collect_optional_info(self, refresh: bool = False):
+        """Recolecta la información adicional opcional (secciones en caché).
+
+        Las secciones se consultan en paralelo; las que no terminan dentro de
+        `section_timeout` se omiten y el reporte se genera con el resto.
+        """
+        try:
+            tasks = {
+                section: (lambda s=section: self.get_optional_section(s, refresh=refresh)[1])
+                for section in report_mod.SECTION_KEYS
+            }
+            extra = workers.gather(tasks, timeout=self.section_timeout)
+            for section in tasks:
+                if section not in extra:
+                    print(f"[WARN] Seccion omitida (tiempo agotado): {section}")
             return extra
         except Exception:
             return {}
 
-    def get_optional_section(self, section: str) -> tuple[str, str]:
+    def refresh_optional_info(self):
+        """Descarta las secciones en caché; se recolectarán en el próximo acceso."""
+        self._sections.clear()
+
+    def get_optional_section(self, section: str, refresh: bool = False) -> tuple[str, str]:
         """Obtiene una única sección opcional por nombre y su título.
 
         Secciones válidas: 'interfaces', 'drivers', 'ipconfig', 'getmac', 'exports'.
+        El contenido se recolecta en el primer acceso y se reutiliza durante
+        `section_ttl` segundos salvo que se pida `refresh=True`.
 
         Retorna: (titulo, contenido). Si no hay contenido, devuelve cadena vacía.
         """
-        sysname = platform.system()
-        title = ""
-        content = ""
+        title = report_mod.section_title(platform.system(), section)
+        if not title:
+            return "", ""
+        # La exportación depende del modo: la copia con claves no se sirve sin ellas
+        key = (section, self.metadata_only) if section == 'exports' else section
+        cached = self._sections.get(key)
+        if not refresh and cached and time.monotonic() - cached[0] < self.section_ttl:
+            return title, cached[1]
         try:
-            if sysname == 'Windows':
-                if section == 'interfaces':
-                    title = "[netsh wlan show interfaces]"
-                    content = win_mod.get_interfaces()
-                elif section == 'drivers':
-                    title = "[netsh wlan show drivers]"
-                    content = win_mod.get_drivers()
-                elif section == 'ipconfig':
-                    title = "[ipconfig /all]"
-                    content = win_mod.get_ipconfig_all()
-                elif section == 'getmac':
-                    title = "[getmac]"
-                    content = win_mod.get_mac_addresses()
-                elif section == 'exports':
-                    title = "[netsh wlan export profile]"
-                    export_dir = os.path.join(os.getcwd(), 'wifi_exports')
-                    os.makedirs(export_dir, exist_ok=True)
-                    content = win_mod.export_profiles(export_dir)
-            else:
-                if section == 'interfaces':
-                    title = "[nmcli device status]"
-                    content = lin_mod.get_interfaces()
-                elif section == 'drivers':
-                    title = "[nmcli -t -f DEVICE,TYPE,GENERAL.DRIVER,GENERAL.HWADDR device show]"
-                    content = lin_mod.get_drivers()
-                elif section == 'ipconfig':
-                    title = "[ip address]"
-                    content = lin_mod.get_ipconfig_all()
-                elif section == 'getmac':
-                    title = "[ip -br link]"
-                    content = lin_mod.get_mac_addresses()
-                elif section == 'exports':
-                    title = "[nmcli connection show <NAME>]"
-                    content = lin_mod.export_profiles()
+            content = self._fetch_section(section) or ""
         except Exception:
             content = ""
-        return title, (content or "")
+        self._sections[key] = (time.monotonic(), content)
+        return title, content
 
     def get_wifi_profiles(self):
         """Obtiene la lista de perfiles Wi-Fi guardados en el sistema"""
         try:
             print("[INFO] Obteniendo perfiles Wi-Fi...")
-            system_name = platform.system()
-            if system_name == 'Windows':
-                profiles = win_mod.get_profiles()
-            else:
-                profiles = lin_mod.get_profiles()
+            # El listado nunca pide claves: la exportación con secretos solo se
+            # hace después, para los perfiles que la caché no resolvió.
+            profiles = self._platform_module().get_profiles()
+            if not profiles:
+                # Idioma no reconocido u otra falla del listado: inventario en bloque sin secretos
+                profiles = list(self.load_inventory())
 
             print(f"[OK] Encontrados {len(profiles)} perfiles Wi-Fi")
             return profiles
@@ -108,23 +155,97 @@ class WiFiAnalyzer:
             print(f"[ERROR] Error obteniendo perfiles: {str(e)}")
             return []
     
-    def get_wifi_password(self, profile_name):
-        """Extrae la contrasena de un perfil Wi-Fi especifico"""
+    def get_wifi_record(self, profile_name, timeout: float | None = None) -> ProfileRecord:
+        """Consulta un perfil Wi-Fi y devuelve su clave y atributos en un registro"""
         try:
             print(f"[INFO] Extrayendo contrasena para: {profile_name}")
-            system_name = platform.system()
-            if system_name == 'Windows':
-                return win_mod.get_password(profile_name)
-            else:
-                return lin_mod.get_password(profile_name)
+            return self._platform_module().get_record(profile_name, timeout=timeout)
                 
         except Exception as e:
             print(f"[ERROR] Error extrayendo contrasena para {profile_name}: {str(e)}")
-            return "Error al obtener"
+            return ProfileRecord(profile_name, "Error al obtener")
+
+    def get_wifi_password(self, profile_name, timeout: float | None = None):
+        """Extrae la contrasena de un perfil Wi-Fi especifico"""
+        return self.get_wifi_record(profile_name, timeout=timeout).key
     
-    def analyze_wifi_profiles(self):
-        """Funcion principal que orquesta el analisis completo"""
+    def _platform_module(self):
+        if platform.system() == 'Windows':
+            from wifi_analyzer import platform_windows as mod
+        else:
+            from wifi_analyzer import platform_linux as mod
+        return mod
+
+    def load_snapshot(self) -> dict:
+        """Consulta en bloque todos los perfiles (una exportación/consulta)."""
+        try:
+            self._snapshot = self._platform_module().get_snapshot(timeout=self.password_timeout)
+        except Exception as e:
+            print(f"[WARN] Extraccion en bloque no disponible: {str(e)}")
+            self._snapshot = {}
+        return self._snapshot
+
+    def get_bulk_records(self, profiles) -> dict:
+        """Obtiene en una sola pasada los registros que la plataforma permita.
+
+        Retorna:
+            {perfil: ProfileRecord} para los perfiles resueltos; los ausentes
+            deben extraerse individualmente.
+        """
+        snapshot = self._snapshot if self._snapshot is not None else self.load_snapshot()
+        try:
+            return self._platform_module().get_records(profiles, snapshot=snapshot)
+        except Exception as e:
+            print(f"[WARN] Extraccion en bloque no disponible: {str(e)}")
+            return {}
+
+    def load_inventory(self) -> dict:
+        """Consulta en bloque los metadatos de todos los perfiles, sin secretos."""
+        try:
+            return self._platform_module().get_inventory(timeout=self.password_timeout)
+        except Exception as e:
+            print(f"[ERROR] Error obteniendo inventario: {str(e)}")
+            return {}
+
+    def _analyze_metadata(self, on_progress=None) -> bool:
+        """Modo solo metadatos: una consulta en bloque que sustituye al listado."""
+        print("[INFO] Obteniendo inventario de perfiles (sin claves)...")
+        started = time.perf_counter()
+        inventory = self.load_inventory()
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        if not inventory:
+            print("[ERROR] No se encontraron perfiles Wi-Fi")
+            return False
+        print(f"[OK] Encontrados {len(inventory)} perfiles Wi-Fi")
+
+        total = len(inventory)
+        for done, (profile, info) in enumerate(inventory.items(), start=1):
+            record = ProfileRecord(profile, METADATA_ONLY_VALUE, **info)
+            self.profiles_data[profile] = record
+            self.profiles_meta[profile] = {'source': 'metadata', 'elapsed_ms': elapsed_ms}
+            if on_progress is not None:
+                on_progress(profile, record, done, total)
+        print("[OK] Analisis completado")
+        return True
+
+    @trace.traced('analyze')
+    def analyze_wifi_profiles(self, on_progress=None, cancel_event=None):
+        """Funcion principal que orquesta el analisis completo
+
+        Parametros:
+            on_progress: Callback opcional `(perfil, clave, hechos, total)`
+                         invocado a medida que se resuelve cada perfil
+                         (puede llamarse desde hilos del pool).
+            cancel_event: `threading.Event` opcional; si se activa, los
+                          perfiles aun no consultados se omiten.
+        """
         print("[INFO] Iniciando analisis de perfiles Wi-Fi...")
+        self._snapshot = None
+        # Sin restos del análisis anterior (perfiles eliminados u omitidos al cancelar)
+        self.profiles_data.clear()
+        self.profiles_meta.clear()
+        if self.metadata_only:
+            return self._analyze_metadata(on_progress)
         
         # Obtener perfiles
         profiles = self.get_wifi_profiles()
@@ -132,11 +253,81 @@ class WiFiAnalyzer:
         if not profiles:
             print("[ERROR] No se encontraron perfiles Wi-Fi")
             return False
+
+        total = len(profiles)
+        done = []
+
+        def _report(profile, record):
+            done.append(profile)
+            if on_progress is not None:
+                on_progress(profile, record, len(done), total)
+
+        def _cancelled():
+            return cancel_event is not None and cancel_event.is_set()
         
-        # Extraer contrasenas para cada perfil
+        # Perfiles sin cambios desde la ultima ejecucion se sirven de la cache
+        signatures = {}
+        found = {}
+        if self.cache is not None:
+            try:
+                signatures = self._platform_module().get_profile_signatures(profiles)
+                found = self.cache.lookup(profiles, signatures)
+            except Exception as e:
+                print(f"[WARN] Cache no disponible: {str(e)}")
+            if found:
+                print(f"[INFO] {len(found)} perfiles sin cambios servidos desde cache")
+                for profile, record in found.items():
+                    self.profiles_meta[profile] = {'source': 'cache', 'elapsed_ms': 0.0}
+                    _report(profile, record)
+
+        # Luego la extraccion en bloque; el resto en paralelo (pool acotado)
+        pending = [p for p in profiles if p not in found]
+        if pending and not _cancelled():
+            started = time.perf_counter()
+            bulk = self.get_bulk_records(pending)
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+            found.update(bulk)
+            for profile, record in bulk.items():
+                self.profiles_meta[profile] = {'source': 'bulk', 'elapsed_ms': elapsed_ms}
+                _report(profile, record)
+            pending = [p for p in pending if p not in bulk]
+
+        def _extract(profile):
+            if _cancelled():
+                return None
+            started = time.perf_counter()
+            record = self.get_wifi_record(profile, timeout=self.password_timeout)
+            self.profiles_meta[profile] = {
+                'source': 'query',
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+            }
+            return record
+
+        def _on_result(profile, record):
+            if record is not None:
+                _report(profile, coerce_record(profile, record))
+
+        records = workers.map_bounded(
+            _extract,
+            pending,
+            max_workers=self.max_workers,
+            default="Error al obtener",
+            on_result=_on_result,
+        )
+        found.update((p, coerce_record(p, r)) for p, r in zip(pending, records) if r is not None)
         for profile in profiles:
-            password = self.get_wifi_password(profile)
-            self.profiles_data[profile] = password
+            if profile in found:
+                self.profiles_data[profile] = found[profile]
+
+        if _cancelled():
+            print("[INFO] Analisis cancelado")
+            return False
+
+        if self.cache is not None:
+            try:
+                self.cache.store(self.profiles_data, signatures)
+            except Exception as e:
+                print(f"[WARN] No se pudo actualizar la cache: {str(e)}")
         
         print("[OK] Analisis completado")
         return True
@@ -144,17 +335,85 @@ class WiFiAnalyzer:
     def format_results(self, include_extra: bool = False):
         """Formatea los resultados para el correo electronico"""
         extra = self.collect_optional_info() if include_extra else None
-        return report_mod.format_results(self.profiles_data, extra)
+        with trace.stage('format'):
+            return report_mod.format_results(
+                self.profiles_data, extra,
+                inventory=formatters.metadata_inventory(self.profiles_data, self.profiles_meta))
     
+    def get_interface_records(self) -> list:
+        """Interfaces de red como `InterfaceRecord` (lista vacía si fallan los comandos)."""
+        try:
+            return self._platform_module().get_interface_records()
+        except Exception as e:
+            print(f"[WARN] No se pudieron leer las interfaces: {str(e)}")
+            return []
+
+    @trace.traced('history')
+    def record_history(self, include_interfaces: bool = True):
+        """Guarda el análisis actual en el historial SQLite local.
+
+        Retorna el identificador de la ejecución, o None si no se pudo guardar.
+        """
+        from wifi_analyzer.history import HistoryStore
+
+        interfaces = self.get_interface_records() if include_interfaces else ()
+        system_name = platform.system()
+        try:
+            with HistoryStore() as store:
+                run_id = store.record(self.profiles_data, interfaces, system=system_name,
+                                      computer=report_mod.host_info(system_name)[0],
+                                      metadata_only=self.metadata_only)
+        except Exception as e:
+            print(f"[ERROR] No se pudo guardar el historial: {str(e)}")
+            return None
+        print(f"[OK] Ejecucion {run_id} guardada en el historial "
+              f"({len(self.profiles_data)} perfiles, {len(interfaces)} interfaces)")
+        return run_id
+
+    @trace.traced('diff')
+    def diff_against_fingerprint(self, include_interfaces: bool = True) -> dict:
+        """Compara el análisis actual con la huella del anterior y la reemplaza.
+
+        Retorna el resultado de `fingerprint.diff` (añadidos, eliminados y
+        modificados). Sin huella previa todo aparece como añadido.
+        """
+        from wifi_analyzer import fingerprint
+
+        store = fingerprint.FingerprintStore()
+        salt = store.salt()
+        previous = store.load()
+        interfaces = self.get_interface_records() if include_interfaces else ()
+        current = fingerprint.build(self.profiles_data, interfaces, salt)
+        changes = fingerprint.diff(previous, current, interfaces=include_interfaces)
+        try:
+            store.save(fingerprint.carry_over(previous, current, include_interfaces), salt)
+        except OSError as e:
+            print(f"[WARN] No se pudo guardar la huella: {str(e)}")
+        return changes
+
+    @trace.traced('send')
     def send_email(self, smtp_server, smtp_port, email_user, email_password, 
-                   recipient_email, subject="Reporte Analisis Wi-Fi", include_extra: bool = False):
-        """Envia el reporte por correo electronico usando SMTP"""
+                   recipient_email, subject="Reporte Analisis Wi-Fi", include_extra: bool = False,
+                   compress: str | None = None):
+        """Envia el reporte por correo electronico usando SMTP
+
+        Con `compress` ('gzip' o 'zip') el cuerpo lleva solo un resumen y el
+        reporte completo va como adjunto comprimido.
+        """
         try:
             print("[INFO] Preparando envio de correo...")
-            message_body = self.format_results(include_extra=include_extra)
+            from wifi_analyzer import email_utils
+            extra = self.collect_optional_info() if include_extra else None
+            with trace.stage('format'):
+                message_body = report_mod.format_results(
+                    self.profiles_data, extra,
+                    inventory=formatters.metadata_inventory(self.profiles_data, self.profiles_meta))
+                summary = formatters.format_summary(self.profiles_data, extra) if compress else None
             print(f"[INFO] Conectando a servidor SMTP: {smtp_server}:{smtp_port}")
-            ok = email_utils.send_email(smtp_server, smtp_port, email_user, email_password,
-                                        recipient_email, subject, message_body)
+            with trace.stage('smtp'):
+                ok = email_utils.send_email(smtp_server, smtp_port, email_user, email_password,
+                                            recipient_email, subject, message_body,
+                                            compress=compress, summary=summary)
             if ok:
                 print("[OK] Correo enviado exitosamente")
                 return True
@@ -164,16 +423,29 @@ class WiFiAnalyzer:
             print(f"[ERROR] Error enviando correo: {str(e)}")
             return False
     
-    def show_results(self, include_extra: bool = False):
+    def write_results(self, sink, include_extra: bool = False, fmt: str = 'text'):
+        """Escribe el reporte directamente en `sink` (archivo, stdout, etc.)
+
+        `fmt` selecciona el formateador: 'text', 'json', 'jsonl' o 'csv'.
+        """
+        extra = self.collect_optional_info() if include_extra else None
+        with trace.stage('format'):
+            formatters.write(fmt, sink, self.profiles_data, extra, self.profiles_meta)
+
+    def show_results(self, include_extra: bool = False, fmt: str = 'text'):
         """Muestra los resultados en pantalla"""
-        print("\n" + self.format_results(include_extra=include_extra))
+        sys.stdout.write("\n")
+        self.write_results(sys.stdout, include_extra=include_extra, fmt=fmt)
+        sys.stdout.write("\n")
     
-    def save_to_file(self, filename="wifi_results.txt", include_extra: bool = False):
+    @trace.traced('save')
+    def save_to_file(self, filename="wifi_results.txt", include_extra: bool = False, fmt: str = 'text'):
         """Guarda los resultados en un archivo"""
         try:
-            results = self.format_results(include_extra=include_extra)
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(results)
+            # newline='' evita lineas en blanco extra del modulo csv en Windows
+            newline = '' if fmt == 'csv' else None
+            with open(filename, 'w', encoding='utf-8', newline=newline) as f:
+                self.write_results(f, include_extra=include_extra, fmt=fmt)
             print(f"[OK] Resultados guardados en: {filename}")
             return True
         except Exception as e:
@@ -181,17 +453,242 @@ class WiFiAnalyzer:
             return False
 
 
-def main():
+# Codigos de salida del modo no interactivo
+EXIT_OK = 0
+EXIT_NO_PROFILES = 1
+EXIT_USAGE = 2          # argparse usa 2 para errores de argumentos
+EXIT_IO_ERROR = 3
+EXIT_EMPTY_SECTION = 4
+EXIT_CHANGES = 5        # diff: hay cambios respecto al analisis anterior
+EXIT_NOT_FOUND = 6      # history: sin registros para la consulta
+EXIT_UNSUPPORTED = 7    # monitor: sin fuente de eventos en este sistema
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Opciones de linea de comandos.
+
+    Sin subcomando se abre el menu interactivo; con `analyze`, `save`,
+    `section`, `diff`, `history` o `monitor` el programa nunca lee de stdin y termina con un codigo de
+    salida significativo.
+    """
+    parser = argparse.ArgumentParser(description="Analizador de perfiles Wi-Fi")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="No leer ni escribir la cache de perfiles")
+    parser.add_argument('--clear-cache', action='store_true',
+                        help="Invalidar la cache antes del analisis")
+    parser.add_argument('--format', choices=sorted(formatters.FORMATTERS), default='text',
+                        help="Formato del reporte mostrado/guardado (por defecto: text)")
+    parser.add_argument('--metadata-only', action='store_true',
+                        help="Solo inventario (SSID, seguridad, autoconexion, ultimo uso) "
+                             "sin solicitar ninguna clave")
+    parser.add_argument('--workers', type=int, default=workers.DEFAULT_MAX_WORKERS,
+                        help="Consultas simultaneas por perfil (1 = modo serie)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Medir comandos y etapas: resumen en stderr y linea de tiempo "
+                             "Chrome Trace (ver --trace-out)")
+    parser.add_argument('--trace-out', default='wifi_trace.json', metavar='TRAZA',
+                        help="Archivo de la linea de tiempo de --profile "
+                             "(por defecto wifi_trace.json)")
+
+    sub = parser.add_subparsers(dest='command', metavar='COMANDO')
+    p_analyze = sub.add_parser('analyze', help="Analizar y escribir el reporte en stdout")
+    p_save = sub.add_parser('save', help="Analizar y guardar el reporte en un archivo")
+    p_save.add_argument('--out', required=True, help="Archivo de salida")
+    for p in (p_analyze, p_save):
+        p.add_argument('--format', dest='cmd_format', choices=sorted(formatters.FORMATTERS),
+                       help="Formato del reporte (save: se deduce de la extension de --out)")
+        p.add_argument('--extra', action='store_true',
+                       help="Incluir informacion adicional del sistema")
+    p_section = sub.add_parser('section', help="Escribir una seccion opcional en stdout")
+    p_section.add_argument('name', choices=report_mod.SECTION_KEYS)
+    p_diff = sub.add_parser('diff', help="Escribir solo los cambios desde el analisis anterior")
+    p_diff.add_argument('--format', dest='cmd_format', choices=sorted(formatters.DIFF_FORMATTERS),
+                        help="Formato de la lista de cambios")
+    p_diff.add_argument('--no-interfaces', action='store_true',
+                        help="Comparar solo perfiles (sin leer las interfaces)")
+
+    p_history = sub.add_parser('history', help="Historial local de ejecuciones (SQLite)")
+    h_sub = p_history.add_subparsers(dest='history_action', metavar='ACCION', required=True)
+    h_record = h_sub.add_parser('record', help="Analizar y guardar la ejecucion en el historial")
+    h_record.add_argument('--no-interfaces', action='store_true',
+                          help="Guardar solo perfiles (sin leer las interfaces)")
+    h_runs = h_sub.add_parser('runs', help="Listar las ejecuciones guardadas")
+    h_runs.add_argument('--limit', type=int, help="Numero maximo de ejecuciones")
+    h_profile = h_sub.add_parser('profile', help="Estado de un perfil en cada ejecucion")
+    h_iface = h_sub.add_parser('interface', help="Estado de una interfaz en cada ejecucion")
+    for p in (h_profile, h_iface):
+        p.add_argument('name', help="Nombre del perfil o de la interfaz")
+        p.add_argument('--changes', action='store_true',
+                       help="Mostrar solo la primera aparicion y las ejecuciones con cambios")
+    for p in (h_runs, h_profile, h_iface):
+        p.add_argument('--since', metavar='FECHA', help="Desde (AAAA-MM-DD o ISO completo)")
+        p.add_argument('--until', metavar='FECHA', help="Hasta (una fecha sola incluye todo el dia)")
+        p.add_argument('--format', dest='cmd_format', choices=sorted(formatters.FORMATTERS),
+                       help="Formato de la tabla")
+
+    p_monitor = sub.add_parser('monitor', help="Seguir en vivo los cambios de las interfaces")
+    p_monitor.add_argument('--duration', type=float, metavar='SEGUNDOS',
+                           help="Terminar tras SEGUNDOS (por defecto, hasta Ctrl+C)")
+    p_monitor.add_argument('--events', metavar='ARCHIVO',
+                           help="Reproducir eventos grabados (formato `ip -o monitor`) "
+                                "en lugar de escuchar al sistema")
+    return parser
+
+
+def run_command(args, analyzer) -> int:
+    """Ejecuta un subcomando sin interaccion y devuelve el codigo de salida.
+
+    Los mensajes de progreso ([INFO], [OK]...) se desvian a stderr para que
+    stdout contenga solo el reporte.
+    """
+    out = sys.stdout
+    if args.command == 'section':
+        with contextlib.redirect_stdout(sys.stderr):
+            _title, content = analyzer.get_optional_section(args.name)
+        if not content.strip():
+            return EXIT_EMPTY_SECTION
+        out.write(content.rstrip() + "\n")
+        return EXIT_OK
+
+    if args.command == 'monitor':
+        return run_monitor(args, analyzer, out)
+    if args.command == 'history' and args.history_action != 'record':
+        return run_history_query(args, out)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        if not analyzer.analyze_wifi_profiles():
+            return EXIT_NO_PROFILES
+        if args.command == 'history':
+            if analyzer.record_history(include_interfaces=not args.no_interfaces) is None:
+                return EXIT_IO_ERROR
+            return EXIT_OK
+        if args.command == 'diff':
+            from wifi_analyzer.fingerprint import has_changes
+            changes = analyzer.diff_against_fingerprint(include_interfaces=not args.no_interfaces)
+            formatters.write_diff(args.cmd_format or args.format, out, changes)
+            return EXIT_CHANGES if has_changes(changes) else EXIT_OK
+        if args.command == 'analyze':
+            fmt = args.cmd_format or args.format
+            analyzer.write_results(out, include_extra=args.extra, fmt=fmt)
+            return EXIT_OK
+        fmt = args.cmd_format or formatters.format_for_path(args.out, default=args.format)
+        if not analyzer.save_to_file(args.out, include_extra=args.extra, fmt=fmt):
+            return EXIT_IO_ERROR
+        return EXIT_OK
+
+
+def run_monitor(args, analyzer, out) -> int:
+    """Muestra las interfaces y luego una línea por cambio, sin volver a consultar."""
+    from wifi_analyzer import monitor
+    from wifi_analyzer.records import format_interfaces
+
+    if args.events:
+        try:
+            source = monitor.LineEventSource.from_file(args.events)
+        except OSError as e:
+            print(f"[ERROR] No se pudieron leer los eventos: {str(e)}", file=sys.stderr)
+            return EXIT_IO_ERROR
+    else:
+        source = monitor.default_source()
+    if source is None:
+        print("[ERROR] Monitor no disponible: se requiere `ip` o `nmcli` (Linux)", file=sys.stderr)
+        return EXIT_UNSUPPORTED
+
+    mon = monitor.InterfaceMonitor(source, analyzer.get_interface_records)
+    with contextlib.redirect_stdout(sys.stderr):
+        records = mon.start()
+    out.write(format_interfaces(records, monitor.MODEL_FIELDS) + "\n\n")
+    out.flush()
+    deadline = time.monotonic() + args.duration if args.duration else None
+    try:
+        while not mon.finished:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            for change in mon.next_changes(timeout=remaining):
+                out.write(f"{time.strftime('%H:%M:%S')} {change}\n")
+            out.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mon.stop()
+    if args.events:
+        out.write("\n" + format_interfaces(mon.model.records(), monitor.MODEL_FIELDS) + "\n")
+    return EXIT_OK
+
+
+def run_history_query(args, out) -> int:
+    """Consultas `history runs|profile|interface` (no analizan ni lanzan comandos)."""
+    from wifi_analyzer import history
+
+    try:
+        since = history.parse_bound(args.since)
+        until = history.parse_bound(args.until, end=True)
+    except ValueError as e:
+        print(f"[ERROR] {str(e)}", file=sys.stderr)
+        return EXIT_USAGE
+    fmt = args.cmd_format or args.format
+    try:
+        with history.HistoryStore() as store:
+            if args.history_action == 'runs':
+                rows = store.runs(since, until, limit=args.limit)
+                columns = ('run', 'taken_at', 'system', 'computer', 'metadata_only',
+                           'profiles', 'interfaces')
+            elif args.history_action == 'profile':
+                rows = store.profile_history(args.name, since, until)
+                columns = ('run', 'taken_at') + history.PROFILE_COLUMNS
+            else:
+                rows = store.interface_history(args.name, since, until)
+                columns = ('run', 'taken_at') + history.INTERFACE_COLUMNS
+    except Exception as e:
+        print(f"[ERROR] No se pudo leer el historial: {str(e)}", file=sys.stderr)
+        return EXIT_IO_ERROR
+    if getattr(args, 'changes', False):
+        rows = history.changes_only(rows, columns[2:])
+    if not rows:
+        print("[INFO] Sin registros para la consulta", file=sys.stderr)
+        return EXIT_NOT_FOUND
+    formatters.write_table(fmt, out, rows, columns)
+    return EXIT_OK
+
+
+def main(argv=None):
     """Funcion principal"""
+    args = build_arg_parser().parse_args(argv)
+    if not args.profile:
+        return run_main(args)
+    trace.enable()
+    try:
+        return run_main(args)
+    finally:
+        print("\n[PROFILE] Resumen de tiempos", file=sys.stderr)
+        print(trace.summary(), file=sys.stderr)
+        try:
+            trace.export_chrome_trace(args.trace_out)
+            print(f"[PROFILE] Linea de tiempo guardada en: {args.trace_out}", file=sys.stderr)
+        except OSError as e:
+            print(f"[ERROR] No se pudo guardar la traza: {str(e)}", file=sys.stderr)
+
+
+def run_main(args):
+    """Ejecuta el modo no interactivo o el menu segun los argumentos."""
+    analyzer = WiFiAnalyzer(max_workers=args.workers, use_cache=not args.no_cache,
+                            metadata_only=args.metadata_only)
+    if args.clear_cache:
+        from wifi_analyzer.cache import SnapshotCache
+        SnapshotCache().invalidate()
+        print("[OK] Cache invalidada", file=sys.stderr if args.command else sys.stdout)
+    if args.command:
+        return run_command(args, analyzer)
+
     print("ANALIZADOR DE PERFILES WI-FI")
     print("SOLO PARA FINES EDUCATIVOS")
     print("="*50)
-    
-    analyzer = WiFiAnalyzer()
 
     def load_env_defaults():
         env = {}
-        for k in ("SMTP_SERVER", "PORT", "EMAIL_USER", "APP_PASSWORD", "RECIPIENT_EMAIL", "SUBJECT"):
+        for k in ("SMTP_SERVER", "PORT", "EMAIL_USER", "APP_PASSWORD", "RECIPIENT_EMAIL", "SUBJECT",
+                  "ATTACHMENT"):
             v = os.environ.get(k)
             if v:
                 env[k] = v
@@ -205,7 +702,8 @@ def main():
                             continue
                         k, v = line.split('=', 1)
                         k, v = k.strip(), v.strip().strip('"').strip("'")
-                        if k and v and k in ("SMTP_SERVER", "PORT", "EMAIL_USER", "APP_PASSWORD", "RECIPIENT_EMAIL", "SUBJECT"):
+                        if k and v and k in ("SMTP_SERVER", "PORT", "EMAIL_USER", "APP_PASSWORD", "RECIPIENT_EMAIL",
+                                             "SUBJECT", "ATTACHMENT"):
                             env.setdefault(k, v)
         except Exception:
             pass
@@ -229,17 +727,17 @@ def main():
                 if choice == "1":
                     # Solo mostrar resultados
                     inc = input("\n¿Incluir información adicional opcional? (s/n): ").strip().lower().startswith('s')
-                    analyzer.show_results(include_extra=inc)
+                    analyzer.show_results(include_extra=inc, fmt=args.format)
                     break
                     
                 elif choice == "2":
                     # Guardar en archivo
                     inc = input("\n¿Incluir información adicional opcional? (s/n): ").strip().lower().startswith('s')
-                    analyzer.show_results(include_extra=inc)
+                    analyzer.show_results(include_extra=inc, fmt=args.format)
                     filename = input("\nNombre del archivo (Enter para default): ").strip()
                     if not filename:
-                        filename = "wifi_results.txt"
-                    analyzer.save_to_file(filename, include_extra=inc)
+                        filename = "wifi_results" + formatters.EXTENSIONS[args.format]
+                    analyzer.save_to_file(filename, include_extra=inc, fmt=args.format)
                     break
                     
                 elif choice == "3":
@@ -257,6 +755,11 @@ def main():
                     email_password = _prompt("Tu contrasena", env.get("APP_PASSWORD", ""))
                     recipient = _prompt("Email destinatario", env.get("RECIPIENT_EMAIL", ""))
                     subject = env.get("SUBJECT", "Reporte Analisis Wi-Fi")
+                    compress = _prompt("Adjuntar reporte comprimido (gzip/zip, Enter = en el cuerpo)",
+                                       env.get("ATTACHMENT", "")).lower() or None
+                    if compress not in (None, 'gzip', 'zip'):
+                        print("[ERROR] Compresion invalida: use gzip o zip")
+                        break
                     try:
                         smtp_port = int(smtp_port_str)
                     except Exception:
@@ -265,7 +768,8 @@ def main():
                     
                     if all([smtp_server, smtp_port, email_user, email_password, recipient]):
                         analyzer.send_email(smtp_server, smtp_port, email_user, 
-                                          email_password, recipient, subject, include_extra=inc)
+                                          email_password, recipient, subject, include_extra=inc,
+                                          compress=compress)
                     else:
                         print("[ERROR] Faltan datos de configuracion")
                     break
@@ -312,18 +816,24 @@ def main():
     
     print("\n[OK] Programa finalizado")
     input("Presiona Enter para salir...")
+    return EXIT_OK
 
 
 if __name__ == "__main__":
-    import sys
-    # Si está empaquetado como ejecutable (PyInstaller), abrir GUI por defecto
-    if getattr(sys, 'frozen', False):
+    # En el ejecutable sin consola (PyInstaller windowed) stdout/stderr son None
+    if sys.stdout is None:
+        sys.stdout = open(os.devnull, 'w')
+    if sys.stderr is None:
+        sys.stderr = open(os.devnull, 'w')
+    # Si está empaquetado como ejecutable (PyInstaller), abrir GUI por defecto;
+    # con argumentos (`analyze`, `section`, `--help`...) se usa la CLI sin cargar Tk
+    if getattr(sys, 'frozen', False) and len(sys.argv) == 1:
         try:
             from wifi_analyzer.ui import run_gui
             run_gui(WiFiAnalyzer())
         except Exception as e:
             # Si la GUI falla, caer al modo CLI
             print(f"[WARN] No se pudo iniciar la GUI: {e}")
-            main()
+            sys.exit(main())
     else:
-        main()
\ No newline at end of file
+        sys.exit(main())
\ No newline at end of file
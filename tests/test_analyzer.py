@@ -0,0 +1,46 @@
+"""`WiFiAnalyzer.analyze_wifi_profiles` con un módulo de plataforma simulado."""
+
+import threading
+import types
+import unittest
+from unittest import mock
+
+from main import WiFiAnalyzer
+from wifi_analyzer.records import ProfileRecord
+
+
+def _platform(profiles):
+    """Módulo de plataforma mínimo: listado, sin exportación y consulta por perfil."""
+    return types.SimpleNamespace(
+        get_profiles=lambda: list(profiles),
+        get_snapshot=lambda timeout=None: {},
+        get_records=lambda names, snapshot=None: {},
+        get_record=lambda name, timeout=None: ProfileRecord(name, f"clave-{name}"),
+    )
+
+
+class AnalyzeResetTest(unittest.TestCase):
+    def _analyze(self, analyzer, profiles, cancel_event=None):
+        with mock.patch.object(analyzer, '_platform_module', return_value=_platform(profiles)), \
+                mock.patch('builtins.print'):
+            return analyzer.analyze_wifi_profiles(cancel_event=cancel_event)
+
+    def test_deleted_profiles_are_dropped(self):
+        analyzer = WiFiAnalyzer(max_workers=1, use_cache=False)
+        self.assertTrue(self._analyze(analyzer, ["A", "B"]))
+        self.assertTrue(self._analyze(analyzer, ["A"]))
+        self.assertEqual(list(analyzer.profiles_data), ["A"])
+        self.assertEqual(list(analyzer.profiles_meta), ["A"])
+
+    def test_cancelled_run_keeps_no_previous_results(self):
+        analyzer = WiFiAnalyzer(max_workers=1, use_cache=False)
+        self.assertTrue(self._analyze(analyzer, ["A", "B"]))
+        cancel = threading.Event()
+        cancel.set()
+        self.assertFalse(self._analyze(analyzer, ["A", "B"], cancel_event=cancel))
+        self.assertEqual(analyzer.profiles_data, {})
+        self.assertEqual(analyzer.profiles_meta, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""Caché cifrada de claves y firmas de cambio de los keyfiles de Linux."""
+
+import base64
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from wifi_analyzer import cache, commands, nm_dbus
+from wifi_analyzer import platform_linux as lin
+from wifi_analyzer.records import ProfileRecord
+
+KEYFILE = "[connection]\nid={name}\nuuid={uuid}\ntype=wifi\n\n[wifi]\nssid={name}\n"
+
+
+class SnapshotCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix='wifi_cache_')
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        patcher = mock.patch('platform.system', return_value='Linux')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.results = {
+            "CasaNet": ProfileRecord("CasaNet", "s3cr3t", ssid="CasaNet", auth='wpa-psk'),
+            "Cafe": ProfileRecord("Cafe", "Sin contrasena o WPS"),
+            "Fallo": ProfileRecord("Fallo", "No disponible"),
+        }
+        self.signatures = {"CasaNet": "1:10", "Cafe": "2:20", "Fallo": "3:30"}
+
+    def _store(self):
+        cache.SnapshotCache(self.dir).store(self.results, self.signatures)
+
+    def test_round_trip(self):
+        self._store()
+        hits = cache.SnapshotCache(self.dir).lookup(list(self.results), self.signatures)
+        # Los fallos transitorios no se guardan
+        self.assertEqual(sorted(hits), ["Cafe", "CasaNet"])
+        self.assertEqual(hits["CasaNet"].key, "s3cr3t")
+        self.assertEqual(hits["CasaNet"].auth, 'wpa-psk')
+
+    def test_files_are_private_and_encrypted(self):
+        self._store()
+        for name in (cache.CACHE_FILE, cache.KEY_FILE):
+            self.assertEqual(os.stat(os.path.join(self.dir, name)).st_mode & 0o777, 0o600)
+        with open(os.path.join(self.dir, cache.CACHE_FILE), 'rb') as f:
+            self.assertNotIn(b's3cr3t', f.read())
+
+    def test_changed_signature_is_a_miss(self):
+        self._store()
+        signatures = dict(self.signatures, CasaNet="1:11")
+        hits = cache.SnapshotCache(self.dir).lookup(["CasaNet", "Cafe"], signatures)
+        self.assertEqual(sorted(hits), ["Cafe"])
+        # Sin firma conocida nunca se sirve desde la caché
+        self.assertEqual(cache.SnapshotCache(self.dir).lookup(["CasaNet"], {}), {})
+
+    def test_tampered_entry_is_rejected(self):
+        self._store()
+        path = os.path.join(self.dir, cache.CACHE_FILE)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        raw = bytearray(base64.b64decode(data['profiles']["CasaNet"]['value']))
+        raw[-1] ^= 0x01
+        data['profiles']["CasaNet"]['value'] = base64.b64encode(bytes(raw)).decode('ascii')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        hits = cache.SnapshotCache(self.dir).lookup(list(self.results), self.signatures)
+        self.assertEqual(sorted(hits), ["Cafe"])
+
+    def test_other_key_cannot_decrypt(self):
+        self._store()
+        os.remove(os.path.join(self.dir, cache.KEY_FILE))
+        self.assertEqual(cache.SnapshotCache(self.dir).lookup(list(self.results), self.signatures), {})
+
+    def test_old_version_is_ignored(self):
+        self._store()
+        path = os.path.join(self.dir, cache.CACHE_FILE)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['version'] = cache.CACHE_VERSION - 1
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        self.assertEqual(cache.SnapshotCache(self.dir).lookup(list(self.results), self.signatures), {})
+
+
+class LinuxSignaturesTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix='wifi_keyfiles_')
+        self.addCleanup(tmp.cleanup)
+        self.dir = os.path.join(tmp.name, 'system-connections')
+        os.makedirs(self.dir)
+        for patcher in (
+            mock.patch.object(lin, 'NM_CONNECTIONS_DIR', self.dir),
+            mock.patch.object(lin, 'NM_RUNTIME_CONNECTIONS_DIR', os.path.join(tmp.name, 'run')),
+            mock.patch.object(nm_dbus, 'available', return_value=False),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Nombre de archivo distinto del id: renombrada, id con '/' y duplicado `-1`
+        self.files = {
+            "Casa Nueva": "Casa Vieja.nmconnection",
+            "Oficina/2": "Oficina_2.nmconnection",
+            "Cafe": "Cafe-1.nmconnection",
+        }
+        for i, (name, filename) in enumerate(self.files.items()):
+            with open(os.path.join(self.dir, filename), 'w', encoding='utf-8') as f:
+                f.write(KEYFILE.format(name=name, uuid=f"uuid-{i}"))
+
+    def _path(self, name):
+        return os.path.join(self.dir, self.files[name])
+
+    def test_signatures_follow_the_connection_id(self):
+        signatures = lin.get_profile_signatures(list(self.files) + ["Sin-Archivo"])
+        self.assertEqual(sorted(signatures), sorted(self.files))
+        before = signatures["Cafe"]
+        with open(self._path("Cafe"), 'a', encoding='utf-8') as f:
+            f.write("\n[wifi-security]\nkey-mgmt=wpa-psk\n")
+        after = lin.get_profile_signatures(["Cafe", "Casa Nueva"])
+        self.assertNotEqual(after["Cafe"], before)
+        self.assertEqual(after["Casa Nueva"], signatures["Casa Nueva"])
+
+    def test_unreadable_keyfiles_use_nmcli_filenames(self):
+        listing = "".join(f"{name}:uuid-{i}:802-11-wireless:{self._path(name)}\n"
+                          for i, name in enumerate(self.files))
+        calls = []
+
+        def fake_run(argv, timeout=None, encoding=None, reuse_for=0.0):
+            calls.append(list(argv))
+            return subprocess.CompletedProcess(argv, 0, listing, '')
+
+        with mock.patch.object(lin, '_keyfile_id', side_effect=PermissionError), \
+                mock.patch.object(commands, 'which', return_value='/usr/bin/nmcli'), \
+                mock.patch.object(commands, 'run', fake_run):
+            signatures = lin.get_profile_signatures(list(self.files))
+        self.assertEqual(sorted(signatures), sorted(self.files))
+        self.assertEqual(calls, [lin._LIST_CONNECTIONS])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Capa de comandos: unión de llamadas, reutilización y fixtures."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from wifi_analyzer import commands, trace
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, '-c', code]
+
+
+class CoalescingTest(unittest.TestCase):
+    def setUp(self):
+        commands.configure(None)
+        self.addCleanup(commands.configure, None)
+
+    def test_simultaneous_calls_share_one_process(self):
+        release = threading.Event()
+        calls = []
+
+        def fake_execute(argv, timeout, encoding):
+            calls.append(argv)
+            release.wait(5)
+            return subprocess.CompletedProcess(argv, 0, 'salida', '')
+
+        results = []
+        with mock.patch.object(commands, '_execute', fake_execute):
+            threads = [threading.Thread(target=lambda: results.append(commands.run(['nmcli', 'x'])))
+                       for _ in range(5)]
+            for t in threads:
+                t.start()
+            time.sleep(0.2)
+            release.set()
+            for t in threads:
+                t.join(5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r.stdout for r in results], ['salida'] * 5)
+        self.assertEqual(commands._inflight, {})
+
+    def test_recent_results_expire(self):
+        calls = []
+
+        def fake_execute(argv, timeout, encoding):
+            calls.append(argv)
+            return subprocess.CompletedProcess(argv, 0, str(len(calls)), '')
+
+        with mock.patch.object(commands, '_execute', fake_execute):
+            self.assertEqual(commands.run(['ip', 'a'], reuse_for=0.2).stdout, '1')
+            self.assertEqual(commands.run(['ip', 'a'], reuse_for=0.2).stdout, '1')
+            # Sin `reuse_for` siempre se lanza el proceso
+            self.assertEqual(commands.run(['ip', 'a']).stdout, '2')
+            time.sleep(0.3)
+            # Cualquier llamada descarta los resultados vencidos
+            commands.run(['ip', 'link'])
+            self.assertEqual(list(commands._recent), [])
+            self.assertEqual(commands.run(['ip', 'a'], reuse_for=0.2).stdout, '4')
+
+    def test_trace_fields(self):
+        trace.enable()
+        self.addCleanup(trace.disable)
+        commands.run(_python("print('hola')"))
+        event = trace.events()[0]
+        self.assertEqual((event['kind'], event['returncode'], event['timed_out']), ('command', 0, False))
+        self.assertEqual(event['out_bytes'], len('hola\n'))
+        self.assertNotIn('retries', event)
+
+
+class FixturesTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix='wifi_fixtures_')
+        self.addCleanup(tmp.cleanup)
+        self.fixtures = os.path.join(tmp.name, 'fixtures')
+        self.export = os.path.join(tmp.name, 'export')
+        os.makedirs(self.export)
+        self.addCleanup(commands.configure, None)
+
+    def test_record_then_replay(self):
+        # Como `netsh wlan export`: escribe un archivo en `folder=`
+        code = ("import sys, os; d = sys.argv[1].split('=', 1)[1];"
+                "open(os.path.join(d, 'perfil.xml'), 'w').write('<clave/>'); print('ok')")
+        argv = _python(code) + [f'folder={self.export}']
+        commands.configure('record', self.fixtures)
+        recorded = commands.run(argv)
+        self.assertEqual(recorded.stdout, 'ok\n')
+        self.assertEqual(os.stat(self.fixtures).st_mode & 0o777, 0o700)
+        for name in os.listdir(self.fixtures):
+            self.assertEqual(os.stat(os.path.join(self.fixtures, name)).st_mode & 0o777, 0o600)
+
+        os.remove(os.path.join(self.export, 'perfil.xml'))
+        commands.configure('replay', self.fixtures)
+        with mock.patch('subprocess.run', side_effect=AssertionError("no debe lanzar procesos")):
+            replayed = commands.run(argv)
+        self.assertEqual((replayed.returncode, replayed.stdout), (0, 'ok\n'))
+        restored = os.path.join(self.export, 'perfil.xml')
+        with open(restored, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), '<clave/>')
+        self.assertEqual(os.stat(restored).st_mode & 0o777, 0o600)
+        self.assertIsNotNone(commands.which(os.path.basename(sys.executable)))
+        self.assertIsNone(commands.which('nmcli'))
+
+    def test_missing_fixture(self):
+        commands.configure('replay', self.fixtures)
+        os.makedirs(self.fixtures)
+        self.assertEqual(commands.run(['nmcli', 'device']).returncode, 127)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""Envío por `DATA` en streaming contra un servidor SMTP local sustituto.
+
+`_StandInSMTP` es un servidor SMTP mínimo (solo biblioteca estándar) que
+acepta EHLO/MAIL/RCPT/DATA, deshace la duplicación de puntos y guarda cada
+mensaje recibido. Se envían mensajes con el reporte en el cuerpo, en gzip y
+en zip, y se comprueba que el reporte decodificado es idéntico al original,
+incluidas las líneas que empiezan por `.`.
+"""
+
+import email
+import gzip
+import io
+import smtplib
+import socketserver
+import threading
+import unittest
+import zipfile
+from email import policy
+from email.mime.text import MIMEText
+from unittest import mock
+
+from wifi_analyzer import email_utils
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        self._reply("220 stand-in ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.strip().split(b' ', 1)[0].upper()
+            if verb in (b'EHLO', b'HELO'):
+                self._reply("250 stand-in")
+            elif verb in (b'MAIL', b'RCPT', b'RSET', b'NOOP'):
+                self._reply("250 OK")
+            elif verb == b'DATA':
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                self.server.messages.append(self._read_data())
+                self._reply("250 OK")
+            elif verb == b'QUIT':
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+    def _read_data(self) -> bytes:
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line == b'.\r\n':
+                return b''.join(lines)
+            # RFC 5321, 4.5.2: se elimina el punto añadido por el cliente
+            lines.append(line[1:] if line.startswith(b'.') else line)
+
+
+class _StandInSMTP(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.messages = []
+
+
+def _report() -> str:
+    """Reporte con líneas que empiezan por punto, texto no ASCII y más de 64 KiB."""
+    lines = ["REPORTE DE PERFILES WI-FI", ".", "..", ".oculta", "...tres puntos", ""]
+    lines += [f"Red-{i:04d} | contraseña-ñ-{i} | .{i}" for i in range(4000)]
+    lines += [".", "fin."]
+    return "\n".join(lines) + "\n"
+
+
+class StreamingSMTPTest(unittest.TestCase):
+    def setUp(self):
+        self.server = _StandInSMTP()
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        self.addCleanup(self.thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.report = _report()
+
+    def _send(self, msg) -> email.message.Message:
+        host, port = self.server.server_address
+        client = smtplib.SMTP(host, port, timeout=10)
+        try:
+            client.ehlo()
+            email_utils.send_message_streaming(client, 'origen@example.org', 'destino@example.org', msg)
+        finally:
+            client.quit()
+        self.assertEqual(len(self.server.messages), 1)
+        return email.message_from_bytes(self.server.messages[0], policy=policy.default)
+
+    def _build(self, compress):
+        return email_utils.build_message('origen@example.org', 'destino@example.org',
+                                         "Reporte Wi-Fi", self.report, compress=compress,
+                                         summary="Resumen: 4000 perfiles" if compress else None)
+
+    def test_inline_report_round_trip(self):
+        received = self._send(self._build(None))
+        self.assertEqual(received['Subject'], "Reporte Wi-Fi")
+        body = received.get_body(('plain',))
+        self.assertEqual(body.get_content(), self.report)
+
+    def test_gzip_attachment_round_trip(self):
+        received = self._send(self._build('gzip'))
+        attachments = list(received.iter_attachments())
+        self.assertEqual(len(attachments), 1)
+        self.assertEqual(attachments[0].get_filename(), email_utils.ATTACHMENT_NAME + '.txt.gz')
+        data = gzip.decompress(attachments[0].get_content())
+        self.assertEqual(data.decode('utf-8'), self.report)
+        self.assertIn("Resumen: 4000 perfiles", received.get_body(('plain',)).get_content())
+
+    def test_zip_attachment_round_trip(self):
+        received = self._send(self._build('zip'))
+        attachments = list(received.iter_attachments())
+        self.assertEqual(len(attachments), 1)
+        self.assertEqual(attachments[0].get_filename(), email_utils.ATTACHMENT_NAME + '.zip')
+        with zipfile.ZipFile(io.BytesIO(attachments[0].get_content())) as zf:
+            data = zf.read(email_utils.ATTACHMENT_NAME + '.txt')
+        self.assertEqual(data.decode('utf-8'), self.report)
+
+    def test_dot_lines_in_7bit_body(self):
+        # Un cuerpo ASCII sin codificar expone los puntos al inicio de línea
+        text = "\n".join(line.encode('ascii', 'replace').decode('ascii')
+                         for line in self.report.splitlines()) + "\n"
+        msg = MIMEText(text, 'plain', 'us-ascii')
+        msg['Subject'] = "Puntos"
+        # Bloques pequeños: los puntos también quedan en los bordes entre envíos
+        with mock.patch.object(email_utils, '_SEND_CHUNK', 7):
+            received = self._send(msg)
+        self.assertIn(b'\r\n.\r\n..\r\n.oculta\r\n', self.server.messages[0])
+        self.assertEqual(received.get_content().replace('\r\n', '\n'), text)
+
+
+class DataWriterTest(unittest.TestCase):
+    def test_dot_stuffing_across_writes(self):
+        sent = []
+        writer = email_utils._DataWriter(mock.Mock(send=sent.append))
+        for piece in (b'.uno\r\n', b'do', b's\r\n.', b'tres\r\n', b'.\r\n', b'sin fin'):
+            writer.write(piece)
+        writer.close()
+        self.assertEqual(b''.join(sent), b'..uno\r\ndos\r\n..tres\r\n..\r\nsin fin\r\n.\r\n')
+
+    def test_bare_cr_is_not_a_line_start(self):
+        sent = []
+        writer = email_utils._DataWriter(mock.Mock(send=sent.append))
+        writer.write(b'uno\r.dos\r\n.tres\n\r')
+        writer.write(b'.cuatro\r\n')
+        writer.close()
+        self.assertEqual(b''.join(sent), b'uno\r.dos\r\n..tres\n\r.cuatro\r\n.\r\n')
+
+
+class SendEmailTest(unittest.TestCase):
+    def test_connection_is_closed_when_data_fails(self):
+        with mock.patch('smtplib.SMTP') as smtp_class, \
+                mock.patch.object(email_utils, 'send_message_streaming',
+                                  side_effect=smtplib.SMTPServerDisconnected("corte en DATA")), \
+                mock.patch('builtins.print'):
+            ok = email_utils.send_email('smtp.example.org', 587, 'origen@example.org', 'clave',
+                                        'destino@example.org', "Asunto", "cuerpo")
+        self.assertFalse(ok)
+        self.assertIn("corte en DATA", email_utils.get_last_error())
+        server = smtp_class.return_value
+        server.__exit__.assert_called_once()
+        server.__enter__.return_value.starttls.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Huella de `diff`: añadidos, eliminados, modificados y claves no consultadas."""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+from wifi_analyzer import fingerprint
+from wifi_analyzer.formatters import METADATA_ONLY_VALUE
+from wifi_analyzer.records import InterfaceRecord, ProfileRecord
+
+SALT = b'sal-de-prueba-16'
+
+
+def _profiles(**keys):
+    return {name: ProfileRecord(name, key, ssid=name, auth='wpa-psk', autoconnect=True)
+            for name, key in keys.items()}
+
+
+class DiffTest(unittest.TestCase):
+    def test_first_run_lists_everything_as_added(self):
+        current = fingerprint.build(_profiles(A="a", B="b"), salt=SALT)
+        changes = fingerprint.diff(None, current, interfaces=False)
+        self.assertEqual(changes['profiles']['added'], ["A", "B"])
+        self.assertIsNone(changes['since'])
+        self.assertTrue(fingerprint.has_changes(changes))
+
+    def test_added_removed_and_changed(self):
+        previous = fingerprint.build(_profiles(A="a", B="b"),
+                                     [InterfaceRecord("wlan0", state='up', mtu=1500)], SALT)
+        data = _profiles(A="otra", C="c")
+        data["A"].auth = 'sae'
+        current = fingerprint.build(data, [InterfaceRecord("wlan0", state='down', mtu=1500)], SALT)
+        changes = fingerprint.diff(previous, current)
+        self.assertEqual(changes['profiles']['added'], ["C"])
+        self.assertEqual(changes['profiles']['removed'], ["B"])
+        self.assertEqual(sorted(changes['profiles']['changed']["A"]), ['auth', 'key_hash'])
+        self.assertEqual(changes['profiles']['changed']["A"]['auth'], ('wpa-psk', 'sae'))
+        self.assertEqual(changes['interfaces']['changed'], {"wlan0": {'state': ('up', 'down')}})
+
+    def test_no_changes(self):
+        previous = fingerprint.build(_profiles(A="a"), salt=SALT)
+        current = fingerprint.build(_profiles(A="a"), salt=SALT)
+        self.assertFalse(fingerprint.has_changes(fingerprint.diff(previous, current)))
+
+    def test_last_used_is_not_compared(self):
+        old, new = _profiles(A="a"), _profiles(A="a")
+        old["A"].last_used, new["A"].last_used = '2026-01-01T10:00:00', '2026-01-02T10:00:00'
+        changes = fingerprint.diff(fingerprint.build(old, salt=SALT), fingerprint.build(new, salt=SALT))
+        self.assertFalse(fingerprint.has_changes(changes))
+
+    def test_skipped_key_is_not_a_change_and_is_carried_over(self):
+        full = fingerprint.build(_profiles(A="a"), salt=SALT)
+        metadata = fingerprint.build(_profiles(A=METADATA_ONLY_VALUE), salt=SALT)
+        self.assertEqual(metadata['profiles']["A"]['key_status'], 'skipped')
+        self.assertFalse(fingerprint.has_changes(fingerprint.diff(full, metadata)))
+
+        kept = fingerprint.carry_over(full, metadata)
+        self.assertEqual(kept['profiles']["A"]['key_hash'], full['profiles']["A"]['key_hash'])
+        # El siguiente análisis completo compara contra la última clave conocida
+        again = fingerprint.build(_profiles(A="a"), salt=SALT)
+        self.assertFalse(fingerprint.has_changes(fingerprint.diff(kept, again)))
+        changed = fingerprint.build(_profiles(A="nueva"), salt=SALT)
+        self.assertEqual(list(fingerprint.diff(kept, changed)['profiles']['changed']["A"]), ['key_hash'])
+
+    def test_interfaces_are_carried_over_when_not_read(self):
+        previous = fingerprint.build(_profiles(A="a"), [InterfaceRecord("wlan0", state='up')], SALT)
+        current = fingerprint.carry_over(previous, fingerprint.build(_profiles(A="a"), salt=SALT),
+                                         interfaces=False)
+        self.assertEqual(list(current['interfaces']), ["wlan0"])
+
+
+class DiffCommandTest(unittest.TestCase):
+    """Contrato de salida de `main.py diff`: 5 con cambios, 0 sin ellos."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix='wifi_diff_')
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        patcher = mock.patch.object(fingerprint, 'default_cache_dir', return_value=self.dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _diff(self, data, metadata_only=False):
+        argv = (['--metadata-only'] if metadata_only else []) + ['--format', 'jsonl', 'diff',
+                                                                 '--no-interfaces']
+        args = main.build_arg_parser().parse_args(argv)
+        analyzer = main.WiFiAnalyzer(use_cache=False, metadata_only=metadata_only)
+
+        def analyze():
+            analyzer.profiles_data = dict(data)
+            return True
+
+        out = io.StringIO()
+        with mock.patch.object(analyzer, 'analyze_wifi_profiles', analyze), \
+                mock.patch('sys.stdout', out), mock.patch('sys.stderr', io.StringIO()):
+            rc = main.run_command(args, analyzer)
+        return rc, [json.loads(line) for line in out.getvalue().splitlines() if line.strip()]
+
+    def test_exit_codes(self):
+        rc, _rows = self._diff(_profiles(A="a", B="b"))
+        self.assertEqual(rc, main.EXIT_CHANGES)
+        self.assertEqual(self._diff(_profiles(A="a", B="b"))[0], main.EXIT_OK)
+        # Una ejecución solo metadatos no marca las claves como cambiadas...
+        self.assertEqual(self._diff(_profiles(A=METADATA_ONLY_VALUE, B=METADATA_ONLY_VALUE),
+                                    metadata_only=True)[0], main.EXIT_OK)
+        # ...ni hace que el siguiente análisis completo las vea como nuevas
+        self.assertEqual(self._diff(_profiles(A="a", B="b"))[0], main.EXIT_OK)
+        self.assertEqual(os.stat(os.path.join(self.dir, fingerprint.FINGERPRINT_FILE)).st_mode & 0o777,
+                         0o600)
+
+        rc, rows = self._diff(_profiles(A="cambiada"))
+        self.assertEqual(rc, main.EXIT_CHANGES)
+        self.assertEqual(sorted((r['name'], r['change']) for r in rows if r['type'] == 'change'),
+                         [("A", 'changed'), ("B", 'removed')])
+        self.assertNotIn("cambiada", json.dumps(rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""Formatos de salida: texto, JSON, JSON Lines, CSV y tablas del historial."""
+
+import csv
+import io
+import json
+import unittest
+
+from wifi_analyzer import formatters
+from wifi_analyzer.formatters import METADATA_ONLY_VALUE
+from wifi_analyzer.records import InterfaceRecord, ProfileRecord, format_interfaces
+
+
+def _data():
+    return {
+        "casa": ProfileRecord("casa", "s3cr3t", ssid="casa", auth='wpa-psk', autoconnect=True),
+        "Abierta": ProfileRecord("Abierta", "Sin contrasena o WPS", auth='open'),
+        "Rota": ProfileRecord("Rota", "No disponible"),
+    }
+
+
+META = {"casa": {'source': 'export', 'elapsed_ms': 1.5}}
+
+
+class ProfileWritersTest(unittest.TestCase):
+    def _write(self, fmt, extra=None):
+        sink = io.StringIO()
+        formatters.write(fmt, sink, _data(), extra, META)
+        return sink.getvalue()
+
+    def test_json(self):
+        doc = json.loads(self._write('json', {'drivers': "driver: iwlwifi\n"}))
+        self.assertEqual(doc['schema_version'], formatters.SCHEMA_VERSION)
+        self.assertEqual([p['profile'] for p in doc['profiles']], ["Abierta", "casa", "Rota"])
+        casa = doc['profiles'][1]
+        self.assertEqual(list(casa), list(formatters.PROFILE_FIELDS))
+        self.assertEqual((casa['key'], casa['key_status'], casa['source']), ("s3cr3t", 'present', 'export'))
+        self.assertEqual((doc['profiles'][0]['key'], doc['profiles'][0]['key_status']), (None, 'none'))
+        self.assertEqual(doc['sections'][0]['section'], 'drivers')
+        self.assertEqual(doc['sections'][0]['content'], "driver: iwlwifi")
+
+    def test_jsonl(self):
+        rows = [json.loads(line) for line in self._write('jsonl', {'getmac': "x"}).splitlines()]
+        self.assertEqual([r['type'] for r in rows], ['meta', 'profile', 'profile', 'profile', 'section'])
+        self.assertEqual(rows[3]['key_status'], 'unavailable')
+
+    def test_csv(self):
+        # Las secciones de texto libre no aparecen en CSV
+        rows = list(csv.DictReader(io.StringIO(self._write('csv', {'getmac': "x"}))))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(list(rows[0]), list(formatters.PROFILE_FIELDS))
+        self.assertEqual((rows[1]['profile'], rows[1]['key'], rows[1]['autoconnect']),
+                         ("casa", "s3cr3t", "True"))
+        self.assertEqual(rows[2]['key'], '')
+
+    def test_text_metadata_only_has_no_key_column(self):
+        data = {name: ProfileRecord(name, METADATA_ONLY_VALUE, ssid=name, autoconnect=False)
+                for name in ("A", "B")}
+        meta = {name: {'source': 'metadata'} for name in data}
+        sink = io.StringIO()
+        formatters.write('text', sink, data, None, meta)
+        text = sink.getvalue()
+        self.assertIn("Autoconexion", text)
+        self.assertNotIn(METADATA_ONLY_VALUE, text)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            formatters.write('xml', io.StringIO(), _data())
+
+    def test_format_for_path(self):
+        self.assertEqual(formatters.format_for_path("reporte.JSONL"), 'jsonl')
+        self.assertEqual(formatters.format_for_path("reporte.csv"), 'csv')
+        self.assertEqual(formatters.format_for_path("reporte.log"), 'text')
+
+
+class DiffWritersTest(unittest.TestCase):
+    CHANGES = {
+        'since': '2026-01-01T10:00:00',
+        'profiles': {'added': ["Nueva"], 'removed': [], 'changed': {"casa": {'auth': ('wpa-psk', 'sae')}}},
+        'interfaces': {'added': [], 'removed': ["eth1"],
+                       'changed': {"wlan0": {'addresses': (["10.0.0.2/24"], ["10.0.0.3/24", "fe80::1/64"])}}},
+    }
+
+    def _write(self, fmt):
+        sink = io.StringIO()
+        formatters.write_diff(fmt, sink, self.CHANGES)
+        return sink.getvalue()
+
+    def test_rows(self):
+        rows = formatters.diff_rows(self.CHANGES)
+        self.assertEqual([(r['group'], r['name'], r['change']) for r in rows],
+                         [('profiles', "Nueva", 'added'), ('profiles', "casa", 'changed'),
+                          ('interfaces', "eth1", 'removed'), ('interfaces', "wlan0", 'changed')])
+
+    def test_json_and_jsonl(self):
+        doc = json.loads(self._write('json'))
+        self.assertEqual(doc['since'], self.CHANGES['since'])
+        self.assertEqual(len(doc['changes']), 4)
+        lines = [json.loads(line) for line in self._write('jsonl').splitlines()]
+        self.assertEqual(lines[0]['since'], self.CHANGES['since'])
+        self.assertEqual([r['type'] for r in lines[1:]], ['change'] * 4)
+
+    def test_csv_joins_lists(self):
+        rows = list(csv.DictReader(io.StringIO(self._write('csv'))))
+        self.assertEqual(list(rows[0]), list(formatters.DIFF_FIELDS))
+        self.assertEqual(rows[3]['new'], "10.0.0.3/24, fe80::1/64")
+
+    def test_text(self):
+        text = self._write('text')
+        self.assertIn("+ Nueva", text)
+        self.assertIn("- eth1", text)
+        self.assertIn("10.0.0.2/24 -> 10.0.0.3/24, fe80::1/64", text)
+
+
+class TableTest(unittest.TestCase):
+    ROWS = [{'name': "casa", 'ok': True, 'n': 3, 'extra': "x"}, {'name': "cafe", 'ok': False, 'n': None}]
+    COLUMNS = ('name', 'ok', 'n')
+
+    def _write(self, fmt):
+        sink = io.StringIO()
+        formatters.write_table(fmt, sink, self.ROWS, self.COLUMNS)
+        return sink.getvalue()
+
+    def test_cell(self):
+        for value, text in ((None, "-"), ('', "-"), ((), "-"), ([], "-"), (True, "Si"), (False, "No"),
+                            (0, "0"), (("a", "b"), "a, b"), (["10.0.0.1/24"], "10.0.0.1/24")):
+            with self.subTest(value=value):
+                self.assertEqual(formatters.table_cell(value), text)
+
+    def test_structured(self):
+        self.assertEqual(json.loads(self._write('json'))[1], {'name': "cafe", 'ok': False, 'n': None})
+        self.assertEqual(json.loads(self._write('jsonl').splitlines()[0]), {'name': "casa", 'ok': True, 'n': 3})
+        self.assertEqual(self._write('csv').splitlines(), ["name,ok,n", "casa,True,3", "cafe,False,"])
+
+    def test_text_is_aligned(self):
+        lines = self._write('text').splitlines()
+        self.assertEqual(lines[0].split(), ['name', 'ok', 'n'])
+        self.assertEqual(lines[-1].split(), ['cafe', 'No', '-'])
+        self.assertEqual(len({line.index(line.split()[1]) for line in lines if line.split()}), 1)
+
+    def test_interfaces_use_the_same_cells(self):
+        text = format_interfaces([InterfaceRecord("wlan0", state='up', addresses=()),
+                                  InterfaceRecord("eth0", addresses=("10.0.0.1/24", "fe80::1/64"))],
+                                 ('name', 'state', 'addresses'))
+        lines = text.splitlines()
+        self.assertEqual(lines[1].split(), ['wlan0', 'up', '-'])
+        self.assertTrue(lines[2].endswith("10.0.0.1/24, fe80::1/64"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Historial SQLite: registro, consultas por rango y filtro de cambios."""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from wifi_analyzer import history
+from wifi_analyzer.formatters import METADATA_ONLY_VALUE
+from wifi_analyzer.records import InterfaceRecord, ProfileRecord
+
+
+def _profile(key='s3cr3t', auth='wpa-psk', last_used='2026-01-01T10:00:00'):
+    return ProfileRecord("CasaNet", key, ssid="CasaNet", auth=auth, cipher='ccmp',
+                         autoconnect=True, last_used=last_used)
+
+
+class HistoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix='wifi_history_')
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, history.HISTORY_FILE)
+        self.store = history.HistoryStore(self.path)
+        self.addCleanup(self.store.close)
+
+    def _record(self, taken_at, **kwargs):
+        return self.store.record({"CasaNet": _profile(**kwargs)},
+                                 [InterfaceRecord("wlan0", state='UP', driver='iwlwifi')],
+                                 taken_at=taken_at)
+
+    def test_private_file_without_keys(self):
+        self._record('2026-01-01T10:00:00')
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        with open(self.path, 'rb') as f:
+            self.assertNotIn(b's3cr3t', f.read())
+        row = self.store.profile_history("CasaNet")[0]
+        self.assertEqual(row['key_status'], 'present')
+        self.assertNotIn('key_hash', row)
+
+    def test_date_range(self):
+        for day in (1, 2, 3):
+            self._record(f'2026-01-0{day}T10:00:00')
+        rows = self.store.profile_history("CasaNet", since=history.parse_bound('2026-01-02'),
+                                          until=history.parse_bound('2026-01-02', end=True))
+        self.assertEqual([r['taken_at'] for r in rows], ['2026-01-02T10:00:00'])
+        self.assertEqual(self.store.first_seen("CasaNet"), '2026-01-01T10:00:00')
+        self.assertEqual(self.store.last_seen("wlan0", table='interfaces'), '2026-01-03T10:00:00')
+
+    def test_v1_hashes_are_removed(self):
+        self._record('2026-01-01T10:00:00')
+        self.store.close()
+        # Base de la versión 1: columna key_hash con valores y sal local
+        conn = sqlite3.connect(self.path)
+        with conn:
+            conn.execute("ALTER TABLE profiles ADD COLUMN key_hash TEXT")
+            conn.execute("UPDATE profiles SET key_hash = 'abcdef0123456789'")
+            conn.execute("INSERT INTO meta(key, value) VALUES ('salt', '00ff')")
+            conn.execute("UPDATE meta SET value = '1' WHERE key = 'schema_version'")
+        conn.close()
+
+        store = history.HistoryStore(self.path)
+        self.addCleanup(store.close)
+        self.assertEqual(len(store.profile_history("CasaNet")), 1)
+        conn = sqlite3.connect(self.path)
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("SELECT key_hash FROM profiles").fetchall(), [(None,)])
+        self.assertIsNone(conn.execute("SELECT value FROM meta WHERE key = 'salt'").fetchone())
+
+
+class ChangesOnlyTest(unittest.TestCase):
+    def _rows(self, records):
+        with tempfile.TemporaryDirectory(prefix='wifi_history_') as tmp:
+            with history.HistoryStore(os.path.join(tmp, history.HISTORY_FILE)) as store:
+                for day, record in enumerate(records, start=1):
+                    store.record({"CasaNet": record}, taken_at=f'2026-01-{day:02d}T10:00:00')
+                return store.profile_history("CasaNet")
+
+    def test_last_used_is_not_a_change(self):
+        rows = self._rows([_profile(last_used=f'2026-01-0{d}T09:00:00') for d in (1, 2, 3)])
+        self.assertEqual(len(history.changes_only(rows, history.PROFILE_COLUMNS)), 1)
+
+    def test_attribute_change_is_reported(self):
+        rows = self._rows([_profile(), _profile(), _profile(auth='sae')])
+        changes = history.changes_only(rows, history.PROFILE_COLUMNS)
+        self.assertEqual([r['auth'] for r in changes], ['wpa-psk', 'sae'])
+
+    def test_skipped_key_is_not_a_change(self):
+        rows = self._rows([_profile(), _profile(key=METADATA_ONLY_VALUE), _profile()])
+        self.assertEqual(rows[1]['key_status'], 'skipped')
+        self.assertEqual(len(history.changes_only(rows, history.PROFILE_COLUMNS)), 1)
+
+    def test_key_status_change_is_reported(self):
+        rows = self._rows([_profile(), _profile(key="No disponible")])
+        changes = history.changes_only(rows, history.PROFILE_COLUMNS)
+        self.assertEqual([r['key_status'] for r in changes], ['present', 'unavailable'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+"""Registros de Linux: perfiles de `nmcli`/keyfiles e interfaces de `ip -j`/`nmcli`."""
+
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from wifi_analyzer import commands, nm_dbus
+from wifi_analyzer import platform_linux as lin
+from wifi_analyzer.records import format_interfaces
+
+KEYFILE = """[connection]
+id=Casa: 5G
+uuid=0000-1
+type=wifi
+autoconnect=false
+timestamp=1767261600
+metered=1
+
+[wifi]
+ssid=Casa: 5G
+
+[wifi-security]
+key-mgmt=wpa-psk
+pairwise=ccmp
+psk=s3cr3t
+"""
+
+IP_JSON = [
+    {'ifname': 'lo', 'link_type': 'loopback', 'operstate': 'UNKNOWN', 'address': '00:00:00:00:00:00',
+     'mtu': 65536, 'addr_info': [{'local': '127.0.0.1', 'prefixlen': 8}]},
+    {'ifname': 'wlan0', 'link_type': 'ether', 'operstate': 'UP', 'address': '02:00:00:00:00:01',
+     'mtu': 1500, 'addr_info': [{'local': '192.168.1.2', 'prefixlen': 24},
+                                {'local': 'fe80::1', 'prefixlen': 64}]},
+    {'ifname': 'eth0', 'link_type': 'ether', 'operstate': 'DOWN', 'address': '02:00:00:00:00:02',
+     'mtu': 1500, 'addr_info': []},
+]
+
+NM_DEVICES = ("GENERAL.DEVICE:wlan0\nGENERAL.TYPE:wifi\nGENERAL.DRIVER:iwlwifi\n"
+              "GENERAL.HWADDR:02\\:00\\:00\\:00\\:00\\:01\n\n"
+              "GENERAL.DEVICE:eth0\nGENERAL.TYPE:ethernet\nGENERAL.DRIVER:e1000e\n"
+              "GENERAL.HWADDR:02\\:00\\:00\\:00\\:00\\:02\n")
+
+
+class _FakeTools:
+    """Sustituto de `commands.run`: salida fija por comando y registro de llamadas."""
+
+    def __init__(self, outputs: dict):
+        self.outputs = outputs
+        self.calls = []
+
+    def run(self, argv, timeout=None, encoding=None, reuse_for=0.0):
+        self.calls.append(list(argv))
+        for prefix, (returncode, stdout) in self.outputs.items():
+            if tuple(argv[:len(prefix)]) == prefix:
+                return subprocess.CompletedProcess(argv, returncode, stdout, '')
+        return subprocess.CompletedProcess(argv, 1, '', 'desconocido')
+
+    def patch(self, test):
+        for patcher in (mock.patch.object(commands, 'run', self.run),
+                        mock.patch.object(commands, 'which', return_value='/usr/bin/herramienta'),
+                        mock.patch.object(nm_dbus, 'available', return_value=False)):
+            patcher.start()
+            test.addCleanup(patcher.stop)
+
+
+class ProfileRecordTest(unittest.TestCase):
+    def test_split_terse_escapes(self):
+        self.assertEqual(lin._split_terse("Casa\\: 5G:uuid:a\\\\b"), ["Casa: 5G", "uuid", "a\\b"])
+        self.assertEqual(lin._split_terse("GENERAL.HWADDR:02\\:00", maxsplit=1), ["GENERAL.HWADDR", "02:00"])
+
+    def test_keyfile_record(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "casa.nmconnection"), 'w', encoding='utf-8') as f:
+                f.write(KEYFILE)
+            with open(os.path.join(tmp, "cable.nmconnection"), 'w', encoding='utf-8') as f:
+                f.write("[connection]\nid=Cable\ntype=ethernet\n")
+            snapshot = lin._read_keyfiles(tmp)
+        self.assertEqual(list(snapshot), ["Casa: 5G"])
+        record = lin.record_from_fields("Casa: 5G", snapshot["Casa: 5G"])
+        self.assertEqual((record.key, record.ssid, record.auth, record.cipher),
+                         ("s3cr3t", "Casa: 5G", 'wpa-psk', 'ccmp'))
+        self.assertEqual((record.autoconnect, record.cost), (False, 'yes'))
+        self.assertTrue(record.last_used.startswith('2026-01-01'))
+
+    def test_open_network_defaults(self):
+        record = lin.record_from_fields("Cafe", {'802-11-wireless.ssid': "Cafe"})
+        self.assertEqual((record.key, record.auth, record.autoconnect, record.cost, record.last_used),
+                         ("Sin contrasena o WPS", 'open', True, None, None))
+        self.assertEqual(lin.record_from_fields("Nada", None).key, "No disponible")
+
+    def test_nmcli_query_is_one_call(self):
+        values = ["Casa\\: 5G", "sae", "ccmp", "yes", "0", "no", "s3cr3t"]
+        tools = _FakeTools({('nmcli', '-s', '-g'): (0, "\n".join(values) + "\n")})
+        tools.patch(self)
+        record = lin.get_record("Casa: 5G")
+        self.assertEqual(len(tools.calls), 1)
+        self.assertEqual(tools.calls[0][-1], "Casa: 5G")
+        self.assertEqual((record.key, record.ssid, record.auth, record.autoconnect, record.cost),
+                         ("s3cr3t", "Casa: 5G", 'sae', True, 'no'))
+
+    def test_nmcli_query_errors(self):
+        tools = _FakeTools({('nmcli', '-s', '-g'): (0, "solo una linea\n")})
+        tools.patch(self)
+        self.assertEqual(lin.get_record("Casa").key, "Error al obtener")
+        tools.outputs = {('nmcli', '-s', '-g'): (10, "")}
+        self.assertEqual(lin.get_record("Casa").key, "No disponible")
+
+
+class InterfaceRecordTest(unittest.TestCase):
+    def setUp(self):
+        self.tools = _FakeTools({
+            ('ip', '-j', 'address'): (0, json.dumps(IP_JSON)),
+            ('nmcli', '-t', '-f'): (0, NM_DEVICES),
+        })
+        self.tools.patch(self)
+        commands.configure(None)
+        self.addCleanup(commands.configure, None)
+
+    def test_ip_json(self):
+        interfaces = lin.get_ip_interfaces()
+        self.assertEqual([i.name for i in interfaces], ['lo', 'wlan0', 'eth0'])
+        wlan = interfaces[1]
+        self.assertEqual((wlan.kind, wlan.state, wlan.mac, wlan.mtu), ('ether', 'UP', '02:00:00:00:00:01', 1500))
+        self.assertEqual(wlan.addresses, ("192.168.1.2/24", "fe80::1/64"))
+        self.assertEqual(interfaces[2].addresses, ())
+
+    def test_ip_without_json(self):
+        self.tools.outputs[('ip', '-j', 'address')] = (0, "no es json")
+        self.assertIsNone(lin.get_ip_interfaces())
+
+    def test_nm_devices(self):
+        devices = lin.get_nm_devices()
+        self.assertEqual([(d.name, d.kind, d.driver, d.mac) for d in devices],
+                         [('wlan0', 'wifi', 'iwlwifi', '02:00:00:00:00:01'),
+                          ('eth0', 'ethernet', 'e1000e', '02:00:00:00:00:02')])
+
+    def test_records_merge_driver(self):
+        interfaces = lin.get_interface_records()
+        self.assertEqual([(i.name, i.driver) for i in interfaces],
+                         [('lo', None), ('wlan0', 'iwlwifi'), ('eth0', 'e1000e')])
+
+    def test_sections_show_only_their_fields(self):
+        self.assertEqual(lin.get_drivers().splitlines()[1].split(), ['wlan0', 'iwlwifi', '02:00:00:00:00:01'])
+        lines = lin.get_mac_addresses().splitlines()
+        self.assertEqual(lines[0].split(), ['Interfaz', 'Estado', 'MAC'])
+        self.assertEqual(lines[2].split(), ['wlan0', 'UP', '02:00:00:00:00:01'])
+        text = format_interfaces(lin.get_ip_interfaces(), lin.SECTION_FIELDS['ipconfig'])
+        self.assertIn("192.168.1.2/24, fe80::1/64", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
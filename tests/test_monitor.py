@@ -0,0 +1,192 @@
+"""Monitor de interfaces con eventos grabados de `ip -o monitor link address`.
+
+Las líneas se entregan con `LineEventSource` (sin lanzar procesos) y se
+comprueban los eventos de `parse_ip_monitor`, los cambios que describe
+`InterfaceModel.apply` y el estado final del modelo.
+"""
+
+import json
+import os
+import queue
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from wifi_analyzer import commands, monitor, trace
+from wifi_analyzer.records import InterfaceRecord
+
+MAC = '02:00:00:00:00:01'
+
+# Salida real de `ip -o monitor link address` (una línea por evento).
+RECORDED = [
+    # Sin cambios respecto a la instantánea inicial
+    r"3: wlan0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc noqueue state UP group default \    link/ether 02:00:00:00:00:01 brd ff:ff:ff:ff:ff:ff",
+    # Pérdida de enlace
+    r"3: wlan0: <NO-CARRIER,BROADCAST,MULTICAST,UP> mtu 1500 qdisc noqueue state DOWN group default \    link/ether 02:00:00:00:00:01 brd ff:ff:ff:ff:ff:ff",
+    # Enlace recuperado con otro MTU
+    r"3: wlan0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1400 qdisc noqueue state UP group default \    link/ether 02:00:00:00:00:01 brd ff:ff:ff:ff:ff:ff",
+    # Direcciones añadidas y eliminada
+    r"3: wlan0    inet 192.168.1.20/24 brd 192.168.1.255 scope global dynamic noprefixroute wlan0\       valid_lft 86400sec preferred_lft 86400sec",
+    r"3: wlan0    inet6 fe80::1/64 scope link \       valid_lft forever preferred_lft forever",
+    r"Deleted 3: wlan0    inet 192.168.1.10/24 brd 192.168.1.255 scope global dynamic wlan0\       valid_lft 0sec preferred_lft 0sec",
+    # Interfaz nueva y su activación (con prefijo `[LINK]` de `ip monitor -o all`)
+    r"7: usb0: <BROADCAST,MULTICAST> mtu 1500 qdisc noop state DOWN group default qlen 1000\    link/ether 02:00:00:00:00:07 brd ff:ff:ff:ff:ff:ff",
+    r"[LINK]7: usb0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc fq_codel state UP group default qlen 1000\    link/ether 02:00:00:00:00:07 brd ff:ff:ff:ff:ff:ff",
+    # Interfaz eliminada (nombre con `@enlace`)
+    r"Deleted 4: veth1@if5: <BROADCAST,MULTICAST> mtu 1500 qdisc noop state DOWN group default \    link/ether 02:00:00:00:00:04 brd ff:ff:ff:ff:ff:ff",
+    # Líneas que no son eventos de enlace o dirección
+    "Timestamp: Sat Oct 17 12:00:00 2026 123456 usec",
+    "",
+]
+
+EXPECTED_CHANGES = [
+    "wlan0: state UP -> DOWN",
+    "wlan0: mtu 1500 -> 1400",
+    "wlan0: state DOWN -> UP",
+    "wlan0: + 192.168.1.20/24",
+    "wlan0: + fe80::1/64",
+    "wlan0: - 192.168.1.10/24",
+    "usb0: nueva",
+    "usb0: state DOWN -> UP",
+    "veth1: eliminada",
+]
+
+
+def _initial_records():
+    return [
+        InterfaceRecord('wlan0', kind='ether', state='UP', mac=MAC, mtu=1500,
+                        addresses=('192.168.1.10/24',)),
+        InterfaceRecord('veth1', kind='ether', state='DOWN', mac='02:00:00:00:00:04', mtu=1500),
+    ]
+
+
+class ParseIpMonitorTest(unittest.TestCase):
+    def test_link_event(self):
+        event = monitor.parse_ip_monitor(RECORDED[1])
+        self.assertEqual(event.name, 'wlan0')
+        self.assertFalse(event.removed)
+        self.assertEqual(event.fields, {'mtu': 1500, 'state': 'DOWN', 'kind': 'ether', 'mac': MAC})
+
+    def test_address_events(self):
+        added = monitor.parse_ip_monitor(RECORDED[3])
+        self.assertEqual((added.name, added.add_address, added.del_address),
+                         ('wlan0', '192.168.1.20/24', None))
+        self.assertEqual(monitor.parse_ip_monitor(RECORDED[4]).add_address, 'fe80::1/64')
+        deleted = monitor.parse_ip_monitor(RECORDED[5])
+        self.assertEqual((deleted.del_address, deleted.removed), ('192.168.1.10/24', False))
+
+    def test_deleted_interface(self):
+        event = monitor.parse_ip_monitor(RECORDED[8])
+        self.assertEqual(event.name, 'veth1')
+        self.assertTrue(event.removed)
+
+    def test_ignored_lines(self):
+        self.assertIsNone(monitor.parse_ip_monitor(RECORDED[9]))
+        self.assertIsNone(monitor.parse_ip_monitor(RECORDED[10]))
+
+
+class InterfaceModelTest(unittest.TestCase):
+    def test_recorded_sequence(self):
+        mon = monitor.InterfaceMonitor(monitor.LineEventSource(RECORDED), _initial_records)
+        initial = mon.start()
+        self.assertEqual([r.name for r in initial], ['veth1', 'wlan0'])
+        self.assertEqual(mon.drain(), EXPECTED_CHANGES)
+        self.assertTrue(mon.finished)
+
+        records = {r.name: r for r in mon.model.records()}
+        self.assertEqual(sorted(records), ['usb0', 'wlan0'])
+        wlan0 = records['wlan0']
+        self.assertEqual((wlan0.state, wlan0.mtu, wlan0.mac), ('UP', 1400, MAC))
+        self.assertEqual(wlan0.addresses, ('192.168.1.20/24', 'fe80::1/64'))
+        usb0 = records['usb0']
+        self.assertEqual((usb0.state, usb0.kind, usb0.mac), ('UP', 'ether', '02:00:00:00:00:07'))
+
+    def test_next_changes_skips_no_op_events(self):
+        mon = monitor.InterfaceMonitor(monitor.LineEventSource(RECORDED), _initial_records)
+        mon.start()
+        # El primer evento repite el estado inicial: el primer cambio es la caída del enlace
+        self.assertEqual(mon.next_changes(timeout=1), ["wlan0: state UP -> DOWN"])
+        seen = []
+        while True:
+            changes = mon.next_changes(timeout=1)
+            if not changes:
+                break
+            seen.extend(changes)
+        self.assertEqual(seen, EXPECTED_CHANGES[1:])
+        self.assertTrue(mon.finished)
+
+    def test_repeated_and_unknown_events(self):
+        model = monitor.InterfaceModel(_initial_records())
+        self.assertEqual(model.apply(monitor.InterfaceEvent('wlan0', add_address='192.168.1.10/24')), [])
+        self.assertEqual(model.apply(monitor.InterfaceEvent('wlan0', del_address='10.0.0.1/8')), [])
+        self.assertEqual(model.apply(monitor.InterfaceEvent('eth9', removed=True)), [])
+        self.assertEqual(model.apply(monitor.InterfaceEvent('eth9', add_address='10.0.0.2/8')),
+                         ["eth9: nueva"])
+        self.assertEqual([r.addresses for r in model.records() if r.name == 'eth9'], [('10.0.0.2/8',)])
+
+
+class ParseNmcliMonitorTest(unittest.TestCase):
+    def test_device_states(self):
+        lines = ["wlan0: connecting (prepare)", "wlan0: using connection 'Casa'",
+                 "wlan0: connected", "usb0: device created", "usb0: device removed",
+                 "Networkmanager is now in the 'connected' state"]
+        model = monitor.InterfaceModel(_initial_records())
+        changes = []
+        for line in lines:
+            event = monitor.parse_nmcli_monitor(line)
+            if event is not None:
+                changes.extend(model.apply(event))
+        self.assertEqual(changes, ["wlan0: state UP -> connecting", "wlan0: state connecting -> connected",
+                                   "usb0: nueva", "usb0: eliminada"])
+
+
+class ProcessEventSourceTest(unittest.TestCase):
+    """El proceso del monitor pasa por `commands`: traza y fixtures."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix='wifi_monitor_')
+        self.addCleanup(tmp.cleanup)
+        self.fixtures = os.path.join(tmp.name, 'fixtures')
+        self.addCleanup(commands.configure, None)
+        # Un `ip monitor` que imprime los eventos grabados y termina
+        code = f"import sys; sys.stdout.write({json.dumps(''.join(line + chr(10) for line in RECORDED))})"
+        self.argv = [sys.executable, '-c', code]
+
+    def _events(self) -> list:
+        source = monitor.ProcessEventSource(self.argv, monitor.parse_ip_monitor)
+        events = queue.Queue()
+        source.start(events.put)
+        names = []
+        while True:
+            event = events.get(timeout=5)
+            if event is None:
+                break
+            names.append(event.name)
+        source.stop()
+        return names
+
+    def test_spawn_is_traced(self):
+        trace.enable()
+        self.addCleanup(trace.disable)
+        names = self._events()
+        self.assertEqual(names[:3], ['wlan0', 'wlan0', 'wlan0'])
+        [event] = [e for e in trace.events() if e['kind'] == 'command']
+        self.assertEqual((event['tool'], event['returncode']), (sys.executable, 0))
+        self.assertGreater(event['out_bytes'], 0)
+
+    def test_record_then_replay(self):
+        commands.configure('record', self.fixtures)
+        recorded = self._events()
+        commands.configure('replay', self.fixtures)
+        with mock.patch('subprocess.Popen', side_effect=AssertionError("no debe lanzar procesos")):
+            self.assertEqual(self._events(), recorded)
+
+    def test_missing_tool(self):
+        source = monitor.ProcessEventSource(['no-existe-wifi-monitor'], monitor.parse_ip_monitor)
+        with self.assertRaises(FileNotFoundError):
+            source.start(lambda event: None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""Consultas por D-Bus contra un NetworkManager simulado (sin `dbus-python`).
+
+Se sustituye el módulo `dbus` por un doble mínimo que cuenta las llamadas,
+para comprobar que las consultas individuales no recorren todas las
+conexiones y que la disponibilidad se consulta una sola vez.
+"""
+
+import types
+import unittest
+from collections import Counter
+from unittest import mock
+
+from wifi_analyzer import nm_dbus, workers
+
+
+class _DBusException(Exception):
+    pass
+
+
+class _FakeNM:
+    """Conexiones guardadas por ruta D-Bus y contador de llamadas."""
+
+    def __init__(self, count: int):
+        self.calls = Counter()
+        self.connections = {}
+        for i in range(count):
+            self.add(f"/org/freedesktop/NetworkManager/Settings/{i}", f"Red-{i:04d}", f"clave-{i}")
+        self.add("/org/freedesktop/NetworkManager/Settings/cable", "Cableada", None,
+                 ctype='802-3-ethernet')
+
+    def add(self, path, name, psk, ctype='802-11-wireless'):
+        settings = {'connection': {'id': name, 'type': ctype}}
+        if ctype == '802-11-wireless':
+            settings['802-11-wireless'] = {'ssid': list(name.encode('utf-8'))}
+            settings['802-11-wireless-security'] = {'key-mgmt': 'wpa-psk'}
+        self.connections[path] = (settings, psk)
+
+    def module(self):
+        nm = self
+
+        class Bus:
+            def name_has_owner(self, name):
+                nm.calls['NameHasOwner'] += 1
+                return True
+
+            def get_object(self, bus_name, path):
+                return path
+
+        class Interface:
+            def __init__(self, path, iface):
+                self.path = path
+
+            def ListConnections(self, **kwargs):
+                nm.calls['ListConnections'] += 1
+                return list(nm.connections)
+
+            def GetSettings(self, **kwargs):
+                nm.calls['GetSettings'] += 1
+                if self.path not in nm.connections:
+                    raise _DBusException("Object does not exist")
+                return nm.connections[self.path][0]
+
+            def GetSecrets(self, setting, **kwargs):
+                nm.calls['GetSecrets'] += 1
+                return {setting: {'psk': nm.connections[self.path][1]}}
+
+            def Get(self, iface, prop, **kwargs):
+                nm.calls['Get'] += 1
+                return f"/etc/NetworkManager/system-connections/{self.path.rsplit('/', 1)[-1]}.nmconnection"
+
+        return types.SimpleNamespace(
+            SystemBus=Bus, Interface=Interface, DBusException=_DBusException,
+            Boolean=bool, Array=list, Dictionary=dict)
+
+
+class NmDbusTest(unittest.TestCase):
+    def setUp(self):
+        self.nm = _FakeNM(50)
+        patcher = mock.patch.object(nm_dbus, 'dbus', self.nm.module())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        nm_dbus.reset()
+        self.addCleanup(nm_dbus.reset)
+
+    def test_available_is_checked_once(self):
+        self.assertTrue(all(nm_dbus.available() for _ in range(10)))
+        self.assertEqual(self.nm.calls['NameHasOwner'], 1)
+
+    def test_lookups_are_linear_across_the_pool(self):
+        names = [f"Red-{i:04d}" for i in range(50)]
+        results = workers.map_bounded(nm_dbus.get_connection, names, max_workers=8)
+        self.assertEqual([r['802-11-wireless-security.psk'] for r in results],
+                         [f"clave-{i}" for i in range(50)])
+        # Un mapa (51 conexiones) más una lectura por perfil, no 50 x 51
+        self.assertEqual(self.nm.calls['ListConnections'], 1)
+        self.assertEqual(self.nm.calls['GetSettings'], 51 + 50)
+
+    def test_snapshot_fills_the_map(self):
+        snapshot = nm_dbus.get_snapshot(secrets=False)
+        self.assertEqual(len(snapshot), 50)
+        self.nm.calls.clear()
+        self.assertEqual(nm_dbus.get_connection('Red-0007')['802-11-wireless.ssid'], 'Red-0007')
+        self.assertEqual(self.nm.calls['ListConnections'], 0)
+        self.assertEqual(self.nm.calls['GetSettings'], 1)
+
+    def _age_map(self):
+        nm_dbus._paths_built -= nm_dbus.REBUILD_INTERVAL + 1
+
+    def test_stale_map_is_rebuilt_once(self):
+        nm_dbus.get_snapshot(secrets=False)
+        # La conexión se recrea con otra ruta y se añade otra nueva
+        settings, psk = self.nm.connections.pop("/org/freedesktop/NetworkManager/Settings/3")
+        self.nm.connections["/org/freedesktop/NetworkManager/Settings/99"] = (settings, psk)
+        self.nm.add("/org/freedesktop/NetworkManager/Settings/100", "Nueva", "clave-nueva")
+        self._age_map()
+        self.assertEqual(nm_dbus.get_connection('Red-0003')['802-11-wireless-security.psk'], 'clave-3')
+        self.assertEqual(nm_dbus.get_connection('Nueva')['802-11-wireless-security.psk'], 'clave-nueva')
+        self.assertIsNone(nm_dbus.get_connection('Cableada'))
+        self.assertIsNone(nm_dbus.get_connection('No-Existe'))
+
+    def test_missing_names_rebuild_at_most_once(self):
+        nm_dbus.get_snapshot(secrets=False)
+        self._age_map()
+        self.nm.calls.clear()
+        missing = [f"No-Existe-{i}" for i in range(20)]
+        results = workers.map_bounded(nm_dbus.get_connection, missing, max_workers=8)
+        self.assertEqual(results, [None] * 20)
+        self.assertEqual(self.nm.calls['ListConnections'], 1)
+        self.assertEqual(self.nm.calls['GetSettings'], 51)
+        # Dentro del intervalo ni siquiera se reconstruye
+        self.nm.calls.clear()
+        self.assertIsNone(nm_dbus.get_connection('No-Existe-0'))
+        self.assertEqual(self.nm.calls['ListConnections'], 0)
+
+    def test_filenames_use_the_path_map(self):
+        nm_dbus.get_snapshot(secrets=False)
+        self.nm.calls.clear()
+        filenames = nm_dbus.get_filenames()
+        self.assertEqual(len(filenames), 50)
+        self.assertEqual(filenames['Red-0007'], "/etc/NetworkManager/system-connections/7.nmconnection")
+        self.assertEqual(self.nm.calls['ListConnections'], 0)
+        self.assertEqual(self.nm.calls['Get'], 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
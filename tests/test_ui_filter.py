@@ -0,0 +1,111 @@
+"""Filtro indexado y pintado por bloques de la GUI (sin abrir ventanas)."""
+
+import io
+import unittest
+from unittest import mock
+
+from wifi_analyzer import report as report_mod
+from wifi_analyzer import ui
+from wifi_analyzer.records import ProfileRecord
+
+
+def _report() -> str:
+    data = {name: ProfileRecord(name, f"clave-{name.lower()}") for name in ("CasaNet", "Oficina", "Cafe")}
+    extra = {'drivers': "wlan0  iwlwifi  02:00:00:00:00:01\neth0  e1000e  02:00:00:00:00:02\n"}
+    sink = io.StringIO()
+    with mock.patch('platform.system', return_value='Linux'):
+        report_mod.write_report(sink, data, extra)
+    return sink.getvalue()
+
+
+class ReportIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = ui._ReportIndex(_report())
+
+    def test_empty_query_shows_everything(self):
+        lines, count = self.index.render("  ")
+        self.assertEqual(lines, self.index.lines)
+        self.assertEqual(count, len(self.index.lines))
+
+    def test_match_keeps_table_header(self):
+        lines, count = self.index.render("oficina")
+        self.assertEqual(count, 1)
+        # Título entre reglas, bordes y encabezado de la tabla, y la fila
+        self.assertEqual(lines[0], "PERFILES WI-FI Y CONTRASENAS ENCONTRADAS")
+        self.assertEqual([line[:1] for line in lines[1:]], ['+', '|', '+', '|'])
+        self.assertIn("Perfil", lines[2])
+        self.assertIn("Oficina", lines[4])
+
+    def test_matches_are_grouped_by_section(self):
+        lines, count = self.index.render("E1000E")
+        self.assertEqual(count, 1)
+        self.assertEqual(lines, [report_mod.section_title('Linux', 'drivers'),
+                                 "eth0  e1000e  02:00:00:00:00:02"])
+
+    def test_narrowing_reuses_previous_matches(self):
+        wide = self.index.search("c")
+        narrow = self.index.search("ca")
+        self.assertTrue(set(narrow) <= set(wide))
+        self.assertEqual(narrow, [n for n in range(len(self.index.lines))
+                                  if "ca" in self.index.lowered[n]])
+        self.assertEqual(self.index.search("nada-parecido"), [])
+        self.assertEqual(self.index.render("nada-parecido"), ([], 0))
+
+
+class _FakeRoot:
+    def __init__(self):
+        self.jobs = []
+
+    def after(self, delay, func, *args):
+        self.jobs.append((func, args))
+        return len(self.jobs)
+
+    def after_cancel(self, job):
+        self.jobs[job - 1] = None
+
+    def run(self):
+        while any(self.jobs):
+            n = next(i for i, job in enumerate(self.jobs) if job)
+            func, args = self.jobs[n]
+            self.jobs[n] = None
+            func(*args)
+
+
+class _FakeText:
+    def __init__(self):
+        self.text = ""
+        self.inserts = 0
+
+    def delete(self, start, end):
+        self.text = ""
+
+    def insert(self, where, chunk):
+        self.text += chunk
+        self.inserts += 1
+
+
+class ChunkedRendererTest(unittest.TestCase):
+    def test_inserts_in_chunks(self):
+        root, widget = _FakeRoot(), _FakeText()
+        renderer = ui._ChunkedRenderer(root, widget)
+        lines = [f"linea {i}" for i in range(ui._ChunkedRenderer.CHUNK_LINES * 2 + 5)]
+        done = []
+        renderer.render(lines, on_done=lambda: done.append(True))
+        self.assertEqual(widget.inserts, 1)
+        self.assertEqual(done, [])
+        root.run()
+        self.assertEqual(widget.inserts, 3)
+        self.assertEqual(widget.text, "\n".join(lines))
+        self.assertEqual(done, [True])
+
+    def test_new_render_cancels_previous(self):
+        root, widget = _FakeRoot(), _FakeText()
+        renderer = ui._ChunkedRenderer(root, widget)
+        renderer.render([f"vieja {i}" for i in range(ui._ChunkedRenderer.CHUNK_LINES + 1)])
+        renderer.render(["nueva"])
+        root.run()
+        self.assertEqual(widget.text, "nueva")
+
+
+if __name__ == '__main__':
+    unittest.main()
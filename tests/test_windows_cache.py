@@ -0,0 +1,95 @@
+"""Caché de claves en Windows: un acierto completo no exporta secretos.
+
+`netsh` se sustituye por un doble de `commands.run` que anota cada llamada y
+escribe los XML de la exportación; DPAPI se reemplaza por la identidad.
+"""
+
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from main import WiFiAnalyzer
+from tests.test_windows_parity import PROFILE_XML, SHARED_KEY, _xml_escape
+from wifi_analyzer import cache, commands
+from wifi_analyzer import platform_windows as win
+
+PROFILES = {"CasaNet": "s3cr3t", "Oficina": "otra-clave"}
+
+
+class FakeNetsh:
+    """`commands.run` de prueba con `show profiles` y `export profile`."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, argv, timeout=None, encoding=None, reuse_for=0.0):
+        argv = list(argv)
+        self.calls.append(argv)
+        lowered = [a.lower() for a in argv]
+        if lowered[1:4] == ['wlan', 'show', 'profiles']:
+            out = "".join(f"    All User Profile     : {name}\n" for name in PROFILES)
+            return subprocess.CompletedProcess(argv, 0, out, '')
+        if lowered[1:4] == ['wlan', 'export', 'profile']:
+            folder = next(a.split('=', 1)[1] for a in argv if a.lower().startswith('folder='))
+            for name, key in PROFILES.items():
+                shared = SHARED_KEY.format(key=_xml_escape(key))
+                if 'key=clear' not in lowered:
+                    shared = shared.replace('false', 'true')
+                with open(os.path.join(folder, f"Wi-Fi-{name}.xml"), 'w', encoding='utf-8') as f:
+                    f.write(PROFILE_XML.format(name=_xml_escape(name), mode='auto', auth='WPA2PSK',
+                                               cipher='AES', shared_key=shared))
+            return subprocess.CompletedProcess(argv, 0, '', '')
+        return subprocess.CompletedProcess(argv, 1, '', 'no soportado')
+
+    def keyed_calls(self) -> list:
+        return [argv for argv in self.calls if 'key=clear' in [a.lower() for a in argv]]
+
+
+class WindowsCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix='wifi_wincache_')
+        self.addCleanup(tmp.cleanup)
+        store = os.path.join(tmp.name, 'store')
+        os.makedirs(store)
+        with open(os.path.join(store, '{guid}.xml'), 'w', encoding='utf-8') as f:
+            f.write('perfil')
+        self.netsh = FakeNetsh()
+        for patcher in (
+            mock.patch('platform.system', return_value='Windows'),
+            mock.patch.object(win, 'WLAN_PROFILE_STORE', store),
+            mock.patch.object(commands, 'run', self.netsh),
+            mock.patch.object(cache, '_dpapi', lambda data, protect: data),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.cache_dir = os.path.join(tmp.name, 'cache')
+
+    def _analyze(self) -> WiFiAnalyzer:
+        analyzer = WiFiAnalyzer(max_workers=1)
+        analyzer.cache = cache.SnapshotCache(self.cache_dir)
+        with mock.patch('builtins.print'):
+            self.assertTrue(analyzer.analyze_wifi_profiles())
+        return analyzer
+
+    def test_full_cache_hit_never_exports_keys(self):
+        first = self._analyze()
+        self.assertEqual(len(self.netsh.keyed_calls()), 1)
+        self.assertEqual({p: r.key for p, r in first.profiles_data.items()}, PROFILES)
+
+        self.netsh.calls.clear()
+        second = self._analyze()
+        self.assertEqual(self.netsh.keyed_calls(), [])
+        self.assertEqual({p: r.key for p, r in second.profiles_data.items()}, PROFILES)
+        self.assertEqual({m['source'] for m in second.profiles_meta.values()}, {'cache'})
+
+    def test_listing_does_not_request_keys(self):
+        analyzer = WiFiAnalyzer(use_cache=False)
+        with mock.patch('builtins.print'):
+            self.assertEqual(sorted(analyzer.get_wifi_profiles()), sorted(PROFILES))
+        self.assertEqual(self.netsh.keyed_calls(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+"""Paridad entre la exportación XML de `netsh` y la consulta por perfil.
+
+El mismo perfil se lee por las dos rutas de Windows: el XML de
+`netsh wlan export profile key=clear` (`read_exported_profiles`) y el texto
+localizado de `netsh wlan show profile ... key=clear` (`parse_show_profile`),
+en inglés y en español. Clave y atributos deben coincidir; `cost` no se
+compara porque el XML de perfil no lo incluye.
+"""
+
+import os
+import tempfile
+import unittest
+
+from wifi_analyzer import platform_windows as win
+
+PROFILE_XML = """<?xml version="1.0"?>
+<WLANProfile xmlns="http://www.microsoft.com/networking/WLAN/profile/v1">
+	<name>{name}</name>
+	<SSIDConfig>
+		<SSID>
+			<hex>436173614E6574</hex>
+			<name>{name}</name>
+		</SSID>
+	</SSIDConfig>
+	<connectionType>ESS</connectionType>
+	<connectionMode>{mode}</connectionMode>
+	<MSM>
+		<security>
+			<authEncryption>
+				<authentication>{auth}</authentication>
+				<encryption>{cipher}</encryption>
+				<useOneX>false</useOneX>
+			</authEncryption>
+			{shared_key}
+		</security>
+	</MSM>
+</WLANProfile>
+"""
+
+SHARED_KEY = ("<sharedKey><keyType>passPhrase</keyType><protected>false</protected>"
+              "<keyMaterial>{key}</keyMaterial></sharedKey>")
+
+SHOW_PROFILE_EN = """
+Profile {name} on interface Wi-Fi:
+=======================================================================
+
+Applied: All User Profile
+
+Profile information
+-------------------
+    Version                : 1
+    Type                   : Wireless LAN
+    Name                   : {name}
+    Control options        :
+        Connection mode    : {mode}
+        Network broadcast  : Connect only if this network is broadcasting
+        AutoSwitch         : Do not switch to other networks
+
+Connectivity settings
+---------------------
+    Number of SSIDs        : 1
+    SSID name              : "{name}"
+    Network type           : Infrastructure
+
+Security settings
+-----------------
+    Authentication         : {auth}
+    Cipher                 : {cipher}
+    Authentication         : {auth}
+    Cipher                 : GCMP
+    Security key           : {present}
+{key_line}
+Cost settings
+-------------
+    Cost                   : Unrestricted
+"""
+
+SHOW_PROFILE_ES = """
+El perfil {name} en la interfaz Wi-Fi:
+=======================================================================
+
+Aplicado: Perfil de todos los usuarios
+
+Información de perfil
+-------------------
+    Versión                : 1
+    Tipo                   : LAN inalámbrica
+    Nombre                 : {name}
+    Opciones de control    :
+        Modo de conexión   : {mode}
+        Difusión de red    : Conectar solo si esta red está difundiendo
+
+Configuración de conectividad
+---------------------
+    Número de SSID         : 1
+    Nombre de SSID         : "{name}"
+    Tipo de red            : Infraestructura
+
+Configuración de seguridad
+-----------------
+    Autenticación          : {auth}
+    Cifrado                : {cipher}
+    Clave de seguridad     : {present}
+{key_line}
+Configuración de costos
+-------------
+    Costo                  : Sin restricciones
+"""
+
+# (nombre, modo XML, auth XML, cifrado XML, clave o None)
+PROFILES = (
+    ("CasaNet", 'auto', 'WPA2PSK', 'AES', "s3cr3t:pa55 con espacios"),
+    ("Cafe Libre", 'manual', 'open', 'none', None),
+    ("Oficina-WPA", 'auto', 'WPAPSK', 'TKIP', "<&>\"clave\""),
+)
+
+# Textos que muestra `netsh` para cada valor del XML, por idioma.
+_MODE_TEXT = {
+    'en': {'auto': "Connect automatically", 'manual': "Connect manually"},
+    'es': {'auto': "Conectar automáticamente", 'manual': "Conectar manualmente"},
+}
+_AUTH_TEXT = {
+    'en': {'WPA2PSK': "WPA2-Personal", 'WPAPSK': "WPA-Personal", 'open': "Open"},
+    'es': {'WPA2PSK': "WPA2-Personal", 'WPAPSK': "WPA-Personal", 'open': "Abierta"},
+}
+_CIPHER_TEXT = {
+    'en': {'AES': "CCMP", 'TKIP': "TKIP", 'none': "None"},
+    'es': {'AES': "CCMP", 'TKIP': "TKIP", 'none': "Ninguno"},
+}
+
+
+def _xml_escape(text: str) -> str:
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+
+def _show_profile_text(lang: str, name: str, mode: str, auth: str, cipher: str, key) -> str:
+    template = SHOW_PROFILE_EN if lang == 'en' else SHOW_PROFILE_ES
+    if key is None:
+        present, key_line = ("Absent" if lang == 'en' else "Ausente"), ""
+    else:
+        present = "Present" if lang == 'en' else "Presente"
+        label = "Key Content          " if lang == 'en' else "Contenido de la clave"
+        key_line = f"    {label}  : {key}\n"
+    return template.format(name=name, mode=_MODE_TEXT[lang][mode], auth=_AUTH_TEXT[lang][auth],
+                           cipher=_CIPHER_TEXT[lang][cipher], present=present, key_line=key_line)
+
+
+class WindowsParityTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory(prefix='wifi_parity_')
+        for name, mode, auth, cipher, key in PROFILES:
+            shared_key = SHARED_KEY.format(key=_xml_escape(key)) if key is not None else ""
+            path = os.path.join(cls._tmp.name, f"Wi-Fi-{name}.xml")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(PROFILE_XML.format(name=_xml_escape(name), mode=mode, auth=auth,
+                                           cipher=cipher, shared_key=shared_key))
+        cls.snapshot = win.read_exported_profiles(cls._tmp.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def _assert_parity(self, lang: str):
+        xml_records = win.get_records([p[0] for p in PROFILES], snapshot=self.snapshot)
+        self.assertEqual(sorted(xml_records), sorted(p[0] for p in PROFILES))
+        for name, mode, auth, cipher, key in PROFILES:
+            with self.subTest(profile=name, lang=lang):
+                text_record = win.parse_show_profile(
+                    name, _show_profile_text(lang, name, mode, auth, cipher, key))
+                xml_record = xml_records[name]
+                self.assertEqual(xml_record.key, text_record.key)
+                for attr in ('ssid', 'auth', 'cipher', 'autoconnect'):
+                    self.assertEqual(getattr(xml_record, attr), getattr(text_record, attr), attr)
+
+    def test_xml_matches_english_text(self):
+        self._assert_parity('en')
+
+    def test_xml_matches_spanish_text(self):
+        self._assert_parity('es')
+
+    def test_keys_and_attributes(self):
+        records = win.get_records([p[0] for p in PROFILES], snapshot=self.snapshot)
+        self.assertEqual(records["CasaNet"].key, "s3cr3t:pa55 con espacios")
+        self.assertEqual(records["Oficina-WPA"].key, "<&>\"clave\"")
+        self.assertEqual(records["Cafe Libre"].key, "Sin contrasena o WPS")
+        self.assertEqual(records["CasaNet"].auth, 'WPA2PSK')
+        self.assertIs(records["CasaNet"].autoconnect, True)
+        self.assertIs(records["Cafe Libre"].autoconnect, False)
+
+    def test_console_codepage_accents(self):
+        # Con la consola en cp850 leída como cp1252 las tildes cambian de carácter
+        text = _show_profile_text('es', "CasaNet", 'auto', 'WPA2PSK', 'AES', "clave")
+        text = text.replace("ó", "¢").replace("á", "\xa0")
+        record = win.parse_show_profile("CasaNet", text)
+        self.assertEqual(record.key, "clave")
+        self.assertEqual(record.auth, 'WPA2PSK')
+        self.assertIs(record.autoconnect, True)
+
+    def test_protected_key_is_not_reported(self):
+        fields = dict(self.snapshot["CasaNet"], protected='true')
+        self.assertEqual(win.record_from_fields("CasaNet", fields).key, "No disponible")
+
+
+if __name__ == '__main__':
+    unittest.main()
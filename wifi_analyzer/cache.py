@@ -0,0 +1,185 @@
+"""Caché persistente de claves Wi‑Fi entre ejecuciones.
+
+Guarda en disco, cifrados, los registros ya extraídos (clave y atributos
+del perfil) junto con una firma barata de cada perfil (mtime/tamaño del
+almacén del sistema). En la siguiente ejecución solo se vuelven a extraer
+los perfiles nuevos o cuya firma cambió.
+
+Cifrado en reposo:
+    - Windows: DPAPI (`CryptProtectData`) ligado a la cuenta del usuario.
+    - Otros: HMAC‑SHA256 en modo contador con autenticación
+      (encrypt‑then‑MAC) y una clave aleatoria local con permisos 0600, de
+      la que se derivan claves distintas para cifrar y para autenticar.
+
+La clave local se guarda junto a la caché: solo protege frente a quien lea
+o copie el archivo de caché por separado, no frente a quien pueda leer el
+directorio completo (con ambos archivos las claves se descifran).
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import platform
+import secrets
+
+from wifi_analyzer.records import ProfileRecord
+
+CACHE_VERSION = 3
+CACHE_FILE = 'snapshot.json'
+KEY_FILE = 'cache.key'
+
+# Valores que indican un fallo transitorio: no se guardan en caché.
+_UNCACHEABLE_PREFIXES = ("No disponible", "Error al obtener")
+
+
+def default_cache_dir() -> str:
+    """Directorio de caché del usuario según la plataforma."""
+    if platform.system() == 'Windows':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'wifi_analyzer')
+
+
+def _dpapi(data: bytes, protect: bool) -> bytes:
+    """Cifra/descifra con DPAPI de Windows mediante ctypes."""
+    import ctypes
+    from ctypes import wintypes
+
+    class DATA_BLOB(ctypes.Structure):
+        _fields_ = [('cbData', wintypes.DWORD), ('pbData', ctypes.POINTER(ctypes.c_char))]
+
+    buf = ctypes.create_string_buffer(data, len(data))
+    blob_in = DATA_BLOB(len(data), ctypes.cast(buf, ctypes.POINTER(ctypes.c_char)))
+    blob_out = DATA_BLOB()
+    crypt32 = ctypes.windll.crypt32
+    func = crypt32.CryptProtectData if protect else crypt32.CryptUnprotectData
+    if not func(ctypes.byref(blob_in), None, None, None, None, 0, ctypes.byref(blob_out)):
+        raise OSError("DPAPI no pudo procesar los datos")
+    try:
+        return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+    finally:
+        ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+
+
+def _derive(key: bytes, purpose: bytes) -> bytes:
+    """Subclave independiente para un uso (`b'enc'` o `b'mac'`)."""
+    return hmac.new(key, purpose, hashlib.sha256).digest()
+
+
+def _keystream(key: bytes, nonce: bytes, length: int) -> bytes:
+    out = bytearray()
+    counter = 0
+    while len(out) < length:
+        out += hmac.new(key, nonce + counter.to_bytes(8, 'big'), hashlib.sha256).digest()
+        counter += 1
+    return bytes(out[:length])
+
+
+class SnapshotCache:
+    """Caché cifrada {perfil: ProfileRecord} validada por firmas de cambio."""
+
+    def __init__(self, directory: str | None = None):
+        self.directory = directory or default_cache_dir()
+        self.path = os.path.join(self.directory, CACHE_FILE)
+        self._key = None
+
+    # --- cifrado -------------------------------------------------------
+    def _local_key(self) -> bytes:
+        if self._key is None:
+            key_path = os.path.join(self.directory, KEY_FILE)
+            try:
+                with open(key_path, 'rb') as f:
+                    self._key = f.read()
+            except OSError:
+                os.makedirs(self.directory, exist_ok=True)
+                self._key = secrets.token_bytes(32)
+                fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(self._key)
+        return self._key
+
+    def _encrypt(self, plain: str) -> str:
+        data = plain.encode('utf-8')
+        if platform.system() == 'Windows':
+            return base64.b64encode(_dpapi(data, protect=True)).decode('ascii')
+        key = self._local_key()
+        nonce = secrets.token_bytes(16)
+        cipher = bytes(a ^ b for a, b in zip(data, _keystream(_derive(key, b'enc'), nonce, len(data))))
+        tag = hmac.new(_derive(key, b'mac'), nonce + cipher, hashlib.sha256).digest()
+        return base64.b64encode(nonce + tag + cipher).decode('ascii')
+
+    def _decrypt(self, token: str) -> str | None:
+        try:
+            raw = base64.b64decode(token)
+            if platform.system() == 'Windows':
+                return _dpapi(raw, protect=False).decode('utf-8')
+            key = self._local_key()
+            nonce, tag, cipher = raw[:16], raw[16:48], raw[48:]
+            expected = hmac.new(_derive(key, b'mac'), nonce + cipher, hashlib.sha256).digest()
+            if not hmac.compare_digest(tag, expected):
+                return None
+            stream = _keystream(_derive(key, b'enc'), nonce, len(cipher))
+            return bytes(a ^ b for a, b in zip(cipher, stream)).decode('utf-8')
+        except Exception:
+            return None
+
+    # --- persistencia --------------------------------------------------
+    def _load(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        return data.get('profiles', {})
+
+    def lookup(self, profiles, signatures: dict) -> dict:
+        """Devuelve {perfil: ProfileRecord} de los perfiles cuya firma no cambió.
+
+        Los perfiles sin firma conocida nunca se sirven desde la caché.
+        """
+        stored = self._load()
+        hits = {}
+        for name in profiles:
+            sig = signatures.get(name)
+            entry = stored.get(name)
+            if not sig or not entry or entry.get('sig') != sig:
+                continue
+            plain = self._decrypt(entry.get('value', ''))
+            if plain is None:
+                continue
+            try:
+                hits[name] = ProfileRecord(name, **json.loads(plain))
+            except (ValueError, TypeError):
+                continue
+        return hits
+
+    def store(self, results: dict, signatures: dict) -> None:
+        """Reemplaza el contenido de la caché con los resultados actuales."""
+        profiles = {}
+        for name, value in results.items():
+            sig = signatures.get(name)
+            if not sig or str(value).startswith(_UNCACHEABLE_PREFIXES):
+                continue
+            # La clave y los atributos se cifran juntos en un único documento
+            fields = value.as_dict() if isinstance(value, ProfileRecord) else {}
+            fields.pop('name', None)
+            fields['key'] = str(value)
+            profiles[name] = {'sig': sig, 'value': self._encrypt(json.dumps(fields))}
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self.path + '.tmp'
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'profiles': profiles}, f)
+        os.replace(tmp, self.path)
+
+    def invalidate(self) -> None:
+        """Elimina la caché (la clave local se conserva)."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,304 @@
+"""Capa única de ejecución de comandos externos.
+
+Todas las llamadas a `nmcli`, `ip`, `netsh`, `ipconfig` y `getmac` de los
+módulos de plataforma pasan por `run()`, que:
+
+    - aplica siempre un tiempo máximo (`DEFAULT_TIMEOUT` si no se indica otro);
+    - une invocaciones idénticas simultáneas en un solo proceso y, si el
+      llamador lo permite (`reuse_for`), reutiliza un resultado reciente;
+    - registra cada proceso en `trace` cuando la instrumentación está activa;
+    - puede grabar las salidas reales en archivos de fixture y reproducirlas
+      después sin lanzar ningún proceso.
+
+Los procesos de larga duración que se leen línea a línea (monitores) usan
+`LineStream`, que pasa por los mismos pasos: `which()`, `trace` y fixtures.
+
+La grabación/reproducción se activa con `configure()` o con las variables de
+entorno `WIFI_ANALYZER_FIXTURE_MODE` (`record` o `replay`) y
+`WIFI_ANALYZER_FIXTURES` (directorio de fixtures). Los fixtures guardan las
+salidas tal cual, claves incluidas, por lo que se crean con permisos 0600.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+from wifi_analyzer import trace
+
+# Tiempo máximo (segundos) por comando cuando el llamador no indica otro.
+DEFAULT_TIMEOUT = 30
+
+_lock = threading.Lock()
+_inflight = {}
+# {(argv, encoding): (instante, vigencia, resultado)} de las llamadas con `reuse_for`.
+_recent = {}
+_mode = os.environ.get('WIFI_ANALYZER_FIXTURE_MODE') or None
+_fixture_dir = os.environ.get('WIFI_ANALYZER_FIXTURES') or None
+
+
+class _Call:
+    """Invocación en curso compartida por los llamadores que coinciden."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def configure(mode: str | None = None, directory: str | None = None) -> None:
+    """Selecciona el modo de fixtures: None (real), 'record' o 'replay'."""
+    global _mode, _fixture_dir
+    if mode not in (None, 'record', 'replay'):
+        raise ValueError(f"Modo de fixtures no soportado: {mode}")
+    if mode and not directory:
+        raise ValueError("El modo de fixtures requiere un directorio")
+    _mode, _fixture_dir = mode, directory
+    clear_caches()
+
+
+def _evict_expired(now: float) -> None:
+    """Descarta los resultados reutilizables vencidos (con `_lock` tomado)."""
+    for key in [k for k, (stamp, ttl, _r) in _recent.items() if now - stamp > ttl]:
+        del _recent[key]
+
+
+def clear_caches() -> None:
+    """Olvida las herramientas detectadas y los resultados recientes."""
+    _which.cache_clear()
+    with _lock:
+        _recent.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _which(tool: str) -> str | None:
+    return shutil.which(tool)
+
+
+def which(tool: str) -> str | None:
+    """`shutil.which` consultado una sola vez por herramienta y proceso."""
+    if _mode == 'replay':
+        # En reproducción una herramienta "existe" si hay fixtures grabados para ella.
+        try:
+            prefix = f"{tool}-"
+            return tool if any(n.startswith(prefix) for n in os.listdir(_fixture_dir)) else None
+        except OSError:
+            return None
+    return _which(tool)
+
+
+def _folder_arg(argv) -> str | None:
+    for arg in argv:
+        if arg.lower().startswith('folder='):
+            return arg.split('=', 1)[1]
+    return None
+
+
+def _fixture_path(argv, encoding) -> str:
+    # Los directorios temporales cambian en cada ejecución: se normalizan.
+    normalized = ['folder=<DIR>' if a.lower().startswith('folder=') else a for a in argv]
+    digest = hashlib.sha1(json.dumps([normalized, encoding]).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(_fixture_dir, f"{os.path.basename(argv[0])}-{digest}.json")
+
+
+def _open_private(path: str):
+    """Abre `path` para escritura con permisos 0600 (puede contener claves en claro)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    return os.fdopen(fd, 'w', encoding='utf-8')
+
+
+def _replay(argv, encoding) -> subprocess.CompletedProcess:
+    try:
+        with open(_fixture_path(argv, encoding), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except OSError:
+        return subprocess.CompletedProcess(argv, 127, '', 'fixture no encontrado')
+    # Restaurar los archivos que el comando original escribió (netsh export)
+    folder = _folder_arg(argv)
+    if folder:
+        for name, content in data.get('files', {}).items():
+            with _open_private(os.path.join(folder, name)) as f:
+                f.write(content)
+    return subprocess.CompletedProcess(argv, data['returncode'], data['stdout'], data['stderr'])
+
+
+def _record(argv, encoding, result) -> None:
+    data = {
+        'argv': list(argv),
+        'returncode': result.returncode,
+        'stdout': result.stdout,
+        'stderr': result.stderr,
+    }
+    folder = _folder_arg(argv)
+    if folder and os.path.isdir(folder):
+        files = {}
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if os.path.isfile(path):
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    files[name] = f.read()
+        data['files'] = files
+    # Las salidas de `nmcli -s` y los XML con `keyMaterial` llevan claves en claro
+    os.makedirs(_fixture_dir, mode=0o700, exist_ok=True)
+    with _open_private(_fixture_path(argv, encoding)) as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+
+
+def _execute(argv, timeout, encoding) -> subprocess.CompletedProcess:
+    if _mode == 'replay':
+        return _replay(argv, encoding)
+    started = time.perf_counter()
+    try:
+        result = subprocess.run(argv, capture_output=True, text=True,
+                                encoding=encoding, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        trace.record('command', ' '.join(argv), started, time.perf_counter() - started,
+                     tool=argv[0], returncode=None, out_bytes=0, timed_out=True)
+        raise
+    trace.record('command', ' '.join(argv), started, time.perf_counter() - started,
+                 tool=argv[0], returncode=result.returncode,
+                 out_bytes=len(result.stdout or '') + len(result.stderr or ''),
+                 timed_out=False)
+    if _mode == 'record':
+        _record(argv, encoding, result)
+    return result
+
+
+def run(argv, timeout: float | None = DEFAULT_TIMEOUT, encoding: str | None = None,
+        reuse_for: float = 0.0) -> subprocess.CompletedProcess:
+    """Ejecuta `argv` capturando la salida como texto.
+
+    Parámetros:
+        argv: Comando y argumentos.
+        timeout: Segundos máximos; al agotarse lanza `subprocess.TimeoutExpired`.
+        encoding: Codificación de la salida (ej. 'cp1252' para `netsh`).
+        reuse_for: Si es mayor que 0, un resultado idéntico obtenido hace
+                   menos de esos segundos se devuelve sin lanzar otro proceso.
+
+    Retorna:
+        `subprocess.CompletedProcess` con stdout/stderr como texto.
+    """
+    argv = list(argv)
+    key = (tuple(argv), encoding)
+    with _lock:
+        # Los procesos largos (GUI, monitor) no acumulan salidas vencidas
+        now = time.monotonic()
+        _evict_expired(now)
+        if reuse_for > 0:
+            recent = _recent.get(key)
+            if recent and now - recent[0] <= reuse_for:
+                return recent[2]
+        call = _inflight.get(key)
+        owner = call is None
+        if owner:
+            call = _Call()
+            _inflight[key] = call
+
+    if not owner:
+        # Otra hebra ya ejecuta el mismo comando: esperar su resultado.
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = _execute(argv, timeout, encoding)
+        return call.result
+    except BaseException as e:
+        call.error = e
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+            if reuse_for > 0 and call.result is not None:
+                _recent[key] = (time.monotonic(), reuse_for, call.result)
+        call.done.set()
+
+
+class LineStream:
+    """Proceso de larga duración (p. ej. `ip monitor`) leído línea a línea.
+
+    El ejecutable se resuelve con `which()`; al terminar, el proceso completo
+    se registra en `trace` y, en modo 'record', las líneas leídas se guardan
+    como un fixture de `run()`. En modo 'replay' las líneas salen del
+    fixture sin lanzar ningún proceso y la iteración termina al agotarlas.
+    """
+
+    def __init__(self, argv, encoding: str | None = None):
+        self.argv = list(argv)
+        self.encoding = encoding
+        self._proc = None
+        self._replayed = None
+        self._lines = []
+        self._started = None
+        self._finished = False
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def start(self) -> 'LineStream':
+        """Lanza el proceso; FileNotFoundError si la herramienta no existe."""
+        if _mode == 'replay':
+            self._replayed = _replay(self.argv, self.encoding).stdout.splitlines(keepends=True)
+            return self
+        executable = which(self.argv[0])
+        if executable is None:
+            raise FileNotFoundError(f"Herramienta no encontrada: {self.argv[0]}")
+        self._started = time.perf_counter()
+        self._proc = subprocess.Popen([executable] + self.argv[1:], stdout=subprocess.PIPE,
+                                      stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL,
+                                      text=True, encoding=self.encoding, bufsize=1)
+        return self
+
+    def __iter__(self):
+        if self._replayed is not None:
+            yield from self._replayed
+            return
+        try:
+            # La lectura bloquea hasta que hay una línea nueva: sin sondeo
+            for line in self._proc.stdout:
+                with self._lock:
+                    self._lines.append(line)
+                yield line
+        finally:
+            self._finish()
+
+    def stop(self) -> None:
+        """Termina el proceso (si sigue vivo) y registra su ejecución."""
+        if self._proc is None:
+            return
+        if self._proc.poll() is None:
+            self._stopped = True
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+        self._finish()
+
+    def _finish(self) -> None:
+        with self._lock:
+            if self._finished or self._proc is None:
+                return
+            self._finished = True
+            output = ''.join(self._lines)
+        try:
+            # Tras el fin de la salida el proceso termina enseguida
+            returncode = self._proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            returncode = None
+        # Terminado por `stop()`: fin normal de un monitor, no un fallo
+        if self._stopped:
+            returncode = 0
+        trace.record('command', ' '.join(self.argv), self._started,
+                     time.perf_counter() - self._started, tool=self.argv[0],
+                     returncode=returncode, out_bytes=len(output), timed_out=False)
+        if _mode == 'record':
+            _record(self.argv, self.encoding,
+                    subprocess.CompletedProcess(self.argv, returncode, output, ''))
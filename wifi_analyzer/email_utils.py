@@ -2,9 +2,22 @@
 
 Este módulo proporciona funciones auxiliares para la composición y
 envío de mensajes por SMTP en texto plano.
+
+El reporte puede ir completo en el cuerpo o, con `compress='gzip'|'zip'`,
+como adjunto comprimido acompañado de un resumen breve en el cuerpo. En
+ambos casos el mensaje se serializa con `email.generator.BytesGenerator`
+directamente sobre la conexión SMTP (tras `DATA`), por bloques, en lugar de
+construir una copia completa con `msg.as_string()`.
 """
 
+import gzip
+import io
+import re
 import smtplib
+import zipfile
+from email import policy
+from email.generator import BytesGenerator
+from email.mime.application import MIMEApplication
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import Header
@@ -12,12 +25,124 @@ from email.utils import parseaddr
 
 LAST_ERROR = ""
 
+# Formatos de compresión del adjunto: (extensión, tipo MIME).
+COMPRESSIONS = {
+    'gzip': ('.txt.gz', 'gzip'),
+    'zip': ('.zip', 'zip'),
+}
+
+# Nombre base del reporte adjunto.
+ATTACHMENT_NAME = "wifi_report"
+
+# Bytes acumulados antes de escribir en el socket durante `DATA`.
+_SEND_CHUNK = 64 * 1024
+
+# Líneas para la duplicación de puntos: solo `\n` (o `\r\n`) termina una
+# línea; un `\r` suelto no es un inicio de línea para el servidor.
+_LINE_RE = re.compile(rb'[^\n]*\n|[^\n]+')
+
 def get_last_error() -> str:
     return LAST_ERROR
 
 
+def compress_report(body: str, compress: str) -> tuple[bytes, str, str]:
+    """Comprime el reporte; devuelve (datos, nombre de archivo, subtipo MIME)."""
+    try:
+        ext, subtype = COMPRESSIONS[compress]
+    except KeyError:
+        raise ValueError(f"Compresion no soportada: {compress}") from None
+    raw = body.encode('utf-8')
+    if compress == 'gzip':
+        return gzip.compress(raw), ATTACHMENT_NAME + ext, subtype
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(ATTACHMENT_NAME + '.txt', raw)
+    return buf.getvalue(), ATTACHMENT_NAME + ext, subtype
+
+
+def build_message(from_addr: str, to_addr: str, subject: str, body: str,
+                  compress: str | None = None, summary: str | None = None) -> MIMEMultipart:
+    """Compone el mensaje: reporte en el cuerpo o resumen más adjunto comprimido."""
+    msg = MIMEMultipart()
+    msg['From'] = from_addr
+    msg['To'] = to_addr
+    msg['Subject'] = str(Header(subject, 'utf-8'))
+    if not compress:
+        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        return msg
+    data, filename, subtype = compress_report(body, compress)
+    size_kb = len(body.encode('utf-8')) / 1024
+    note = (f"Reporte completo adjunto: {filename} "
+            f"({len(data) / 1024:.1f} KB; {size_kb:.1f} KB sin comprimir)\n")
+    msg.attach(MIMEText((summary.rstrip() + "\n\n" if summary else "") + note, 'plain', 'utf-8'))
+    attachment = MIMEApplication(data, subtype)
+    attachment.add_header('Content-Disposition', 'attachment', filename=filename)
+    msg.attach(attachment)
+    return msg
+
+
+class _DataWriter:
+    """Destino de `BytesGenerator` que escribe en la sesión SMTP durante `DATA`.
+
+    Duplica los puntos al inicio de línea (RFC 5321, 4.5.2) y envía por
+    bloques de `_SEND_CHUNK` bytes.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self._buf = bytearray()
+        self._line_start = True
+
+    def write(self, data: bytes) -> None:
+        for line in _LINE_RE.findall(data):
+            if self._line_start and line.startswith(b'.'):
+                self._buf += b'.'
+            self._buf += line
+            self._line_start = line.endswith(b'\n')
+        if len(self._buf) >= _SEND_CHUNK:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buf:
+            self.server.send(bytes(self._buf))
+            self._buf.clear()
+
+    def close(self) -> None:
+        if not self._line_start:
+            self._buf += b'\r\n'
+        self._buf += b'.\r\n'
+        self.flush()
+
+
+def send_message_streaming(server, from_addr: str, to_addr: str, msg) -> None:
+    """Envía `msg` generándolo directamente sobre la conexión (sin `as_string()`).
+
+    Lanza las mismas excepciones de `smtplib` que `sendmail`.
+    """
+    code, resp = server.mail(from_addr)
+    if code != 250:
+        server.rset()
+        raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+    code, resp = server.rcpt(to_addr)
+    if code not in (250, 251):
+        server.rset()
+        raise smtplib.SMTPRecipientsRefused({to_addr: (code, resp)})
+    server.putcmd('data')
+    code, resp = server.getreply()
+    if code != 354:
+        server.rset()
+        raise smtplib.SMTPDataError(code, resp)
+    writer = _DataWriter(server)
+    BytesGenerator(writer, mangle_from_=False, policy=policy.compat32.clone(linesep='\r\n')).flatten(msg)
+    writer.close()
+    code, resp = server.getreply()
+    if code != 250:
+        raise smtplib.SMTPDataError(code, resp)
+
+
 def send_email(smtp_server: str, smtp_port: int, email_user: str, email_password: str,
-               recipient_email: str, subject: str, body: str) -> bool:
+               recipient_email: str, subject: str, body: str,
+               compress: str | None = None, summary: str | None = None) -> bool:
     """Envía un correo electrónico en formato texto plano mediante SMTP.
 
     Parámetros:
@@ -28,6 +153,9 @@ def send_email(smtp_server: str, smtp_port: int, email_user: str, email_password
         recipient_email: Dirección de correo destino.
         subject: Asunto del mensaje.
         body: Cuerpo del mensaje en texto plano (UTF-8).
+        compress: 'gzip' o 'zip' para adjuntar `body` comprimido; None lo
+                  envía completo en el cuerpo.
+        summary: Texto breve del cuerpo cuando el reporte va adjunto.
 
     Retorna:
         True si el mensaje fue enviado correctamente; False en caso contrario.
@@ -55,30 +183,24 @@ def send_email(smtp_server: str, smtp_port: int, email_user: str, email_password
         recipient_email = _clean(recipient_email)
         subject = _clean(subject)
 
-        # Construcción del mensaje MIME multipart con cuerpo en texto plano.
-        msg = MIMEMultipart()
         # Solo la parte de dirección (sin nombre). Si quisieras nombre, usa Header en display name.
         from_addr = parseaddr(email_user)[1]
         to_addr = parseaddr(recipient_email)[1]
-        msg['From'] = from_addr
-        msg['To'] = to_addr
-        msg['Subject'] = str(Header(subject, 'utf-8'))
-
-        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        # Mensaje MIME multipart: reporte en texto plano o resumen + adjunto comprimido.
+        msg = build_message(from_addr, to_addr, subject, body, compress=compress, summary=summary)
 
         # Establecimiento de sesión SMTP con soporte para SSL (465) o STARTTLS (587).
-        if int(smtp_port) == 465:
-            server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30)
-            server.ehlo()
-        else:
-            server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
-            server.ehlo()
-            server.starttls()
+        # `with` cierra el socket también si el envío falla a mitad de `DATA`.
+        starttls = int(smtp_port) != 465
+        smtp_class = smtplib.SMTP if starttls else smtplib.SMTP_SSL
+        with smtp_class(smtp_server, smtp_port, timeout=30) as server:
             server.ehlo()
-        server.login(email_user, email_password)
-        # Despacho del mensaje al destinatario indicado.
-        server.sendmail(from_addr, to_addr, msg.as_string())
-        server.quit()
+            if starttls:
+                server.starttls()
+                server.ehlo()
+            server.login(email_user, email_password)
+            # Despacho del mensaje al destinatario indicado.
+            send_message_streaming(server, from_addr, to_addr, msg)
         LAST_ERROR = ""
         return True
     except Exception as e:
@@ -0,0 +1,179 @@
+"""Huella compacta del último análisis y diferencias entre ejecuciones.
+
+La huella guarda, por perfil, los atributos de seguridad y un hash HMAC‑SHA256
+de la clave con una sal aleatoria local (nunca la clave en claro), y por
+interfaz sus campos de `InterfaceRecord`. Comparar la huella actual con la
+anterior produce solo los perfiles e interfaces añadidos, eliminados o
+modificados.
+
+La huella se guarda en el directorio de caché del usuario con permisos 0600.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+from datetime import datetime
+
+from wifi_analyzer.cache import default_cache_dir
+from wifi_analyzer.formatters import key_status
+
+FINGERPRINT_VERSION = 1
+FINGERPRINT_FILE = 'fingerprint.json'
+
+# Atributos comparados por perfil; `last_used` se omite porque cambia en
+# cada conexión y no es un atributo de seguridad.
+PROFILE_ATTRS = ('ssid', 'auth', 'cipher', 'autoconnect', 'cost', 'key_status', 'key_hash')
+INTERFACE_ATTRS = ('kind', 'state', 'mac', 'mtu', 'driver', 'addresses')
+
+# Estados de clave que no permiten comparar la clave (no se consultó).
+_UNCOMPARABLE_STATUS = ('skipped',)
+
+
+def key_hash(salt: bytes, key: str) -> str:
+    """Hash corto y salado de una clave (HMAC‑SHA256 truncado a 16 hex)."""
+    return hmac.new(salt, key.encode('utf-8'), hashlib.sha256).hexdigest()[:16]
+
+
+def build(profiles_data: dict, interfaces=(), salt: bytes = b'') -> dict:
+    """Construye la huella a partir de los registros del análisis.
+
+    Parámetros:
+        profiles_data: {perfil: ProfileRecord} (o claves sueltas).
+        interfaces: Secuencia de `InterfaceRecord`.
+        salt: Sal usada para los hashes de clave.
+    """
+    profiles = {}
+    for name, record in profiles_data.items():
+        status = key_status(record)
+        profiles[str(name)] = {
+            'ssid': getattr(record, 'ssid', None),
+            'auth': getattr(record, 'auth', None),
+            'cipher': getattr(record, 'cipher', None),
+            'autoconnect': getattr(record, 'autoconnect', None),
+            'cost': getattr(record, 'cost', None),
+            'key_status': status,
+            'key_hash': key_hash(salt, str(record)) if status == 'present' else None,
+        }
+    ifaces = {}
+    for iface in interfaces:
+        values = {a: getattr(iface, a, None) for a in INTERFACE_ATTRS}
+        values['addresses'] = list(values['addresses'] or ())
+        ifaces[iface.name] = values
+    return {
+        'version': FINGERPRINT_VERSION,
+        'taken_at': datetime.now().isoformat(timespec='seconds'),
+        'profiles': profiles,
+        'interfaces': ifaces,
+    }
+
+
+def _diff_group(previous: dict, current: dict, attrs) -> dict:
+    added = sorted(n for n in current if n not in previous)
+    removed = sorted(n for n in previous if n not in current)
+    changed = {}
+    for name in sorted(n for n in current if n in previous):
+        old, new = previous[name], current[name]
+        skip_key = (old.get('key_status') in _UNCOMPARABLE_STATUS
+                    or new.get('key_status') in _UNCOMPARABLE_STATUS)
+        fields = {}
+        for attr in attrs:
+            if skip_key and attr in ('key_status', 'key_hash'):
+                continue
+            if old.get(attr) != new.get(attr):
+                fields[attr] = (old.get(attr), new.get(attr))
+        if fields:
+            changed[name] = fields
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def diff(previous: dict | None, current: dict, interfaces: bool = True) -> dict:
+    """Diferencias entre dos huellas.
+
+    Retorna:
+        {'since': fecha_previa|None,
+         'profiles': {'added': [...], 'removed': [...], 'changed': {nombre: {campo: (antes, ahora)}}},
+         'interfaces': {...} (solo si `interfaces`)}.
+        Sin huella previa, todos los perfiles aparecen como añadidos.
+    """
+    previous = previous or {}
+    changes = {
+        'since': previous.get('taken_at'),
+        'profiles': _diff_group(previous.get('profiles', {}), current['profiles'], PROFILE_ATTRS),
+    }
+    if interfaces:
+        changes['interfaces'] = _diff_group(previous.get('interfaces', {}),
+                                            current['interfaces'], INTERFACE_ATTRS)
+    return changes
+
+
+def carry_over(previous: dict | None, current: dict, interfaces: bool = True) -> dict:
+    """Conserva en `current` lo que esta ejecución no observó.
+
+    Las claves no consultadas (modo solo metadatos) mantienen el hash
+    anterior y, si no se leyeron interfaces, se conservan las previas, de
+    modo que el siguiente análisis completo compare contra lo último conocido.
+    """
+    if not previous:
+        return current
+    old_profiles = previous.get('profiles', {})
+    for name, values in current['profiles'].items():
+        old = old_profiles.get(name)
+        if old and values['key_status'] in _UNCOMPARABLE_STATUS:
+            values['key_status'] = old.get('key_status')
+            values['key_hash'] = old.get('key_hash')
+    if not interfaces:
+        current['interfaces'] = previous.get('interfaces', {})
+    return current
+
+
+def has_changes(changes: dict) -> bool:
+    return any(group['added'] or group['removed'] or group['changed']
+               for key, group in changes.items() if key != 'since')
+
+
+class FingerprintStore:
+    """Huella persistente del último análisis y su sal local."""
+
+    def __init__(self, directory: str | None = None):
+        self.directory = directory or default_cache_dir()
+        self.path = os.path.join(self.directory, FINGERPRINT_FILE)
+        self._data = None
+
+    def _load_raw(self) -> dict:
+        if self._data is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            self._data = data if isinstance(data, dict) else {}
+        return self._data
+
+    def salt(self) -> bytes:
+        """Sal de esta instalación (se conserva entre huellas para poder comparar)."""
+        try:
+            return base64.b64decode(self._load_raw()['salt'])
+        except (KeyError, ValueError, TypeError):
+            return secrets.token_bytes(16)
+
+    def load(self) -> dict | None:
+        """Última huella guardada; None si no existe o es de otra versión."""
+        data = self._load_raw()
+        snapshot = data.get('snapshot')
+        if not snapshot or snapshot.get('version') != FINGERPRINT_VERSION:
+            return None
+        return snapshot
+
+    def save(self, snapshot: dict, salt: bytes) -> None:
+        """Reemplaza la huella guardada (escritura atómica, permisos 0600)."""
+        data = {'salt': base64.b64encode(salt).decode('ascii'), 'snapshot': snapshot}
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self.path + '.tmp'
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+        self._data = data
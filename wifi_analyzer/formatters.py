@@ -0,0 +1,307 @@
+"""Formatos de salida del reporte (texto, JSON, JSON Lines, CSV).
+
+Todos los formateadores reciben las mismas estructuras (`profiles_data`,
+`extra` y metadatos por perfil) y escriben en cualquier objeto con
+`write(str)`. Los formatos estructurados siguen un esquema estable para que
+otras herramientas puedan cargarlos directamente:
+
+    perfil:  profile, auth, key_status, key, source, elapsed_ms,
+             ssid, cipher, autoconnect, cost, last_used
+    sección: section, title, content
+    cambio:  group, name, change, field, old, new   (modo diff)
+"""
+
+import json
+import os
+import platform
+from datetime import datetime
+
+from wifi_analyzer import report as report_mod
+
+SCHEMA_VERSION = 1
+
+# Columnas de cada perfil en los formatos estructurados (orden estable).
+PROFILE_FIELDS = ('profile', 'auth', 'key_status', 'key', 'source', 'elapsed_ms',
+                  'ssid', 'cipher', 'autoconnect', 'cost', 'last_used')
+
+# Columnas de cada cambio del modo diff (orden estable).
+DIFF_FIELDS = ('group', 'name', 'change', 'field', 'old', 'new')
+
+# Valor de clave en el modo solo metadatos (la clave nunca se solicita).
+METADATA_ONLY_VALUE = "No solicitada (solo metadatos)"
+
+# Valores de clave que no son una contraseña real -> estado normalizado.
+_STATUS_BY_PREFIX = (
+    ("Sin contrasena", 'none'),
+    ("No disponible", 'unavailable'),
+    ("Error al obtener", 'error'),
+    ("No solicitada", 'skipped'),
+)
+
+
+def key_status(value) -> str:
+    """Clasifica el valor devuelto por la extracción: present/none/unavailable/error/skipped."""
+    text = str(value)
+    for prefix, status in _STATUS_BY_PREFIX:
+        if text.startswith(prefix):
+            return status
+    return 'present'
+
+
+def profile_rows(profiles_data: dict, profiles_meta: dict | None = None) -> list[dict]:
+    """Filas normalizadas por perfil, ordenadas por nombre.
+
+    Los atributos se leen del `ProfileRecord` de cada perfil; los valores
+    sueltos (solo clave) dejan esas columnas vacías.
+    """
+    meta = profiles_meta or {}
+    rows = []
+    for name in sorted(profiles_data, key=lambda p: str(p).lower()):
+        value = profiles_data[name]
+        info = meta.get(name, {})
+        status = key_status(value)
+        rows.append({
+            'profile': str(name),
+            'auth': getattr(value, 'auth', None),
+            'key_status': status,
+            'key': str(value) if status == 'present' else None,
+            'source': info.get('source'),
+            'elapsed_ms': info.get('elapsed_ms'),
+            'ssid': getattr(value, 'ssid', None),
+            'cipher': getattr(value, 'cipher', None),
+            'autoconnect': getattr(value, 'autoconnect', None),
+            'cost': getattr(value, 'cost', None),
+            'last_used': getattr(value, 'last_used', None),
+        })
+    return rows
+
+
+def metadata_inventory(profiles_data: dict, profiles_meta: dict | None) -> dict | None:
+    """Registros por perfil si el análisis fue de solo metadatos; si no, None."""
+    meta = profiles_meta or {}
+    if not profiles_data or any(meta.get(p, {}).get('source') != 'metadata' for p in profiles_data):
+        return None
+    return profiles_data
+
+
+def format_summary(profiles_data: dict, extra: dict | None = None) -> str:
+    """Resumen breve del reporte para el cuerpo del correo cuando el reporte va adjunto."""
+    meta = run_metadata()
+    counts = {}
+    for value in profiles_data.values():
+        status = key_status(value)
+        counts[status] = counts.get(status, 0) + 1
+    labels = (('present', "con clave"), ('none', "sin clave"), ('unavailable', "no disponible"),
+              ('error', "con error"), ('skipped', "sin consultar"))
+    detail = ", ".join(f"{label}: {counts[s]}" for s, label in labels if counts.get(s))
+    lines = [
+        "RESUMEN DEL REPORTE WI-FI",
+        f"Fecha y hora: {meta['generated_at'].replace('T', ' ')}",
+        f"Equipo: {meta['computer']}",
+        f"Usuario: {meta['user']}",
+        "",
+        f"Perfiles analizados: {len(profiles_data)}" + (f" ({detail})" if detail else ""),
+    ]
+    sections = [row['section'] for row in _section_rows(extra)]
+    if sections:
+        lines.append("Secciones adicionales: " + ", ".join(sections))
+    return "\n".join(lines) + "\n"
+
+
+def run_metadata() -> dict:
+    system_name = platform.system()
+    computer, user = report_mod.host_info(system_name)
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'system': system_name,
+        'computer': computer,
+        'user': user,
+    }
+
+
+def _section_rows(extra: dict | None) -> list[dict]:
+    system_name = platform.system()
+    rows = []
+    for section in report_mod.SECTION_KEYS:
+        content = (extra or {}).get(section)
+        if content:
+            rows.append({
+                'section': section,
+                'title': report_mod.section_title(system_name, section),
+                'content': content.rstrip(),
+            })
+    return rows
+
+
+def write_text(sink, profiles_data, extra=None, profiles_meta=None):
+    report_mod.write_report(sink, profiles_data, extra,
+                            inventory=metadata_inventory(profiles_data, profiles_meta))
+
+
+def write_json(sink, profiles_data, extra=None, profiles_meta=None):
+    doc = run_metadata()
+    doc['profiles'] = profile_rows(profiles_data, profiles_meta)
+    doc['sections'] = _section_rows(extra)
+    json.dump(doc, sink, ensure_ascii=False, indent=2)
+    sink.write("\n")
+
+
+def write_jsonl(sink, profiles_data, extra=None, profiles_meta=None):
+    """Una línea por registro: primero `meta`, luego perfiles y secciones."""
+    sink.write(json.dumps({'type': 'meta', **run_metadata()}, ensure_ascii=False) + "\n")
+    for row in profile_rows(profiles_data, profiles_meta):
+        sink.write(json.dumps({'type': 'profile', **row}, ensure_ascii=False) + "\n")
+    for row in _section_rows(extra):
+        sink.write(json.dumps({'type': 'section', **row}, ensure_ascii=False) + "\n")
+
+
+def write_csv(sink, profiles_data, extra=None, profiles_meta=None):
+    """Solo la tabla de perfiles; las secciones de texto libre no aplican a CSV."""
+    import csv
+
+    writer = csv.DictWriter(sink, fieldnames=PROFILE_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for row in profile_rows(profiles_data, profiles_meta):
+        writer.writerow(row)
+
+
+FORMATTERS = {
+    'text': write_text,
+    'json': write_json,
+    'jsonl': write_jsonl,
+    'csv': write_csv,
+}
+
+EXTENSIONS = {
+    'text': '.txt',
+    'json': '.json',
+    'jsonl': '.jsonl',
+    'csv': '.csv',
+}
+
+
+def format_for_path(path: str, default: str = 'text') -> str:
+    """Deduce el formato a partir de la extensión del archivo."""
+    ext = os.path.splitext(path)[1].lower()
+    for fmt, fmt_ext in EXTENSIONS.items():
+        if ext == fmt_ext:
+            return fmt
+    return default
+
+
+def write(fmt: str, sink, profiles_data: dict, extra: dict | None = None,
+          profiles_meta: dict | None = None) -> None:
+    """Escribe el reporte en el formato indicado ('text', 'json', 'jsonl', 'csv')."""
+    try:
+        formatter = FORMATTERS[fmt]
+    except KeyError:
+        raise ValueError(f"Formato no soportado: {fmt}") from None
+    formatter(sink, profiles_data, extra, profiles_meta)
+
+
+def diff_rows(changes: dict) -> list[dict]:
+    """Filas normalizadas del modo diff: una por alta, baja o campo modificado."""
+    rows = []
+    for group in ('profiles', 'interfaces'):
+        entries = changes.get(group)
+        if not entries:
+            continue
+        for name in entries['added']:
+            rows.append({'group': group, 'name': name, 'change': 'added',
+                         'field': None, 'old': None, 'new': None})
+        for name in entries['removed']:
+            rows.append({'group': group, 'name': name, 'change': 'removed',
+                         'field': None, 'old': None, 'new': None})
+        for name, fields in entries['changed'].items():
+            for field, (old, new) in fields.items():
+                rows.append({'group': group, 'name': name, 'change': 'changed',
+                             'field': field, 'old': old, 'new': new})
+    return rows
+
+
+def write_diff_text(sink, changes):
+    report_mod.write_diff_report(sink, changes)
+
+
+def write_diff_json(sink, changes):
+    doc = run_metadata()
+    doc['since'] = changes.get('since')
+    doc['changes'] = diff_rows(changes)
+    json.dump(doc, sink, ensure_ascii=False, indent=2)
+    sink.write("\n")
+
+
+def write_diff_jsonl(sink, changes):
+    meta = {'type': 'meta', **run_metadata(), 'since': changes.get('since')}
+    sink.write(json.dumps(meta, ensure_ascii=False) + "\n")
+    for row in diff_rows(changes):
+        sink.write(json.dumps({'type': 'change', **row}, ensure_ascii=False) + "\n")
+
+
+def write_diff_csv(sink, changes):
+    import csv
+
+    writer = csv.DictWriter(sink, fieldnames=DIFF_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for row in diff_rows(changes):
+        # Las listas (direcciones) se unen como en el reporte de texto
+        writer.writerow({k: ", ".join(map(str, v)) if isinstance(v, list) else v
+                         for k, v in row.items()})
+
+
+DIFF_FORMATTERS = {
+    'text': write_diff_text,
+    'json': write_diff_json,
+    'jsonl': write_diff_jsonl,
+    'csv': write_diff_csv,
+}
+
+
+def write_diff(fmt: str, sink, changes: dict) -> None:
+    """Escribe el resultado de `fingerprint.diff` en el formato indicado."""
+    try:
+        formatter = DIFF_FORMATTERS[fmt]
+    except KeyError:
+        raise ValueError(f"Formato no soportado: {fmt}") from None
+    formatter(sink, changes)
+
+
+def table_cell(value) -> str:
+    """Texto de una celda: '-' si no hay valor, Si/No para booleanos y listas unidas por comas."""
+    if isinstance(value, bool):
+        return "Si" if value else "No"
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value) or "-"
+    if value is None or value == '':
+        return "-"
+    return str(value)
+
+
+def write_table(fmt: str, sink, rows: list[dict], columns) -> None:
+    """Escribe filas homogéneas (p. ej. consultas del historial) en el formato indicado.
+
+    'text' produce una tabla alineada; 'json' una lista; 'jsonl' un objeto por
+    línea y 'csv' una fila por registro con `columns` como encabezado.
+    """
+    if fmt == 'json':
+        json.dump([{c: row.get(c) for c in columns} for row in rows], sink,
+                  ensure_ascii=False, indent=2)
+        sink.write("\n")
+    elif fmt == 'jsonl':
+        for row in rows:
+            sink.write(json.dumps({c: row.get(c) for c in columns}, ensure_ascii=False) + "\n")
+    elif fmt == 'csv':
+        import csv
+
+        writer = csv.DictWriter(sink, fieldnames=columns, extrasaction='ignore', lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+    elif fmt == 'text':
+        cells = [[table_cell(row.get(c)) for c in columns] for row in rows]
+        widths = [max([len(c)] + [len(r[n]) for r in cells]) for n, c in enumerate(columns)]
+        for line in [list(columns)] + cells:
+            sink.write("  ".join(f"{c:<{w}}" for c, w in zip(line, widths)).rstrip() + "\n")
+    else:
+        raise ValueError(f"Formato no soportado: {fmt}")
+
@@ -0,0 +1,273 @@
+"""Historial local de análisis en SQLite (perfiles e interfaces por ejecución).
+
+Cada ejecución de `history record` inserta, en una única transacción, una
+fila en `runs` y los registros estructurados de perfiles e interfaces. De
+cada clave solo se guarda su estado (`key_status`), nunca la clave ni un
+hash: una base copiada no permite probar contraseñas sin conexión. Las
+bases de la versión 1 del esquema, que guardaban un hash con sal local, se
+limpian al abrirlas.
+
+Índices:
+    runs(taken_at)             rango de fechas -> rango de `run_id`
+    profiles(name, run_id)     historial de un perfil
+    interfaces(name, run_id)   historial de una interfaz
+
+Los `run_id` crecen con el tiempo, por lo que una consulta por nombre y
+rango de fechas se resuelve con dos búsquedas en índice, sin recorrer la
+tabla, aunque haya meses de ejecuciones.
+"""
+
+import os
+import sqlite3
+from datetime import datetime, time as dtime
+
+from wifi_analyzer.cache import default_cache_dir
+from wifi_analyzer.formatters import key_status
+
+HISTORY_FILE = 'history.sqlite3'
+SCHEMA_VERSION = 2
+
+# Columnas por tabla (orden estable; también son las columnas de la CLI).
+PROFILE_COLUMNS = ('ssid', 'auth', 'cipher', 'autoconnect', 'cost', 'last_used', 'key_status')
+INTERFACE_COLUMNS = ('kind', 'state', 'mac', 'mtu', 'driver', 'addresses')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    taken_at TEXT NOT NULL,
+    system TEXT,
+    computer TEXT,
+    metadata_only INTEGER NOT NULL DEFAULT 0,
+    profile_count INTEGER NOT NULL DEFAULT 0,
+    interface_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_taken_at ON runs(taken_at);
+CREATE TABLE IF NOT EXISTS profiles (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    ssid TEXT, auth TEXT, cipher TEXT, autoconnect INTEGER, cost TEXT,
+    last_used TEXT, key_status TEXT
+);
+CREATE INDEX IF NOT EXISTS profiles_name_run ON profiles(name, run_id);
+CREATE TABLE IF NOT EXISTS interfaces (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    kind TEXT, state TEXT, mac TEXT, mtu INTEGER, driver TEXT, addresses TEXT
+);
+CREATE INDEX IF NOT EXISTS interfaces_name_run ON interfaces(name, run_id);
+"""
+
+
+def parse_bound(value: str | None, end: bool = False) -> str | None:
+    """Normaliza un límite de fecha ('2026-01-31' o ISO completo) a texto ISO.
+
+    Con `end=True` una fecha sin hora abarca el día completo.
+    """
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Fecha invalida: {value} (use AAAA-MM-DD o AAAA-MM-DDTHH:MM:SS)") from None
+    if end and len(value) <= 10:
+        moment = datetime.combine(moment.date(), dtime.max)
+    return moment.isoformat(timespec='seconds')
+
+
+class HistoryStore:
+    """Historial de ejecuciones en una base SQLite local (permisos 0600)."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(default_cache_dir(), HISTORY_FILE)
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if not os.path.exists(self.path):
+                # Crear el archivo con permisos restringidos antes que SQLite
+                os.close(os.open(self.path, os.O_WRONLY | os.O_CREAT, 0o600))
+            conn = sqlite3.connect(self.path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.executescript(_SCHEMA)
+            conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('schema_version', ?)",
+                         (str(SCHEMA_VERSION),))
+            conn.commit()
+            _migrate(conn)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, profiles_data: dict, interfaces=(), system: str | None = None,
+               computer: str | None = None, metadata_only: bool = False,
+               taken_at: str | None = None) -> int:
+        """Guarda una ejecución completa en una sola transacción.
+
+        Parámetros:
+            profiles_data: {perfil: ProfileRecord} del análisis.
+            interfaces: Secuencia de `InterfaceRecord`.
+            taken_at: Instante ISO de la ejecución (por defecto, ahora).
+
+        Retorna:
+            Identificador de la ejecución (`run_id`).
+        """
+        conn = self._connect()
+        profile_rows = []
+        for name, record in profiles_data.items():
+            status = key_status(record)
+            autoconnect = getattr(record, 'autoconnect', None)
+            profile_rows.append((
+                str(name),
+                getattr(record, 'ssid', None),
+                getattr(record, 'auth', None),
+                getattr(record, 'cipher', None),
+                None if autoconnect is None else int(autoconnect),
+                getattr(record, 'cost', None),
+                getattr(record, 'last_used', None),
+                status,
+            ))
+        interface_rows = [
+            (i.name, i.kind, i.state, i.mac, i.mtu, i.driver, ", ".join(i.addresses or ()) or None)
+            for i in interfaces
+        ]
+        taken_at = taken_at or datetime.now().isoformat(timespec='seconds')
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO runs(taken_at, system, computer, metadata_only, profile_count,"
+                " interface_count) VALUES (?, ?, ?, ?, ?, ?)",
+                (taken_at, system, computer, int(metadata_only), len(profile_rows),
+                 len(interface_rows)))
+            run_id = cur.lastrowid
+            conn.executemany(
+                "INSERT INTO profiles(run_id, name, " + ", ".join(PROFILE_COLUMNS) + ") "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id,) + row for row in profile_rows])
+            conn.executemany(
+                "INSERT INTO interfaces(run_id, name, " + ", ".join(INTERFACE_COLUMNS) + ") "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id,) + row for row in interface_rows])
+        return run_id
+
+    def _run_range(self, since: str | None, until: str | None) -> tuple[int, int] | None:
+        """Rango de `run_id` de las ejecuciones entre dos fechas (índice de `taken_at`)."""
+        row = self._connect().execute(
+            "SELECT MIN(id) AS lo, MAX(id) AS hi FROM runs WHERE taken_at >= ? AND taken_at <= ?",
+            (since or '', until or '9999')).fetchone()
+        if row['lo'] is None:
+            return None
+        return row['lo'], row['hi']
+
+    def runs(self, since: str | None = None, until: str | None = None,
+             limit: int | None = None) -> list[dict]:
+        """Ejecuciones registradas entre dos fechas, de la más reciente a la más antigua."""
+        sql = ("SELECT id AS run, taken_at, system, computer, metadata_only,"
+               " profile_count AS profiles, interface_count AS interfaces"
+               " FROM runs WHERE taken_at >= ? AND taken_at <= ? ORDER BY id DESC")
+        params = [since or '', until or '9999']
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._connect().execute(sql, params)]
+
+    def _history(self, table: str, columns, name: str, since: str | None,
+                 until: str | None) -> list[dict]:
+        bounds = self._run_range(since, until)
+        if bounds is None:
+            return []
+        sql = (f"SELECT r.id AS run, r.taken_at, {', '.join('t.' + c for c in columns)}"
+               f" FROM {table} t JOIN runs r ON r.id = t.run_id"
+               f" WHERE t.name = ? AND t.run_id BETWEEN ? AND ? ORDER BY t.run_id")
+        rows = [dict(row) for row in self._connect().execute(sql, (name,) + bounds)]
+        if table == 'profiles':
+            for row in rows:
+                if row['autoconnect'] is not None:
+                    row['autoconnect'] = bool(row['autoconnect'])
+        return rows
+
+    def profile_history(self, name: str, since: str | None = None,
+                        until: str | None = None) -> list[dict]:
+        """Estado del perfil en cada ejecución del rango (de la más antigua a la más reciente)."""
+        return self._history('profiles', PROFILE_COLUMNS, name, since, until)
+
+    def interface_history(self, name: str, since: str | None = None,
+                          until: str | None = None) -> list[dict]:
+        """Estado de la interfaz en cada ejecución del rango."""
+        return self._history('interfaces', INTERFACE_COLUMNS, name, since, until)
+
+    def first_seen(self, name: str, table: str = 'profiles') -> str | None:
+        """Fecha de la primera ejecución en la que aparece el perfil (o interfaz)."""
+        row = self._connect().execute(
+            f"SELECT r.taken_at FROM {table} t JOIN runs r ON r.id = t.run_id"
+            f" WHERE t.name = ? ORDER BY t.run_id LIMIT 1", (name,)).fetchone()
+        return row['taken_at'] if row else None
+
+    def last_seen(self, name: str, table: str = 'profiles') -> str | None:
+        """Fecha de la última ejecución en la que aparece el perfil (o interfaz)."""
+        row = self._connect().execute(
+            f"SELECT r.taken_at FROM {table} t JOIN runs r ON r.id = t.run_id"
+            f" WHERE t.name = ? ORDER BY t.run_id DESC LIMIT 1", (name,)).fetchone()
+        return row['taken_at'] if row else None
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Actualiza bases de versiones anteriores del esquema."""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+    if int(row['value']) >= SCHEMA_VERSION:
+        return
+    # v1 -> v2: se eliminan los hashes de clave y su sal
+    columns = [r['name'] for r in conn.execute("PRAGMA table_info(profiles)")]
+    with conn:
+        if 'key_hash' in columns:
+            conn.execute("UPDATE profiles SET key_hash = NULL")
+        conn.execute("DELETE FROM meta WHERE key = 'salt'")
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'schema_version'",
+                     (str(SCHEMA_VERSION),))
+    # Sin VACUUM los valores borrados seguirían en las páginas libres del archivo
+    conn.execute("VACUUM")
+
+
+# Campos que cambian sin que cambie el perfil: NetworkManager reescribe
+# `connection.timestamp` mientras la conexión está activa (como en `fingerprint.PROFILE_ATTRS`).
+_UNSTABLE_COLUMNS = ('last_used',)
+
+
+def changes_only(rows: list[dict], columns) -> list[dict]:
+    """Filtra un historial dejando la primera fila y las que cambian algún campo.
+
+    `last_used` se muestra pero no cuenta como cambio. Las claves no
+    consultadas (`key_status` 'skipped', modo solo metadatos) tampoco: se
+    compara contra el último estado conocido.
+    """
+    result = []
+    previous = None
+    for row in rows:
+        if previous is None:
+            result.append(row)
+            previous = row
+            continue
+        skipped = row.get('key_status') == 'skipped'
+        compared = [c for c in columns
+                    if c not in _UNSTABLE_COLUMNS and not (skipped and c == 'key_status')]
+        if any(row[c] != previous[c] for c in compared):
+            result.append(row)
+        if skipped:
+            row = {**row, 'key_status': previous['key_status']}
+        previous = row
+    return result
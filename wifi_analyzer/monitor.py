@@ -0,0 +1,256 @@
+"""Monitor de interfaces en vivo por eventos (sin volver a consultar secciones).
+
+Se lanza una sola vez un proceso que informa de cambios (`ip -o monitor link
+address` en Linux o, sin `ip`, `nmcli device monitor`) y cada línea se
+convierte en un `InterfaceEvent` que actualiza un `InterfaceModel` en
+memoria. Entre eventos el hilo lector queda bloqueado en la lectura del
+proceso: el estado estable no consume CPU ni lanza procesos nuevos.
+
+Para pruebas y reproducciones, `LineEventSource` entrega líneas ya
+grabadas (un archivo o una lista) con el mismo formato que `ip -o monitor`.
+
+En Windows no hay un equivalente por línea de comandos; `default_source()`
+devuelve None y el monitor no está disponible.
+"""
+
+import platform
+import queue
+import re
+import threading
+
+from wifi_analyzer import commands
+from wifi_analyzer.records import InterfaceRecord
+
+
+# Campos del modelo mostrados por la CLI y la GUI.
+MODEL_FIELDS = ('name', 'kind', 'state', 'mac', 'mtu', 'addresses')
+
+
+class InterfaceEvent:
+    """Cambio de una interfaz: campos nuevos, alta/baja de dirección o eliminación."""
+
+    __slots__ = ('name', 'removed', 'fields', 'add_address', 'del_address')
+
+    def __init__(self, name: str, removed: bool = False, fields: dict | None = None,
+                 add_address: str | None = None, del_address: str | None = None):
+        self.name = name
+        self.removed = removed
+        self.fields = fields or {}
+        self.add_address = add_address
+        self.del_address = del_address
+
+    def __repr__(self) -> str:
+        return (f"InterfaceEvent(name={self.name!r}, removed={self.removed!r}, "
+                f"fields={self.fields!r}, add={self.add_address!r}, del={self.del_address!r})")
+
+
+# `[LINK]`/`[ADDR]` y la marca de tiempo aparecen según la versión y opciones de `ip`.
+_IP_EVENT_RE = re.compile(
+    r'^(?:\[[^\]]*\]\s*)*(?P<deleted>Deleted\s+)?\d+:\s+(?P<name>[^\s:@]+)(?:@\S+?)?(?P<colon>:?)\s+(?P<rest>.*)$')
+_IP_ADDR_RE = re.compile(r'^inet6?\s+(\S+)')
+_IP_MTU_RE = re.compile(r'\bmtu\s+(\d+)')
+_IP_STATE_RE = re.compile(r'\bstate\s+(\S+)')
+_IP_LINK_RE = re.compile(r'\blink/(\S+)(?:\s+([0-9a-fA-F:]{11,}))?')
+
+
+def parse_ip_monitor(line: str) -> InterfaceEvent | None:
+    """Convierte una línea de `ip -o monitor link address`; None si no aplica."""
+    m = _IP_EVENT_RE.match(line.strip())
+    if not m:
+        return None
+    name, rest = m.group('name'), m.group('rest')
+    deleted = bool(m.group('deleted'))
+    addr = _IP_ADDR_RE.match(rest)
+    if addr and not m.group('colon'):
+        if deleted:
+            return InterfaceEvent(name, del_address=addr.group(1))
+        return InterfaceEvent(name, add_address=addr.group(1))
+    if deleted:
+        return InterfaceEvent(name, removed=True)
+    fields = {}
+    mtu = _IP_MTU_RE.search(rest)
+    if mtu:
+        fields['mtu'] = int(mtu.group(1))
+    state = _IP_STATE_RE.search(rest)
+    if state:
+        fields['state'] = state.group(1)
+    link = _IP_LINK_RE.search(rest)
+    if link:
+        fields['kind'] = link.group(1)
+        if link.group(2):
+            fields['mac'] = link.group(2).lower()
+    return InterfaceEvent(name, fields=fields)
+
+
+def parse_nmcli_monitor(line: str) -> InterfaceEvent | None:
+    """Convierte una línea de `nmcli device monitor` (`wlan0: connected`)."""
+    name, sep, text = line.strip().partition(': ')
+    if not sep or not name or ' ' in name:
+        return None
+    if text == 'device removed':
+        return InterfaceEvent(name, removed=True)
+    if text in ('device created', 'device added'):
+        return InterfaceEvent(name)
+    if text.startswith('using connection'):
+        return None
+    # `connecting (prepare)` -> `connecting`
+    return InterfaceEvent(name, fields={'state': text.split(' (', 1)[0]})
+
+
+class InterfaceModel:
+    """Interfaces conocidas, actualizadas evento a evento."""
+
+    def __init__(self, records=()):
+        self._lock = threading.Lock()
+        self._records = {r.name: r for r in records}
+
+    def load(self, records) -> None:
+        """Reemplaza el estado completo (instantánea inicial)."""
+        with self._lock:
+            self._records = {r.name: r for r in records}
+
+    def records(self) -> list[InterfaceRecord]:
+        with self._lock:
+            return [self._records[n] for n in sorted(self._records)]
+
+    def apply(self, event: InterfaceEvent) -> list[str]:
+        """Aplica un evento y describe los cambios reales (lista vacía si no cambió nada)."""
+        with self._lock:
+            record = self._records.get(event.name)
+            if event.removed:
+                if record is None:
+                    return []
+                del self._records[event.name]
+                return [f"{event.name}: eliminada"]
+            if record is None:
+                # Interfaz nueva: un solo aviso con sus campos ya aplicados
+                addresses = (event.add_address,) if event.add_address else ()
+                self._records[event.name] = InterfaceRecord(event.name, addresses=addresses,
+                                                            **event.fields)
+                return [f"{event.name}: nueva"]
+            changes = []
+            for field, value in event.fields.items():
+                old = getattr(record, field)
+                if old != value:
+                    setattr(record, field, value)
+                    changes.append(f"{event.name}: {field} {old if old is not None else '-'} -> {value}")
+            if event.add_address and event.add_address not in record.addresses:
+                record.addresses = record.addresses + (event.add_address,)
+                changes.append(f"{event.name}: + {event.add_address}")
+            if event.del_address and event.del_address in record.addresses:
+                record.addresses = tuple(a for a in record.addresses if a != event.del_address)
+                changes.append(f"{event.name}: - {event.del_address}")
+            return changes
+
+
+class ProcessEventSource:
+    """Lanza una vez un proceso de monitoreo y emite un evento por línea útil.
+
+    El proceso pasa por `commands.LineStream`: aparece en `--profile` y se
+    puede grabar y reproducir con los fixtures de `commands`.
+    """
+
+    def __init__(self, argv: list[str], parser):
+        self.argv = argv
+        self.parser = parser
+        self._stream = None
+
+    def start(self, emit) -> None:
+        self._stream = commands.LineStream(self.argv).start()
+        threading.Thread(target=self._read, args=(emit,), name='wifi-monitor', daemon=True).start()
+
+    def _read(self, emit) -> None:
+        for line in self._stream:
+            event = self.parser(line)
+            if event is not None:
+                emit(event)
+        emit(None)
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+
+
+class LineEventSource:
+    """Fuente sustituta: entrega líneas grabadas (lista o archivo) sin lanzar procesos."""
+
+    def __init__(self, lines, parser=parse_ip_monitor):
+        self.lines = lines
+        self.parser = parser
+
+    @classmethod
+    def from_file(cls, path: str, parser=parse_ip_monitor) -> 'LineEventSource':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read().splitlines(), parser)
+
+    def start(self, emit) -> None:
+        for line in self.lines:
+            event = self.parser(line)
+            if event is not None:
+                emit(event)
+        emit(None)
+
+    def stop(self) -> None:
+        pass
+
+
+def default_source() -> ProcessEventSource | None:
+    """Fuente de eventos del sistema; None si no hay herramienta disponible."""
+    if platform.system() == 'Windows':
+        return None
+    if commands.which('ip') is not None:
+        return ProcessEventSource(['ip', '-o', 'monitor', 'link', 'address'], parse_ip_monitor)
+    if commands.which('nmcli') is not None:
+        return ProcessEventSource(['nmcli', 'device', 'monitor'], parse_nmcli_monitor)
+    return None
+
+
+class InterfaceMonitor:
+    """Instantánea inicial más eventos incrementales sobre un `InterfaceModel`.
+
+    La fuente se inicia antes de leer la instantánea para no perder cambios
+    ocurridos entre ambas; los eventos se encolan y se aplican al consumirlos
+    con `next_changes()` (bloqueante, CLI) o `drain()` (sin bloquear, GUI).
+    """
+
+    def __init__(self, source, load_records):
+        self.source = source
+        self.load_records = load_records
+        self.model = InterfaceModel()
+        self.finished = False
+        self._events = queue.Queue()
+
+    def start(self) -> list[InterfaceRecord]:
+        self.source.start(self._events.put)
+        self.model.load(self.load_records())
+        return self.model.records()
+
+    def stop(self) -> None:
+        self.source.stop()
+
+    def _apply(self, event) -> list[str]:
+        if event is None:
+            self.finished = True
+            return []
+        return self.model.apply(event)
+
+    def next_changes(self, timeout: float | None = None) -> list[str]:
+        """Espera el siguiente evento que cambie algo; lista vacía al terminar o agotar el plazo."""
+        while not self.finished:
+            try:
+                event = self._events.get(timeout=timeout)
+            except queue.Empty:
+                return []
+            changes = self._apply(event)
+            if changes:
+                return changes
+        return []
+
+    def drain(self) -> list[str]:
+        """Aplica los eventos pendientes sin esperar."""
+        changes = []
+        while True:
+            try:
+                changes.extend(self._apply(self._events.get_nowait()))
+            except queue.Empty:
+                return changes
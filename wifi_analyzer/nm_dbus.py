@@ -0,0 +1,228 @@
+"""Backend opcional de NetworkManager por D-Bus (sin lanzar `nmcli`).
+
+Requiere `dbus-python`; si el módulo no está instalado, el bus del sistema
+no responde o NetworkManager no está en ejecución, `available()` devuelve
+False y `platform_linux` sigue usando keyfiles o `nmcli`.
+
+Las conexiones se listan con `Settings.ListConnections` y se leen con
+`Connection.GetSettings`; los secretos (`GetSecrets`) solo se piden cuando
+el llamador los solicita. Todas las llamadas comparten una única conexión
+al bus; la disponibilidad se comprueba una vez por proceso y el mapa
+nombre -> ruta D-Bus se construye una vez (o al leer la instantánea), de
+modo que cada consulta individual lee una sola conexión. Si un nombre no
+está en el mapa, este se reconstruye como mucho una vez cada
+`REBUILD_INTERVAL` segundos, aunque se consulten muchos nombres inexistentes. Los campos se
+devuelven con los mismos nombres que `nmcli -t` (`802-11-wireless.ssid`,
+`connection.autoconnect`...), por lo que el resto del módulo de Linux los
+trata igual que una instantánea de `nmcli`.
+
+Con `WIFI_ANALYZER_NM_BACKEND=nmcli` el backend se desactiva.
+"""
+
+import os
+import threading
+import time
+
+try:
+    import dbus
+except ImportError:
+    dbus = None
+
+NM_BUS_NAME = 'org.freedesktop.NetworkManager'
+NM_SETTINGS_PATH = '/org/freedesktop/NetworkManager/Settings'
+NM_SETTINGS_IFACE = 'org.freedesktop.NetworkManager.Settings'
+NM_CONNECTION_IFACE = 'org.freedesktop.NetworkManager.Settings.Connection'
+DBUS_PROPERTIES_IFACE = 'org.freedesktop.DBus.Properties'
+
+# Setting cuyos secretos se solicitan (la PSK de las redes WPA/WEP).
+SECURITY_SETTING = '802-11-wireless-security'
+
+# Campo añadido cuando `GetSecrets` falla (sin agente, polkit denegado...).
+SECRETS_UNAVAILABLE = 'x-secrets-unavailable'
+
+_WIFI_TYPE = '802-11-wireless'
+
+_lock = threading.Lock()
+_bus = None
+_available = None
+# Segundos mínimos entre reconstrucciones del mapa por consultas sin resultado.
+REBUILD_INTERVAL = 5.0
+
+# {nombre_conexion: ruta D-Bus} de las conexiones Wi‑Fi; una sola hebra lo reconstruye.
+_paths = {}
+_paths_built = None
+_paths_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    """True si el backend no fue desactivado y `dbus-python` está instalado."""
+    return dbus is not None and os.environ.get('WIFI_ANALYZER_NM_BACKEND', 'auto') != 'nmcli'
+
+
+def _system_bus():
+    """Conexión al bus del sistema compartida por todas las consultas."""
+    global _bus
+    with _lock:
+        if _bus is None:
+            # private=False: dbus-python reutiliza la conexión del proceso
+            _bus = dbus.SystemBus()
+        return _bus
+
+
+def reset() -> None:
+    """Olvida la conexión compartida y lo ya consultado (p. ej. tras reiniciar el bus)."""
+    global _bus, _available, _paths_built
+    with _lock:
+        _bus = None
+        _available = None
+        _paths.clear()
+        _paths_built = None
+
+
+def available() -> bool:
+    """True si NetworkManager responde en el bus del sistema (se consulta una vez)."""
+    global _available
+    if not enabled():
+        return False
+    if _available is None:
+        try:
+            result = bool(_system_bus().name_has_owner(NM_BUS_NAME))
+        except Exception:
+            result = False
+        with _lock:
+            _available = result
+    return _available
+
+
+def _text(setting: str, key: str, value) -> str:
+    """Convierte un valor D-Bus al texto que mostraría `nmcli -t`."""
+    if isinstance(value, dbus.Boolean):
+        return 'yes' if value else 'no'
+    if isinstance(value, (dbus.Array, list)):
+        if setting == _WIFI_TYPE and key == 'ssid':
+            return bytes(bytearray(int(b) for b in value)).decode('utf-8', 'replace')
+        return ','.join(str(v) for v in value)
+    return str(value)
+
+
+def _flatten(settings) -> dict:
+    """{setting: {clave: valor}} -> {'setting.clave': texto} (solo valores simples)."""
+    fields = {}
+    for setting, values in settings.items():
+        for key, value in values.items():
+            if isinstance(value, dbus.Dictionary):
+                continue
+            fields[f"{setting}.{key}"] = _text(str(setting), str(key), value)
+    return fields
+
+
+def _connection(path):
+    return dbus.Interface(_system_bus().get_object(NM_BUS_NAME, path), NM_CONNECTION_IFACE)
+
+
+def _read_connection(path, secrets: bool, timeout: float | None) -> dict | None:
+    """Campos de una conexión Wi‑Fi; None si la conexión no es Wi‑Fi."""
+    kwargs = {'timeout': timeout} if timeout else {}
+    conn = _connection(path)
+    settings = conn.GetSettings(**kwargs)
+    if str(settings.get('connection', {}).get('type', '')) != _WIFI_TYPE:
+        return None
+    fields = _flatten(settings)
+    if secrets and SECURITY_SETTING in settings:
+        try:
+            fields.update(_flatten(conn.GetSecrets(SECURITY_SETTING, **kwargs)))
+        except dbus.DBusException:
+            # Puede fallar sin agente de secretos o sin autorización de polkit
+            fields[SECRETS_UNAVAILABLE] = 'yes'
+    return fields
+
+
+def list_connection_paths(timeout: float | None = None) -> list:
+    """Rutas D-Bus de todas las conexiones guardadas."""
+    kwargs = {'timeout': timeout} if timeout else {}
+    settings = dbus.Interface(_system_bus().get_object(NM_BUS_NAME, NM_SETTINGS_PATH),
+                              NM_SETTINGS_IFACE)
+    return list(settings.ListConnections(**kwargs))
+
+
+def _set_paths(paths: dict) -> None:
+    global _paths_built
+    with _lock:
+        _paths.clear()
+        _paths.update(paths)
+        _paths_built = time.monotonic()
+
+
+def get_snapshot(secrets: bool = True, timeout: float | None = None) -> dict:
+    """Lee todas las conexiones Wi‑Fi por D-Bus, con o sin secretos.
+
+    Retorna:
+        {nombre_conexion: {campo_nmcli: valor}}.
+
+    Lanza `dbus.DBusException` si NetworkManager no responde; el llamador
+    decide si recurrir a `nmcli`.
+    """
+    snapshot = {}
+    paths = {}
+    for path in list_connection_paths(timeout=timeout):
+        fields = _read_connection(path, secrets=secrets, timeout=timeout)
+        if fields and fields.get('connection.id'):
+            snapshot[fields['connection.id']] = fields
+            paths[fields['connection.id']] = path
+    _set_paths(paths)
+    return snapshot
+
+
+def _connection_paths(timeout: float | None, refresh: bool = False) -> dict:
+    """Mapa nombre -> ruta de las conexiones Wi‑Fi (una pasada por `GetSettings`).
+
+    Con `refresh` el mapa solo se reconstruye si tiene más de
+    `REBUILD_INTERVAL` segundos: las hebras que esperaban el candado reciben
+    el mapa recién construido por la primera.
+    """
+    with _paths_lock:
+        with _lock:
+            if _paths_built is not None and (
+                    not refresh or time.monotonic() - _paths_built < REBUILD_INTERVAL):
+                return dict(_paths)
+        kwargs = {'timeout': timeout} if timeout else {}
+        paths = {}
+        for path in list_connection_paths(timeout=timeout):
+            connection = _connection(path).GetSettings(**kwargs).get('connection', {})
+            if str(connection.get('type', '')) == _WIFI_TYPE and connection.get('id'):
+                paths[str(connection['id'])] = path
+        _set_paths(paths)
+        return paths
+
+
+def get_filenames(timeout: float | None = None) -> dict:
+    """{nombre_conexion: ruta del keyfile} (propiedad `Filename`) de las conexiones Wi‑Fi.
+
+    Las conexiones sin archivo (en memoria) devuelven una ruta vacía.
+    """
+    kwargs = {'timeout': timeout} if timeout else {}
+    filenames = {}
+    for name, path in _connection_paths(timeout).items():
+        props = dbus.Interface(_system_bus().get_object(NM_BUS_NAME, path), DBUS_PROPERTIES_IFACE)
+        filenames[name] = str(props.Get(NM_CONNECTION_IFACE, 'Filename', **kwargs))
+    return filenames
+
+
+def get_connection(name: str, secrets: bool = True, timeout: float | None = None) -> dict | None:
+    """Campos de una sola conexión Wi‑Fi por nombre; None si no existe.
+
+    La ruta sale del mapa en memoria; si falta o quedó obsoleta (conexión
+    renombrada o eliminada) el mapa se reconstruye, como mucho una vez cada
+    `REBUILD_INTERVAL` segundos.
+    """
+    for refresh in (False, True):
+        path = _connection_paths(timeout, refresh=refresh).get(name)
+        if path is None:
+            continue
+        try:
+            fields = _read_connection(path, secrets=secrets, timeout=timeout)
+        except dbus.DBusException:
+            continue
+        if fields and fields.get('connection.id') == name:
+            return fields
+    return None
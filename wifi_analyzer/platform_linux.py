@@ -1,11 +1,80 @@
 """Utilidades específicas para Linux basadas en NetworkManager (nmcli).
 
 Este módulo proporciona funciones para listar perfiles Wi‑Fi y obtener
-sus contraseñas (PSK) almacenadas mediante `nmcli`.
+sus contraseñas (PSK) almacenadas mediante `nmcli`. Si `dbus-python` está
+disponible, las conexiones se consultan por D-Bus (`nm_dbus`) sin lanzar
+procesos y `nmcli` queda como respaldo.
 """
 
+import configparser
+import json
+import os
 import subprocess
-import shutil
+from datetime import datetime
+
+from wifi_analyzer import commands
+from wifi_analyzer import nm_dbus
+from wifi_analyzer.records import InterfaceRecord, ProfileRecord, format_interfaces
+
+# Directorio de keyfiles de NetworkManager (legible normalmente solo por root).
+NM_CONNECTIONS_DIR = '/etc/NetworkManager/system-connections'
+# Conexiones en memoria (no persistentes) de NetworkManager.
+NM_RUNTIME_CONNECTIONS_DIR = '/run/NetworkManager/system-connections'
+
+# Marcas de último uso por UUID (el keyfile no guarda `connection.timestamp`).
+NM_TIMESTAMPS_FILE = '/var/lib/NetworkManager/timestamps'
+
+# Campos pedidos a `nmcli` en modo solo metadatos (nunca incluyen secretos).
+_METADATA_FIELDS = ','.join((
+    'connection.id', 'connection.uuid', 'connection.autoconnect', 'connection.timestamp',
+    'connection.metered', '802-11-wireless.ssid', '802-11-wireless-security.key-mgmt',
+    '802-11-wireless-security.pairwise',
+))
+
+# Nombres de propiedad (tras el último '.') que contienen secretos en un keyfile.
+_SECRET_PROPERTIES = ('psk', 'wep-key0', 'wep-key1', 'wep-key2', 'wep-key3', 'leap-password',
+                      'password', 'private-key-password', 'phase2-private-key-password', 'pin')
+
+# Campos pedidos con `nmcli -s -g` al consultar un perfil individual; `-g`
+# imprime un valor por línea en este mismo orden.
+_RECORD_FIELDS = (
+    '802-11-wireless.ssid', '802-11-wireless-security.key-mgmt',
+    '802-11-wireless-security.pairwise', 'connection.autoconnect',
+    'connection.timestamp', 'connection.metered', '802-11-wireless-security.psk',
+)
+
+# Campos de `nmcli device show` pedidos en una sola llamada para todos los dispositivos.
+_DEVICE_FIELDS = 'GENERAL.DEVICE,GENERAL.TYPE,GENERAL.DRIVER,GENERAL.HWADDR'
+
+# Campos de `InterfaceRecord` mostrados en cada sección opcional.
+SECTION_FIELDS = {
+    'drivers': ('name', 'driver', 'mac'),
+    'ipconfig': ('name', 'kind', 'state', 'mac', 'mtu', 'addresses'),
+    'getmac': ('name', 'state', 'mac'),
+}
+
+# Alias de secciones keyfile -> nombre de setting usado por `nmcli`.
+_KEYFILE_SECTIONS = {
+    'wifi': '802-11-wireless',
+    'wifi-security': '802-11-wireless-security',
+    'ethernet': '802-3-ethernet',
+}
+
+_WIFI_TYPES = ('wifi', '802-11-wireless')
+
+# `connection.metered` según el origen: `nmcli` muestra texto, el keyfile y
+# D-Bus el valor numérico (y lo omiten si es el predeterminado, "unknown").
+_METERED_VALUES = {
+    'unknown': None, '0': None,
+    'yes': 'yes', '1': 'yes', '3': 'yes',
+    'no': 'no', '2': 'no', '4': 'no',
+}
+
+# Listado compartido por `get_profiles`, `get_snapshot` y las firmas de la
+# caché: mismo comando para que la capa de comandos pueda reutilizar el
+# resultado durante el análisis. `FILENAME` es la ruta del keyfile.
+_LIST_CONNECTIONS = ['nmcli', '-t', '-f', 'NAME,UUID,TYPE,FILENAME', 'connection', 'show']
+_LIST_REUSE_SECONDS = 5.0
 
 
 def get_profiles():
@@ -17,136 +86,561 @@ def get_profiles():
     Retorna:
         Lista de nombres de conexión (SSIDs guardados) gestionados por NM.
     """
-    if shutil.which('nmcli') is None:
+    snapshot = _dbus_snapshot(secrets=False)
+    if snapshot is not None:
+        return list(snapshot)
+    if commands.which('nmcli') is None:
         return []
+    return [name for name, _uuid, _filename in _list_wifi_connections()]
+
+
+def _list_wifi_connections(timeout: float | None = commands.DEFAULT_TIMEOUT) -> list[tuple[str, str, str]]:
+    """Lista (nombre, uuid, keyfile) de las conexiones Wi‑Fi."""
     # Se listan todas las conexiones y se filtran las de tipo Wi‑Fi.
-    result = subprocess.run(
-        ['nmcli', '-t', '-f', 'NAME,TYPE', 'connection', 'show'],
-        capture_output=True,
-        text=True
-    )
+    result = commands.run(_LIST_CONNECTIONS, timeout=timeout, reuse_for=_LIST_REUSE_SECONDS)
     if result.returncode != 0:
         return []
-    profiles = []
+    connections = []
     for line in result.stdout.splitlines():
-        if not line.strip():
+        parts = _split_terse(line)
+        if len(parts) != 4:
             continue
-        parts = line.split(':', 1)
+        name, uuid, ctype, filename = (p.strip() for p in parts)
+        # `TYPE` puede mostrarse como 'wifi' o '802-11-wireless' según versión.
+        if ctype in _WIFI_TYPES and name:
+            connections.append((name, uuid, filename))
+    return connections
+
+
+def _split_terse(line: str, maxsplit: int = -1) -> list[str]:
+    """Divide una línea de `nmcli -t` respetando los escapes `\\:` y `\\\\`."""
+    parts, buf, i = [], [], 0
+    while i < len(line):
+        ch = line[i]
+        if ch == '\\' and i + 1 < len(line):
+            buf.append(line[i + 1])
+            i += 2
+            continue
+        if ch == ':' and (maxsplit < 0 or len(parts) < maxsplit):
+            parts.append(''.join(buf))
+            buf = []
+        else:
+            buf.append(ch)
+        i += 1
+    parts.append(''.join(buf))
+    return parts
+
+
+def _read_keyfiles(directory: str | None = None) -> dict | None:
+    """Lee los keyfiles Wi‑Fi de NetworkManager sin lanzar procesos.
+
+    Retorna:
+        {nombre: {campo_nmcli: valor}} o None si el directorio o alguno de
+        sus archivos no es legible (se debe recurrir a `nmcli`).
+    """
+    directory = directory or NM_CONNECTIONS_DIR
+    try:
+        entries = sorted(os.listdir(directory))
+    except OSError:
+        return None
+    snapshot = {}
+    for entry in entries:
+        path = os.path.join(directory, entry)
+        if not os.path.isfile(path):
+            continue
+        parser = configparser.ConfigParser(interpolation=None, strict=False)
+        parser.optionxform = str
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                parser.read_file(f)
+        except (OSError, UnicodeDecodeError, configparser.Error):
+            return None
+        if parser.get('connection', 'type', fallback='') not in _WIFI_TYPES:
+            continue
+        fields = {}
+        for section in parser.sections():
+            setting = _KEYFILE_SECTIONS.get(section, section)
+            for key, value in parser.items(section):
+                fields[f"{setting}.{key}"] = value
+        name = fields.get('connection.id') or os.path.splitext(entry)[0]
+        snapshot[name] = fields
+    return snapshot
+
+
+def _nmcli_snapshot(timeout: float | None = None, secrets: bool = True,
+                    fields: str | None = None) -> dict:
+    """Obtiene los campos de todas las conexiones Wi‑Fi.
+
+    Usa una llamada para listar UUIDs y una única llamada
+    `nmcli [-s] -t [-f CAMPOS] connection show uuid A uuid B ...` para todas
+    las conexiones. Sin `secrets` nunca se consulta al agente de secretos.
+    """
+    args = []
+    for _name, uuid, _filename in _list_wifi_connections(timeout=timeout):
+        if uuid:
+            args += ['uuid', uuid]
+    if not args:
+        return {}
+    argv = ['nmcli'] + (['-s'] if secrets else []) + ['-t']
+    if fields:
+        argv += ['-f', fields]
+    detail = commands.run(argv + ['connection', 'show'] + args, timeout=timeout)
+    if detail.returncode != 0:
+        return {}
+    snapshot = {}
+    current = None
+    for line in detail.stdout.splitlines():
+        parts = _split_terse(line, maxsplit=1)
         if len(parts) != 2:
             continue
-        name, ctype = parts[0].strip(), parts[1].strip()
-        # `TYPE` puede mostrarse como 'wifi' o '802-11-wireless' según versión.
-        if ctype in ('wifi', '802-11-wireless') and name:
-            profiles.append(name)
-    return profiles
+        key, value = parts[0].strip(), parts[1].strip()
+        # Cada bloque de conexión comienza con `connection.id`.
+        if key == 'connection.id':
+            current = {}
+            snapshot[value] = current
+        if current is not None:
+            current[key] = value
+    return snapshot
+
+
+def _dbus_snapshot(secrets: bool, timeout: float | None = None) -> dict | None:
+    """Instantánea por D-Bus; None si el backend no está disponible o falla."""
+    if not nm_dbus.available():
+        return None
+    try:
+        return nm_dbus.get_snapshot(secrets=secrets, timeout=timeout)
+    except Exception:
+        return None
+
+
+def get_snapshot(timeout: float | None = None) -> dict:
+    """Devuelve todos los campos de todas las conexiones Wi‑Fi en una pasada.
+
+    Prioriza los keyfiles de NetworkManager (cero procesos); si no son
+    legibles usa D-Bus y, como último recurso, una consulta `nmcli`
+    multi-conexión.
+
+    Retorna:
+        {nombre_conexion: {campo_nmcli: valor}}; vacío si no hay datos.
+    """
+    snapshot = _read_keyfiles()
+    if snapshot is None:
+        snapshot = _dbus_snapshot(secrets=True, timeout=timeout)
+    if snapshot is not None:
+        return snapshot
+    if commands.which('nmcli') is None:
+        return {}
+    try:
+        return _nmcli_snapshot(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {}
+
+
+def _read_timestamps(path: str | None = None) -> dict:
+    """Lee {uuid: marca_de_tiempo} del archivo de timestamps de NetworkManager."""
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    parser.optionxform = str
+    try:
+        with open(path or NM_TIMESTAMPS_FILE, 'r', encoding='utf-8') as f:
+            parser.read_file(f)
+    except (OSError, UnicodeDecodeError, configparser.Error):
+        return {}
+    return dict(parser.items('timestamps')) if parser.has_section('timestamps') else {}
+
+
+def metadata_from_fields(fields: dict) -> dict:
+    """Normaliza los campos de una conexión a los metadatos del inventario."""
+    autoconnect = fields.get('connection.autoconnect', '').strip().lower()
+    metered = fields.get('connection.metered', '').strip().lower()
+    try:
+        stamp = int(fields.get('connection.timestamp') or 0)
+    except ValueError:
+        stamp = 0
+    return {
+        'ssid': fields.get('802-11-wireless.ssid') or None,
+        'auth': get_auth(fields),
+        'cipher': fields.get('802-11-wireless-security.pairwise') or None,
+        # NetworkManager activa la autoconexión por defecto si no se indica
+        'autoconnect': autoconnect not in ('no', 'false', '0'),
+        'cost': _METERED_VALUES.get(metered, metered) or None,
+        'last_used': datetime.fromtimestamp(stamp).isoformat(timespec='seconds') if stamp > 0 else None,
+    }
+
+
+def get_metadata_snapshot(timeout: float | None = None) -> dict:
+    """Campos de todas las conexiones Wi‑Fi sin ningún secreto.
+
+    Con keyfiles legibles o D-Bus no lanza procesos (de los keyfiles se
+    descartan las propiedades secretas); en caso contrario usa el listado y
+    una única consulta `nmcli -t -f ...` multi-conexión sin `-s`.
+
+    Retorna:
+        {nombre_conexion: {campo_nmcli: valor}}; vacío si no hay datos.
+    """
+    snapshot = _read_keyfiles()
+    if snapshot is not None:
+        stamps = _read_timestamps()
+        for name, fields in snapshot.items():
+            fields = {k: v for k, v in fields.items()
+                      if k.rsplit('.', 1)[-1] not in _SECRET_PROPERTIES}
+            uuid = fields.get('connection.uuid')
+            if uuid in stamps:
+                fields.setdefault('connection.timestamp', stamps[uuid])
+            snapshot[name] = fields
+        return snapshot
+    snapshot = _dbus_snapshot(secrets=False, timeout=timeout)
+    if snapshot is not None:
+        return snapshot
+    if commands.which('nmcli') is None:
+        return {}
+    try:
+        return _nmcli_snapshot(timeout=timeout, secrets=False, fields=_METADATA_FIELDS)
+    except subprocess.TimeoutExpired:
+        return {}
+
+
+def get_inventory(timeout: float | None = None) -> dict:
+    """Inventario de conexiones Wi‑Fi sin solicitar ningún secreto.
+
+    Retorna:
+        {nombre: {'ssid', 'auth', 'cipher', 'autoconnect', 'cost', 'last_used'}}.
+    """
+    snapshot = get_metadata_snapshot(timeout=timeout)
+    return {name: metadata_from_fields(fields) for name, fields in snapshot.items()}
+
+
+def _keyfile_id(path: str) -> str | None:
+    """`[connection] id` de un keyfile Wi‑Fi; OSError si no es legible."""
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    parser.optionxform = str
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            parser.read_file(f)
+        except (UnicodeDecodeError, configparser.Error):
+            return None
+    if parser.get('connection', 'type', fallback='') not in _WIFI_TYPES:
+        return None
+    return parser.get('connection', 'id', fallback=None) or None
+
+
+def _keyfile_paths(timeout: float | None = None) -> dict:
+    """{nombre_conexion: ruta de su keyfile}.
+
+    El nombre del archivo no sirve (conexiones renombradas, ids con '/',
+    duplicados `-<n>`): se usa el `id` del propio keyfile y, si no es
+    legible, la ruta que informa NetworkManager (`Filename` por D-Bus o la
+    columna `FILENAME` del listado de `nmcli`, reutilizado del análisis).
+    """
+    paths = {}
+    unreadable = False
+    for directory in (NM_CONNECTIONS_DIR, NM_RUNTIME_CONNECTIONS_DIR):
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                name = _keyfile_id(entry.path) if entry.is_file() else None
+            except OSError:
+                unreadable = True
+                continue
+            if name:
+                paths.setdefault(name, entry.path)
+    if not unreadable:
+        return paths
+    filenames = None
+    if nm_dbus.available():
+        try:
+            filenames = nm_dbus.get_filenames(timeout=timeout)
+        except Exception:
+            filenames = None
+    if filenames is None and commands.which('nmcli') is not None:
+        try:
+            filenames = {name: filename
+                         for name, _uuid, filename in _list_wifi_connections(timeout=timeout)}
+        except subprocess.TimeoutExpired:
+            filenames = None
+    for name, filename in (filenames or {}).items():
+        if filename:
+            paths.setdefault(name, filename)
+    return paths
+
+
+def get_profile_signatures(profiles, timeout: float | None = None) -> dict:
+    """Firma barata de cambio por perfil (mtime y tamaño de su keyfile).
+
+    La firma solo usa `stat`, que no requiere permisos de lectura sobre el
+    archivo. Los perfiles sin keyfile conocido quedan sin firma.
+    """
+    paths = _keyfile_paths(timeout=timeout)
+    signatures = {}
+    for name in profiles:
+        path = paths.get(name)
+        if not path:
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        signatures[name] = f"{st.st_mtime_ns}:{st.st_size}"
+    return signatures
 
 
-def get_password(profile_name: str) -> str:
+def _password_from_fields(fields: dict | None) -> str:
+    if fields is None or fields.get(nm_dbus.SECRETS_UNAVAILABLE):
+        return "No disponible"
+    password = (fields.get('802-11-wireless-security.psk') or '').strip()
+    if password and password != '--':
+        return password
+    return "Sin contrasena o WPS"
+
+
+def get_auth(fields: dict | None) -> str | None:
+    """Tipo de autenticación (key-mgmt) de una conexión de la instantánea."""
+    if fields is None:
+        return None
+    return fields.get('802-11-wireless-security.key-mgmt') or 'open'
+
+
+def record_from_fields(name: str, fields: dict | None) -> ProfileRecord:
+    """Registro de una conexión a partir de sus campos (keyfile, `-t` o `-g`)."""
+    if fields is None:
+        return ProfileRecord(name, "No disponible")
+    return ProfileRecord(name, _password_from_fields(fields), **metadata_from_fields(fields))
+
+
+def get_records(profiles, snapshot: dict | None = None,
+                timeout: float | None = None) -> dict:
+    """Registros de varios perfiles a partir de una única instantánea.
+
+    Retorna:
+        {perfil: ProfileRecord} solo para los perfiles presentes en la instantánea.
+    """
+    if snapshot is None:
+        snapshot = get_snapshot(timeout=timeout)
+    return {p: record_from_fields(p, snapshot[p]) for p in profiles if p in snapshot}
+
+
+def get_passwords(profiles, snapshot: dict | None = None,
+                  timeout: float | None = None) -> dict:
+    """Obtiene las claves de varios perfiles a partir de una única instantánea.
+
+    Retorna:
+        {perfil: clave} solo para los perfiles presentes en la instantánea.
+    """
+    return {p: r.key for p, r in get_records(profiles, snapshot, timeout).items()}
+
+
+def get_record(profile_name: str, timeout: float | None = None,
+               snapshot: dict | None = None) -> ProfileRecord:
+    """Consulta una conexión con `nmcli -s -g <campos>` y devuelve su registro.
+
+    Parámetros:
+        profile_name: Nombre de la conexión tal como aparece en `nmcli`.
+        timeout: Tiempo máximo en segundos para la consulta (None = sin límite).
+        snapshot: Instantánea de `get_snapshot()`; si se indica no se lanza
+                  ningún proceso.
+
+    Retorna:
+        `ProfileRecord`; si la consulta falla, su clave es un mensaje estándar.
+    """
+    if snapshot is not None:
+        return record_from_fields(profile_name, snapshot.get(profile_name))
+    if nm_dbus.available():
+        try:
+            return record_from_fields(profile_name,
+                                      nm_dbus.get_connection(profile_name, timeout=timeout))
+        except Exception:
+            pass
+    if commands.which('nmcli') is None:
+        return ProfileRecord(profile_name, "No disponible (nmcli no encontrado)")
+    # Puede bloquearse esperando al agente de secretos/polkit: de ahí el timeout.
+    try:
+        result = commands.run(
+            ['nmcli', '-s', '-g', ','.join(_RECORD_FIELDS), 'connection', 'show', profile_name],
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return ProfileRecord(profile_name, "No disponible (tiempo agotado)")
+    if result.returncode != 0:
+        return ProfileRecord(profile_name, "No disponible")
+    values = result.stdout.splitlines()
+    if len(values) != len(_RECORD_FIELDS):
+        return ProfileRecord(profile_name, "Error al obtener")
+    # `-g` escapa ':' y '\' igual que el modo terso
+    fields = {f: _split_terse(v, maxsplit=0)[0].strip() for f, v in zip(_RECORD_FIELDS, values)}
+    return record_from_fields(profile_name, fields)
+
+
+def get_password(profile_name: str, timeout: float | None = None,
+                 snapshot: dict | None = None) -> str:
     """Obtiene la clave PSK de una conexión gestionada por NM.
 
     Parámetros:
         profile_name: Nombre de la conexión tal como aparece en `nmcli`.
+        timeout: Tiempo máximo en segundos para la consulta (None = sin límite).
+        snapshot: Instantánea de `get_snapshot()`; si se indica no se lanza
+                  ningún proceso.
 
     Retorna:
         La contraseña si está disponible; un mensaje estándar en caso contrario.
     """
-    if shutil.which('nmcli') is None:
-        return "No disponible (nmcli no encontrado)"
-    # Se consulta el campo '802-11-wireless-security.psk' de la conexión.
-    result = subprocess.run(
-        ['nmcli', '-s', '-g', '802-11-wireless-security.psk', 'connection', 'show', profile_name],
-        capture_output=True,
-        text=True
-    )
-    if result.returncode != 0:
-        return "No disponible"
-    password = result.stdout.strip()
-    if password:
-        return password
-    return "Sin contrasena o WPS"
+    return get_record(profile_name, timeout=timeout, snapshot=snapshot).key
 
 
 def get_interfaces() -> str:
     """Devuelve el estado de dispositivos gestionados por NetworkManager."""
-    if shutil.which('nmcli') is None:
+    if commands.which('nmcli') is None:
         return ''
-    r = subprocess.run(['nmcli', 'device', 'status'], capture_output=True, text=True)
+    r = commands.run(['nmcli', 'device', 'status'])
     return r.stdout if r.returncode == 0 else ''
 
 
+def _ip_json(timeout: float | None = commands.DEFAULT_TIMEOUT) -> list | None:
+    """Salida de `ip -j address` ya decodificada; None si `ip` no soporta JSON.
+
+    La consultan varias secciones (direcciones, MAC): el mismo comando se
+    une o reutiliza en la capa de comandos y se lanza una sola vez.
+    """
+    r = commands.run(['ip', '-j', 'address'], timeout=timeout, reuse_for=_LIST_REUSE_SECONDS)
+    if r.returncode != 0:
+        return None
+    try:
+        data = json.loads(r.stdout or '[]')
+    except ValueError:
+        return None
+    return data if isinstance(data, list) else None
+
+
+def get_ip_interfaces(timeout: float | None = commands.DEFAULT_TIMEOUT) -> list[InterfaceRecord] | None:
+    """Interfaces de `ip -j address` como registros; None si no hay salida JSON."""
+    data = _ip_json(timeout=timeout)
+    if data is None:
+        return None
+    interfaces = []
+    for link in data:
+        if not isinstance(link, dict) or not link.get('ifname'):
+            continue
+        addresses = tuple(f"{a.get('local')}/{a.get('prefixlen')}"
+                          for a in link.get('addr_info', ()) if a.get('local'))
+        interfaces.append(InterfaceRecord(
+            link['ifname'],
+            kind=link.get('link_type'),
+            state=link.get('operstate'),
+            mac=link.get('address'),
+            mtu=link.get('mtu'),
+            addresses=addresses,
+        ))
+    return interfaces
+
+
+def get_nm_devices(timeout: float | None = commands.DEFAULT_TIMEOUT) -> list[InterfaceRecord]:
+    """Dispositivos de NetworkManager con driver y MAC en una sola llamada `nmcli`."""
+    r = commands.run(['nmcli', '-t', '-f', _DEVICE_FIELDS, 'device', 'show'], timeout=timeout)
+    if r.returncode != 0:
+        return []
+    devices = []
+    current = None
+    for line in r.stdout.splitlines():
+        parts = _split_terse(line, maxsplit=1)
+        if len(parts) != 2:
+            continue
+        key, value = parts[0].strip(), parts[1].strip()
+        # Cada bloque de dispositivo comienza con `GENERAL.DEVICE`.
+        if key == 'GENERAL.DEVICE':
+            current = InterfaceRecord(value)
+            devices.append(current)
+        elif current is None:
+            continue
+        elif key == 'GENERAL.TYPE':
+            current.kind = value or None
+        elif key == 'GENERAL.DRIVER':
+            current.driver = value or None
+        elif key == 'GENERAL.HWADDR':
+            current.mac = value or None
+    return devices
+
+
 def get_drivers() -> str:
-    """Devuelve información relevante de dispositivos Wi‑Fi (driver/HWADDR).
+    """Devuelve driver y HWADDR de los dispositivos Wi‑Fi.
 
-    Estrategia: listar dispositivos y para cada interfaz Wi‑Fi consultar
-    campos específicos, ya que algunas versiones no muestran GENERAL.DRIVER
-    al pedir múltiples dispositivos en bloque.
+    Una única llamada `nmcli -t -f GENERAL.DEVICE,...,GENERAL.HWADDR device
+    show` devuelve todos los dispositivos; se muestran solo los Wi‑Fi.
     """
-    if shutil.which('nmcli') is None:
+    if commands.which('nmcli') is None:
         return ''
-    # 1) Listar dispositivos y tipos
-    devs = subprocess.run(['nmcli', '-t', '-f', 'DEVICE,TYPE', 'device', 'status'],
-                          capture_output=True, text=True)
-    if devs.returncode != 0:
+    try:
+        devices = get_nm_devices()
+    except subprocess.TimeoutExpired:
         return ''
-    lines = []
-    for line in devs.stdout.splitlines():
-        if not line.strip() or ':' not in line:
-            continue
-        dev, dtype = line.split(':', 1)
-        dev, dtype = dev.strip(), dtype.strip()
-        if dtype not in ('wifi', '802-11-wireless') or not dev:
-            continue
-        # 2) Consultar driver y MAC por interfaz
-        drv = subprocess.run(['nmcli', '-g', 'GENERAL.DRIVER', 'device', 'show', dev],
-                             capture_output=True, text=True)
-        mac = subprocess.run(['nmcli', '-g', 'GENERAL.HWADDR', 'device', 'show', dev],
-                             capture_output=True, text=True)
-        drv_val = drv.stdout.strip() if drv.returncode == 0 else ''
-        mac_val = mac.stdout.strip() if mac.returncode == 0 else ''
-        lines.append(f"DEVICE={dev}\tDRIVER={drv_val or 'N/A'}\tHWADDR={mac_val or 'N/A'}")
-    return "\n".join(lines)
+    wifi = [d for d in devices if d.kind in ('wifi', '802-11-wireless')]
+    if not wifi:
+        return ''
+    return format_interfaces(wifi, SECTION_FIELDS['drivers'])
 
 
-def get_ipconfig_all() -> str:
-    """Equivalente aproximado de ipconfig /all en Linux (salida de `ip address`)."""
-    if shutil.which('ip') is None:
+def get_interface_records(timeout: float | None = commands.DEFAULT_TIMEOUT) -> list[InterfaceRecord]:
+    """Interfaces de `ip -j address` con el driver de `nmcli device show`.
+
+    Sin `ip` con JSON se devuelven solo los dispositivos de NetworkManager.
+    """
+    devices = []
+    if commands.which('nmcli') is not None:
+        try:
+            devices = get_nm_devices(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            devices = []
+    interfaces = None
+    if commands.which('ip') is not None:
+        try:
+            interfaces = get_ip_interfaces(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            interfaces = None
+    if interfaces is None:
+        return devices
+    drivers = {d.name: d.driver for d in devices}
+    for iface in interfaces:
+        iface.driver = drivers.get(iface.name)
+    return interfaces
+
+
+def _ip_section(section: str, fallback_args: list[str]) -> str:
+    """Sección basada en `ip -j address`; con `ip` sin JSON se usa la salida de texto."""
+    if commands.which('ip') is None:
+        return ''
+    try:
+        interfaces = get_ip_interfaces()
+        if interfaces is not None:
+            return format_interfaces(interfaces, SECTION_FIELDS[section])
+        r = commands.run(['ip'] + fallback_args)
+    except subprocess.TimeoutExpired:
         return ''
-    r = subprocess.run(['ip', 'address'], capture_output=True, text=True)
     return r.stdout if r.returncode == 0 else ''
 
 
+def get_ipconfig_all() -> str:
+    """Equivalente aproximado de ipconfig /all en Linux (interfaces y direcciones)."""
+    return _ip_section('ipconfig', ['address'])
+
+
 def get_mac_addresses() -> str:
-    """Listado abreviado de interfaces y MAC usando `ip -br link`."""
-    if shutil.which('ip') is None:
-        return ''
-    r = subprocess.run(['ip', '-br', 'link'], capture_output=True, text=True)
-    return r.stdout if r.returncode == 0 else ''
+    """Listado abreviado de interfaces, estado y MAC."""
+    return _ip_section('getmac', ['-br', 'link'])
 
 
-def export_profiles() -> str:
+def export_profiles(snapshot: dict | None = None, secrets: bool = True) -> str:
     """Exporta la definición de conexiones conocidas (sin escribir archivos).
 
-    No existe un comando de exportación directo como en Windows. Se obtiene
-    la configuración detallada de cada conexión mediante `nmcli connection show`.
+    No existe un comando de exportación directo como en Windows. La
+    configuración de cada conexión se toma de la instantánea de
+    `get_snapshot()` (keyfiles o una única llamada `nmcli`); sin `secrets`
+    se usa `get_metadata_snapshot()` y nunca se consulta ningún secreto.
     """
-    if shutil.which('nmcli') is None:
-        return ''
-    # Listar nombres de conexiones wifi y concatenar su detalle.
-    names_proc = subprocess.run(['nmcli', '-t', '-f', 'NAME,TYPE', 'connection', 'show'],
-                                capture_output=True, text=True)
-    if names_proc.returncode != 0:
-        return ''
+    if snapshot is None:
+        snapshot = get_snapshot() if secrets else get_metadata_snapshot()
     out = []
-    for line in names_proc.stdout.splitlines():
-        if not line.strip():
-            continue
-        parts = line.split(':', 1)
-        if len(parts) != 2:
-            continue
-        name, ctype = parts[0].strip(), parts[1].strip()
-        if ctype in ('wifi', '802-11-wireless'):
-            det = subprocess.run(['nmcli', '-s', 'connection', 'show', name], capture_output=True, text=True)
-            if det.returncode == 0:
-                out.append(f"[nmcli connection show {name}]\n{det.stdout.strip()}\n")
+    for name, fields in snapshot.items():
+        # Formato alineado similar al de `nmcli connection show <NAME>`.
+        body = "\n".join(f"{key + ':':<40}{value}" for key, value in fields.items())
+        out.append(f"[nmcli connection show {name}]\n{body}\n")
     return "\n".join(out)
-
@@ -5,8 +5,22 @@ contraseñas y consultar información adicional de red usando comandos
 del sistema disponibles en Windows.
 """
 
+import os
 import subprocess
 import re
+import tempfile
+import xml.etree.ElementTree as ET
+
+from wifi_analyzer import commands
+from wifi_analyzer.records import InterfaceRecord, ProfileRecord
+
+# Almacén de perfiles WLAN del sistema (archivos XML nombrados por GUID).
+WLAN_PROFILE_STORE = os.path.join(os.environ.get('ProgramData', r'C:\ProgramData'),
+                                  'Microsoft', 'Wlansvc', 'Profiles', 'Interfaces')
+
+# Campos de interés del XML de perfil WLAN (nombre de etiqueta sin namespace).
+_XML_FIELDS = ('connectionMode', 'authentication', 'encryption',
+               'keyType', 'protected', 'keyMaterial')
 
 
 def get_profiles():
@@ -16,10 +30,8 @@ def get_profiles():
         Lista de nombres de perfil (SSID guardados) extraídos de `netsh`.
     """
     try:
-        result = subprocess.run(
+        result = commands.run(
             ['netsh', 'wlan', 'show', 'profiles'],
-            capture_output=True,
-            text=True,
             encoding='cp1252'
         )
         if result.returncode != 0:
@@ -37,43 +49,273 @@ def get_profiles():
         return []
 
 
-def get_password(profile_name: str) -> str:
-    """Obtiene la contraseña de un perfil Wi‑Fi específico.
+# Etiquetas de `netsh wlan show profile` por campo e idioma (español, inglés).
+# Los caracteres acentuados varían con la página de códigos de la consola,
+# por eso se aceptan uno o dos caracteres cualesquiera en su lugar.
+_SHOW_PROFILE_LABELS = {
+    'ssid': (r"Nombre de SSID", r"SSID name"),
+    'mode': (r"Modo de conexi\S{1,2}n", r"Connection mode"),
+    'auth': (r"Autenticaci\S{1,2}n", r"Authentication"),
+    'cipher': (r"Cifrado", r"Cipher"),
+    'key': (r"Contenido de la clave", r"Key Content"),
+    'cost': (r"Costo", r"Cost"),
+}
+
+# Una sola expresión con un grupo por campo: la salida se recorre una vez.
+_SHOW_PROFILE_RE = re.compile(
+    r"^[ \t]*(?:" + "|".join(
+        f"(?P<{field}>{'|'.join(labels)})" for field, labels in _SHOW_PROFILE_LABELS.items()
+    ) + r")[ \t]*:[ \t]*(?P<value>.*?)[ \t]*$",
+    re.MULTILINE,
+)
+
+# Valores de "Modo de conexión" que indican conexión automática.
+_AUTO_MODE_PREFIXES = ("conectar autom", "connect automatically")
+
+# Textos localizados de `netsh` -> valores del XML de perfil, para que el
+# registro sea el mismo por ambas rutas (exportación o consulta individual).
+_SHOW_AUTH_VALUES = {
+    'abierta': 'open', 'open': 'open',
+    'compartida': 'shared', 'shared': 'shared',
+    'wpa-personal': 'WPAPSK', 'wpa2-personal': 'WPA2PSK', 'wpa3-personal': 'WPA3SAE',
+    'wpa-enterprise': 'WPA', 'wpa2-enterprise': 'WPA2', 'wpa3-enterprise': 'WPA3ENT',
+    'owe': 'OWE',
+}
+_SHOW_CIPHER_VALUES = {
+    'ninguno': 'none', 'none': 'none',
+    'ccmp': 'AES', 'tkip': 'TKIP', 'wep': 'WEP', 'gcmp': 'GCMP', 'gcmp-256': 'GCMP256',
+}
+
+
+def parse_show_profile(name: str, text_out: str) -> ProfileRecord:
+    """Convierte la salida de `netsh wlan show profile <nombre> key=clear` en un registro.
+
+    Solo se conserva la primera aparición de cada campo (los perfiles con
+    varios pares autenticación/cifrado listan primero el preferido).
+    """
+    fields = {}
+    for m in _SHOW_PROFILE_RE.finditer(text_out):
+        field = next(f for f in _SHOW_PROFILE_LABELS if m.group(f) is not None)
+        fields.setdefault(field, m.group('value'))
+    mode = fields.get('mode', '').lower()
+    return ProfileRecord(
+        name,
+        fields.get('key') or "Sin contrasena o WPS",
+        ssid=fields.get('ssid', '').strip('"') or None,
+        auth=_SHOW_AUTH_VALUES.get(fields.get('auth', '').lower(), fields.get('auth')) or None,
+        cipher=_SHOW_CIPHER_VALUES.get(fields.get('cipher', '').lower(), fields.get('cipher')) or None,
+        autoconnect=mode.startswith(_AUTO_MODE_PREFIXES) if mode else None,
+        cost=fields.get('cost') or None,
+    )
+
+
+def get_record(profile_name: str, timeout: float | None = None) -> ProfileRecord:
+    """Consulta un perfil con `netsh ... key=clear` y devuelve su registro completo.
 
     Parámetros:
         profile_name: Nombre del perfil tal como lo reporta `netsh`.
+        timeout: Tiempo máximo en segundos para la consulta (None = sin límite).
 
     Retorna:
-        La contraseña (Key Content) si está disponible o un mensaje estándar.
+        `ProfileRecord`; si la consulta falla, su clave es un mensaje estándar.
     """
     try:
-        result = subprocess.run(
+        result = commands.run(
             ['netsh', 'wlan', 'show', 'profile', profile_name, 'key=clear'],
-            capture_output=True,
-            text=True,
-            encoding='cp1252'
+            encoding='cp1252',
+            timeout=timeout
         )
         if result.returncode != 0:
-            return "No disponible"
+            return ProfileRecord(profile_name, "No disponible")
+        return parse_show_profile(profile_name, result.stdout)
+    except subprocess.TimeoutExpired:
+        return ProfileRecord(profile_name, "No disponible (tiempo agotado)")
+    except Exception:
+        return ProfileRecord(profile_name, "Error al obtener")
 
-        text_out = result.stdout
-        # Compatibilidad bilingüe para la línea con el contenido de la clave.
-        pattern_es = r"Contenido de la clave\s*:\s*(.+)"
-        pattern_en = r"Key Content\s*:\s*(.+)"
-        m = re.search(pattern_es, text_out)
-        if not m:
-            m = re.search(pattern_en, text_out)
-        if m:
-            return m.group(1).strip()
-        return "Sin contrasena o WPS"
+
+def get_password(profile_name: str, timeout: float | None = None) -> str:
+    """Obtiene la contraseña de un perfil Wi‑Fi específico.
+
+    Parámetros:
+        profile_name: Nombre del perfil tal como lo reporta `netsh`.
+        timeout: Tiempo máximo en segundos para la consulta (None = sin límite).
+
+    Retorna:
+        La contraseña (Key Content) si está disponible o un mensaje estándar.
+    """
+    return get_record(profile_name, timeout=timeout).key
+
+
+def parse_profile_xml(source) -> dict:
+    """Extrae los campos relevantes de un XML de perfil exportado por `netsh`.
+
+    Se recorre el documento en streaming (`iterparse`) liberando cada
+    elemento procesado, sin depender del idioma del sistema.
+
+    Parámetros:
+        source: Ruta o archivo binario con el XML `WLANProfile`.
+
+    Retorna:
+        Dict con 'name', 'ssid' y los campos de `_XML_FIELDS` encontrados.
+    """
+    fields = {}
+    path = []
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        tag = elem.tag.rsplit('}', 1)[-1]
+        if event == 'start':
+            path.append(tag)
+            continue
+        text = (elem.text or '').strip()
+        if tag == 'name' and path[-2:-1] == ['WLANProfile']:
+            fields['name'] = text
+        elif tag == 'name' and path[-2:-1] == ['SSID']:
+            fields.setdefault('ssid', text)
+        elif tag in _XML_FIELDS:
+            fields.setdefault(tag, text)
+        path.pop()
+        elem.clear()
+    return fields
+
+
+def read_exported_profiles(directory: str) -> dict:
+    """Lee todos los XML exportados en `directory`.
+
+    Retorna:
+        {nombre_perfil: campos} según `parse_profile_xml`.
+    """
+    snapshot = {}
+    for entry in sorted(os.listdir(directory)):
+        if not entry.lower().endswith('.xml'):
+            continue
+        try:
+            fields = parse_profile_xml(os.path.join(directory, entry))
+        except (OSError, ET.ParseError):
+            continue
+        if fields.get('name'):
+            snapshot[fields['name']] = fields
+    return snapshot
+
+
+def _export_snapshot(key_clear: bool, timeout: float | None) -> dict:
+    """Exporta todos los perfiles con una sola llamada a `netsh` y los analiza."""
+    argv = ['netsh', 'wlan', 'export', 'profile']
+    if key_clear:
+        argv.append('key=clear')
+    try:
+        with tempfile.TemporaryDirectory(prefix='wifi_export_') as tmp:
+            r = commands.run(argv + [f'folder={tmp}'], encoding='cp1252', timeout=timeout)
+            if r.returncode != 0:
+                return {}
+            return read_exported_profiles(tmp)
     except Exception:
-        return "Error al obtener"
+        return {}
+
+
+def get_snapshot(timeout: float | None = None) -> dict:
+    """Exporta todos los perfiles con una sola llamada a `netsh` y los analiza.
+
+    Los XML se escriben en un directorio temporal que se elimina al terminar.
+
+    Retorna:
+        {nombre_perfil: campos}; vacío si la exportación falla.
+    """
+    return _export_snapshot(key_clear=True, timeout=timeout)
+
+
+def get_profile_signatures(profiles) -> dict:
+    """Firma barata de cambio del almacén de perfiles WLAN.
+
+    Los archivos del almacén se nombran por GUID y no por perfil, por lo que
+    se calcula una firma global (número de archivos, mtime máximo y tamaño
+    total) compartida por todos los perfiles: cualquier cambio invalida todos.
+    """
+    count, latest, total = 0, 0, 0
+    try:
+        for dirpath, _dirs, files in os.walk(WLAN_PROFILE_STORE):
+            for name in files:
+                st = os.stat(os.path.join(dirpath, name))
+                count += 1
+                latest = max(latest, st.st_mtime_ns)
+                total += st.st_size
+    except OSError:
+        return {}
+    if not count:
+        return {}
+    signature = f"{count}:{latest}:{total}"
+    return {p: signature for p in profiles}
+
+
+def metadata_from_fields(fields: dict) -> dict:
+    """Normaliza los campos de un XML de perfil a los metadatos del inventario."""
+    mode = fields.get('connectionMode')
+    return {
+        'ssid': fields.get('ssid') or None,
+        'auth': fields.get('authentication') or None,
+        'cipher': fields.get('encryption') or None,
+        'autoconnect': (mode == 'auto') if mode else None,
+        # El costo solo lo muestra `netsh wlan show profile`, no el XML
+        'cost': None,
+        # Windows no expone la fecha de última conexión en el perfil
+        'last_used': None,
+    }
+
+
+def get_inventory(timeout: float | None = None) -> dict:
+    """Inventario de perfiles sin `key=clear`: una única llamada a `netsh`.
+
+    Retorna:
+        {nombre: {'ssid', 'auth', 'cipher', 'autoconnect', 'cost', 'last_used'}}.
+    """
+    snapshot = _export_snapshot(key_clear=False, timeout=timeout)
+    return {name: metadata_from_fields(fields) for name, fields in snapshot.items()}
+
+
+def _password_from_fields(fields: dict | None) -> str:
+    if fields is None:
+        return "No disponible"
+    key = fields.get('keyMaterial', '')
+    # Sin privilegios de administrador la clave se exporta cifrada (protected=true).
+    if fields.get('protected', '').lower() == 'true':
+        return "No disponible"
+    if key:
+        return key
+    return "Sin contrasena o WPS"
+
+
+def record_from_fields(name: str, fields: dict) -> ProfileRecord:
+    """Registro de un perfil a partir de los campos de su XML exportado."""
+    meta = metadata_from_fields(fields)
+    meta.pop('last_used')
+    return ProfileRecord(name, _password_from_fields(fields), **meta)
+
+
+def get_records(profiles, snapshot: dict | None = None,
+                timeout: float | None = None) -> dict:
+    """Registros de varios perfiles a partir de una única exportación.
+
+    Retorna:
+        {perfil: ProfileRecord} solo para los perfiles presentes en la exportación.
+    """
+    if snapshot is None:
+        snapshot = get_snapshot(timeout=timeout)
+    return {p: record_from_fields(p, snapshot[p]) for p in profiles if p in snapshot}
+
+
+def get_passwords(profiles, snapshot: dict | None = None,
+                  timeout: float | None = None) -> dict:
+    """Obtiene las claves de varios perfiles a partir de una única exportación.
+
+    Retorna:
+        {perfil: clave} solo para los perfiles presentes en la exportación.
+    """
+    return {p: r.key for p, r in get_records(profiles, snapshot, timeout).items()}
 
 
 def get_interfaces() -> str:
     """Devuelve información de interfaces Wi‑Fi reportadas por `netsh`."""
     try:
-        r = subprocess.run(['netsh', 'wlan', 'show', 'interfaces'], capture_output=True, text=True, encoding='cp1252')
+        r = commands.run(['netsh', 'wlan', 'show', 'interfaces'], encoding='cp1252')
         return r.stdout if r.returncode == 0 else ''
     except Exception:
         return ''
@@ -82,7 +324,7 @@ def get_interfaces() -> str:
 def get_drivers() -> str:
     """Devuelve información de drivers Wi‑Fi instalados (via `netsh`)."""
     try:
-        r = subprocess.run(['netsh', 'wlan', 'show', 'drivers'], capture_output=True, text=True, encoding='cp1252')
+        r = commands.run(['netsh', 'wlan', 'show', 'drivers'], encoding='cp1252')
         return r.stdout if r.returncode == 0 else ''
     except Exception:
         return ''
@@ -91,7 +333,7 @@ def get_drivers() -> str:
 def get_ipconfig_all() -> str:
     """Devuelve la salida de `ipconfig /all` completa."""
     try:
-        r = subprocess.run(['ipconfig', '/all'], capture_output=True, text=True, encoding='cp1252')
+        r = commands.run(['ipconfig', '/all'], encoding='cp1252')
         return r.stdout if r.returncode == 0 else ''
     except Exception:
         return ''
@@ -100,17 +342,51 @@ def get_ipconfig_all() -> str:
 def get_mac_addresses() -> str:
     """Devuelve las direcciones MAC mediante el comando `getmac`."""
     try:
-        r = subprocess.run(['getmac'], capture_output=True, text=True, encoding='cp1252')
+        r = commands.run(['getmac'], encoding='cp1252')
         return r.stdout if r.returncode == 0 else ''
     except Exception:
         return ''
 
 
-def export_profiles(output_dir: str) -> str:
-    """Exporta perfiles Wi‑Fi a XML con claves en claro al directorio indicado."""
+def get_interface_records(timeout: float | None = commands.DEFAULT_TIMEOUT) -> list[InterfaceRecord]:
+    """Adaptadores de `getmac /v /fo csv /nh` como registros.
+
+    Columnas: nombre de conexión, adaptador, dirección física y transporte;
+    el transporte es `\\Device\\Tcpip_{...}` solo si el adaptador está conectado.
+    """
+    import csv
+
+    try:
+        r = commands.run(['getmac', '/v', '/fo', 'csv', '/nh'], encoding='cp1252', timeout=timeout)
+    except Exception:
+        return []
+    if r.returncode != 0:
+        return []
+    interfaces = []
+    for row in csv.reader(r.stdout.splitlines()):
+        if len(row) < 4 or not row[0].strip():
+            continue
+        name, adapter, mac, transport = (c.strip() for c in row[:4])
+        interfaces.append(InterfaceRecord(
+            name,
+            state='up' if transport.startswith('\\Device') else 'down',
+            mac=mac.replace('-', ':').lower() if '-' in mac else None,
+            driver=adapter or None,
+        ))
+    return interfaces
+
+
+def export_profiles(output_dir: str, key_clear: bool = True) -> str:
+    """Exporta perfiles Wi‑Fi a XML en el directorio indicado.
+
+    Con `key_clear` las claves se exportan en claro; sin él `netsh` las deja
+    cifradas (`protected=true`) y no se solicita ningún secreto.
+    """
+    argv = ['netsh', 'wlan', 'export', 'profile']
+    if key_clear:
+        argv.append('key=clear')
     try:
-        r = subprocess.run(['netsh', 'wlan', 'export', 'profile', 'key=clear', f'folder={output_dir}'], capture_output=True, text=True, encoding='cp1252')
+        r = commands.run(argv + [f'folder={output_dir}'], encoding='cp1252')
         return r.stdout if r.returncode == 0 else ''
     except Exception:
         return ''
-
@@ -0,0 +1,104 @@
+"""Registros compactos por perfil Wi‑Fi y por interfaz de red.
+
+Cada consulta al sistema (`netsh wlan show profile ... key=clear`,
+`nmcli -s -g ...`, exportación XML o keyfile) produce un `ProfileRecord`
+con la clave y los atributos de seguridad obtenidos en la misma pasada,
+de modo que los reportes posteriores no necesitan volver a consultarlos.
+
+Las secciones de interfaces en Linux (`ip -j address`, `nmcli device show`)
+se analizan a `InterfaceRecord` y se muestran solo con los campos pedidos.
+"""
+
+from wifi_analyzer.formatters import table_cell
+
+
+class ProfileRecord:
+    """Perfil analizado: clave y atributos, sin `__dict__` por instancia.
+
+    `str(registro)` devuelve la clave (o el mensaje estándar cuando no está
+    disponible), por compatibilidad con el código que trataba
+    `profiles_data` como {perfil: clave}.
+    """
+
+    __slots__ = ('name', 'key', 'ssid', 'auth', 'cipher', 'autoconnect', 'cost', 'last_used')
+
+    def __init__(self, name: str, key: str, ssid: str | None = None, auth: str | None = None,
+                 cipher: str | None = None, autoconnect: bool | None = None,
+                 cost: str | None = None, last_used: str | None = None):
+        self.name = name
+        self.key = key
+        self.ssid = ssid
+        self.auth = auth
+        self.cipher = cipher
+        self.autoconnect = autoconnect
+        self.cost = cost
+        self.last_used = last_used
+
+    def __str__(self) -> str:
+        return str(self.key)
+
+    def __repr__(self) -> str:
+        return f"ProfileRecord(name={self.name!r}, ssid={self.ssid!r}, auth={self.auth!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ProfileRecord):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    __hash__ = None
+
+    def as_dict(self) -> dict:
+        """Atributos del registro (sin la clave)."""
+        return {f: getattr(self, f) for f in self.__slots__ if f != 'key'}
+
+
+def coerce(name: str, value) -> ProfileRecord:
+    """Devuelve `value` como registro (envuelve claves sueltas, p. ej. de la caché)."""
+    if isinstance(value, ProfileRecord):
+        return value
+    return ProfileRecord(name, str(value))
+
+
+class InterfaceRecord:
+    """Interfaz de red con los campos de `ip -j address` y `nmcli device show`."""
+
+    __slots__ = ('name', 'kind', 'state', 'mac', 'mtu', 'driver', 'addresses')
+
+    def __init__(self, name: str, kind: str | None = None, state: str | None = None,
+                 mac: str | None = None, mtu: int | None = None, driver: str | None = None,
+                 addresses: tuple = ()):
+        self.name = name
+        self.kind = kind
+        self.state = state
+        self.mac = mac
+        self.mtu = mtu
+        self.driver = driver
+        self.addresses = tuple(addresses)
+
+    def __repr__(self) -> str:
+        return f"InterfaceRecord(name={self.name!r}, kind={self.kind!r}, mac={self.mac!r})"
+
+    def as_dict(self) -> dict:
+        return {f: getattr(self, f) for f in self.__slots__}
+
+
+# Encabezado de cada campo de `InterfaceRecord` en las tablas de texto.
+INTERFACE_HEADERS = {
+    'name': "Interfaz",
+    'kind': "Tipo",
+    'state': "Estado",
+    'mac': "MAC",
+    'mtu': "MTU",
+    'driver': "Driver",
+    'addresses': "Direcciones",
+}
+
+
+def format_interfaces(interfaces, fields) -> str:
+    """Tabla de texto alineada con solo los `fields` indicados de cada interfaz."""
+    rows = [[table_cell(getattr(i, f)) for f in fields] for i in interfaces]
+    headers = [INTERFACE_HEADERS[f] for f in fields]
+    widths = [max([len(h)] + [len(r[n]) for r in rows]) for n, h in enumerate(headers)]
+    lines = ["  ".join(f"{c:<{w}}" for c, w in zip(row, widths)).rstrip()
+             for row in [headers] + rows]
+    return "\n".join(lines)
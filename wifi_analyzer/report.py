@@ -4,119 +4,246 @@ Este módulo contiene utilidades para componer el reporte en texto plano
 con los perfiles detectados y metadatos del sistema.
 """
 
+import io
 import os
 import platform
 from datetime import datetime
 
-
-def format_results(profiles_data: dict, extra: dict | None = None) -> str:
-    """Construye el reporte en texto plano a partir de los resultados.
+# Orden de las secciones opcionales en el reporte.
+SECTION_KEYS = ('interfaces', 'drivers', 'ipconfig', 'getmac', 'exports')
+
+# Título de cada sección opcional según el sistema (comando de origen).
+SECTION_TITLES = {
+    'Windows': {
+        'interfaces': "[netsh wlan show interfaces]",
+        'drivers': "[netsh wlan show drivers]",
+        'ipconfig': "[ipconfig /all]",
+        'getmac': "[getmac]",
+        'exports': "[netsh wlan export profile]",
+    },
+    'Linux': {
+        'interfaces': "[nmcli device status]",
+        'drivers': "[nmcli -t -f GENERAL.DEVICE,GENERAL.TYPE,GENERAL.DRIVER,GENERAL.HWADDR device show]",
+        'ipconfig': "[ip -j address]",
+        'getmac': "[ip -j address: interfaz, estado, MAC]",
+        'exports': "[nmcli connection show <NAME>]",
+    },
+}
+
+
+def section_title(system_name: str, section: str) -> str:
+    """Título de una sección opcional; los sistemas no Windows usan los de Linux."""
+    titles = SECTION_TITLES['Windows' if system_name == 'Windows' else 'Linux']
+    return titles.get(section, "")
+
+
+def host_info(system_name: str) -> tuple[str, str]:
+    """Devuelve (equipo, usuario) de la sesión actual."""
+    if system_name == 'Windows':
+        computer = os.environ.get('COMPUTERNAME', 'Desconocido')
+        user = os.environ.get('USERNAME', 'Desconocido')
+    else:
+        computer = os.uname().nodename if hasattr(os, 'uname') else os.environ.get('HOSTNAME', 'Desconocido')
+        user = os.environ.get('USER', 'Desconocido')
+    return computer, user
+
+
+def _profile_table(profiles_data: dict) -> list[str]:
+    """Líneas de la tabla de perfiles (anchos calculados en una sola pasada)."""
+    headers = ("Perfil", "Contrasena")
+    # Ordenar perfiles alfabéticamente para una lectura consistente
+    rows = sorted(((str(p), str(pw)) for p, pw in profiles_data.items()), key=lambda r: r[0].lower())
+    name_width, pass_width = len(headers[0]), len(headers[1])
+    for name, password in rows:
+        if len(name) > name_width:
+            name_width = len(name)
+        if len(password) > pass_width:
+            pass_width = len(password)
+
+    border = "+" + "-" * (name_width + 2) + "+" + "-" * (pass_width + 2) + "+\n"
+    lines = [border, f"| {headers[0]:<{name_width}} | {headers[1]:<{pass_width}} |\n", border]
+    lines.extend(f"| {name:<{name_width}} | {password:<{pass_width}} |\n" for name, password in rows)
+    lines.append(border)
+    return lines
+
+
+def _inventory_table(inventory: dict) -> list[str]:
+    """Líneas de la tabla del modo solo metadatos (sin columna de clave)."""
+    # Import local: `formatters` importa este módulo
+    from wifi_analyzer.formatters import table_cell as _cell
+
+    headers = ("Perfil", "SSID", "Autenticacion", "Cifrado", "Autoconexion", "Ultimo uso")
+
+    rows = sorted(
+        ((str(p), _cell(r.ssid), _cell(r.auth), _cell(r.cipher),
+          _cell(r.autoconnect), _cell(r.last_used))
+         for p, r in inventory.items()),
+        key=lambda r: r[0].lower(),
+    )
+    widths = [len(h) for h in headers]
+    for row in rows:
+        for i, cell in enumerate(row):
+            if len(cell) > widths[i]:
+                widths[i] = len(cell)
+
+    def _line(cells):
+        return "| " + " | ".join(f"{c:<{w}}" for c, w in zip(cells, widths)) + " |\n"
+
+    border = "+" + "+".join("-" * (w + 2) for w in widths) + "+\n"
+    lines = [border, _line(headers), border]
+    lines.extend(_line(row) for row in rows)
+    lines.append(border)
+    return lines
+
+
+def write_report(sink, profiles_data: dict, extra: dict | None = None,
+                 inventory: dict | None = None) -> None:
+    """Escribe el reporte en texto plano sección por sección.
 
     Parámetros:
-        profiles_data: Mapeo {perfil: contraseña} obtenido del análisis.
+        sink: Cualquier objeto con método `write(str)` (archivo, stdout,
+              `io.StringIO`, adaptador de widget...).
+        profiles_data: Mapeo {perfil: ProfileRecord} obtenido del análisis
+                       (`str(registro)` es la contraseña).
         extra: Secciones adicionales opcionales en forma de dict con claves
                como 'interfaces', 'drivers', 'ipconfig', 'getmac', 'exports', etc.
+        inventory: Registros {perfil: ProfileRecord} del modo solo metadatos;
+                   sustituye a la tabla de claves.
 
-    Retorna:
-        Cadena con el reporte formateado en texto plano.
+    Las secciones adicionales se escriben directamente en `sink` sin
+    concatenarlas en memoria, por grandes que sean.
     """
+    write = sink.write
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
     system_name = platform.system()
-    if system_name == 'Windows':
-        computer = os.environ.get('COMPUTERNAME', 'Desconocido')
-        user = os.environ.get('USERNAME', 'Desconocido')
-    else:
-        computer = os.uname().nodename if hasattr(os, 'uname') else os.environ.get('HOSTNAME', 'Desconocido')
-        user = os.environ.get('USER', 'Desconocido')
+    computer, user = host_info(system_name)
+    rule = '=' * 50
 
     # Cabecera del reporte con metadatos de ejecución.
-    message = f"""
-REPORTE DE ANALISIS WI-FI
-Fecha y hora: {timestamp}
-Equipo: {computer}
-Usuario: {user}
-
-{'='*50}
-PERFILES WI-FI Y CONTRASENAS ENCONTRADAS
-{'='*50}
-
-"""
-
-    if profiles_data:
-        # Cálculo de anchos de columna para una tabla alineada.
-        headers = ("Perfil", "Contrasena")
-        # Ordenar perfiles alfabéticamente para una lectura consistente
-        sorted_items = sorted(profiles_data.items(), key=lambda kv: str(kv[0]).lower())
-        name_width = max(len(headers[0]), max(len(str(p)) for p, _ in sorted_items))
-        pass_width = max(len(headers[1]), max(len(str(pw)) for _, pw in sorted_items))
+    write("".join([
+        "\nREPORTE DE ANALISIS WI-FI\n",
+        f"Fecha y hora: {timestamp}\n",
+        f"Equipo: {computer}\n",
+        f"Usuario: {user}\n\n",
+    ]))
+
+    if inventory:
+        write(f"{rule}\nPERFILES WI-FI (SOLO METADATOS, SIN CLAVES)\n{rule}\n\n")
+        write("".join(_inventory_table(inventory)))
+    else:
+        write(f"{rule}\nPERFILES WI-FI Y CONTRASENAS ENCONTRADAS\n{rule}\n\n")
+        if profiles_data:
+            write("".join(_profile_table(profiles_data)))
+        else:
+            write("No se encontraron perfiles con contrasenas.\n")
 
-        border = "+" + "-" * (name_width + 2) + "+" + "-" * (pass_width + 2) + "+\n"
-        header_row = f"| {headers[0]:<{name_width}} | {headers[1]:<{pass_width}} |\n"
+    # Secciones adicionales opcionales (si se proporcionan).
+    if extra:
+        write(f"\n{rule}\nINFORMACIÓN ADICIONAL DEL SISTEMA ({system_name})\n{rule}\n\n")
+        for section in SECTION_KEYS:
+            content = extra.get(section)
+            if not content:
+                continue
+            write(section_title(system_name, section) + "\n")
+            write(content.rstrip())
+            write("\n\n")
 
-        message += border
-        message += header_row
-        message += border
+    # Aviso legal y delimitadores finales.
+    write(_legal_notice(rule))
 
-        for profile, password in sorted_items:
-            message += f"| {profile:<{name_width}} | {password:<{pass_width}} |\n"
 
-        message += border
-    else:
-        message += "No se encontraron perfiles con contrasenas.\n"
+def _legal_notice(rule: str) -> str:
+    return "".join([
+        f"\n{rule}\n",
+        "USO AUTORIZADO: Este informe se proporciona únicamente con propósitos educativos y de aprendizaje.\n",
+        "Empléelo solo en dispositivos de su propiedad o con permiso previo y explícito del titular.\n",
+        f"{rule}\n",
+    ])
 
-    # Secciones adicionales opcionales (si se proporcionan).
-    if extra:
-        message += f"\n{'='*50}\n"
-        message += f"INFORMACIÓN ADICIONAL DEL SISTEMA ({system_name})\n"
-        message += f"{'='*50}\n\n"
-
-        if system_name == 'Windows':
-            if extra.get('interfaces'):
-                message += "[netsh wlan show interfaces]\n"
-                message += extra['interfaces'].rstrip() + "\n\n"
-
-            if extra.get('drivers'):
-                message += "[netsh wlan show drivers]\n"
-                message += extra['drivers'].rstrip() + "\n\n"
-
-            if extra.get('ipconfig'):
-                message += "[ipconfig /all]\n"
-                message += extra['ipconfig'].rstrip() + "\n\n"
-
-            if extra.get('getmac'):
-                message += "[getmac]\n"
-                message += extra['getmac'].rstrip() + "\n\n"
-
-            if extra.get('exports'):
-                message += "[netsh wlan export profile]\n"
-                message += extra['exports'].rstrip() + "\n\n"
-        else:
-            if extra.get('interfaces'):
-                message += "[nmcli device status]\n"
-                message += extra['interfaces'].rstrip() + "\n\n"
 
-            if extra.get('drivers'):
-                message += "[nmcli -t -f DEVICE,TYPE,GENERAL.DRIVER,GENERAL.HWADDR device show]\n"
-                message += extra['drivers'].rstrip() + "\n\n"
+def format_results(profiles_data: dict, extra: dict | None = None,
+                   inventory: dict | None = None) -> str:
+    """Construye el reporte en texto plano a partir de los resultados.
 
-            if extra.get('ipconfig'):
-                message += "[ip address]\n"
-                message += extra['ipconfig'].rstrip() + "\n\n"
+    Parámetros:
+        profiles_data: Mapeo {perfil: contraseña} obtenido del análisis.
+        extra: Secciones adicionales opcionales (ver `write_report`).
+        inventory: Metadatos del modo solo metadatos (ver `write_report`).
 
-            if extra.get('getmac'):
-                message += "[ip -br link]\n"
-                message += extra['getmac'].rstrip() + "\n\n"
+    Retorna:
+        Cadena con el reporte formateado en texto plano.
+    """
+    buf = io.StringIO()
+    write_report(buf, profiles_data, extra, inventory)
+    return buf.getvalue()
+
+
+# Títulos de cada grupo del reporte de cambios y de sus campos.
+DIFF_GROUPS = (('profiles', "PERFILES"), ('interfaces', "INTERFACES"))
+DIFF_FIELD_LABELS = {
+    'ssid': "SSID",
+    'auth': "Autenticacion",
+    'cipher': "Cifrado",
+    'autoconnect': "Autoconexion",
+    'cost': "Costo",
+    'key_status': "Estado de la clave",
+    'key_hash': "Clave",
+    'kind': "Tipo",
+    'state': "Estado",
+    'mac': "MAC",
+    'mtu': "MTU",
+    'driver': "Driver",
+    'addresses': "Direcciones",
+}
+
+
+def write_diff_report(sink, changes: dict) -> None:
+    """Escribe solo los perfiles e interfaces añadidos, eliminados o modificados.
 
-            if extra.get('exports'):
-                message += "[nmcli connection show <NAME>]\n"
-                message += extra['exports'].rstrip() + "\n\n"
+    Parámetros:
+        sink: Cualquier objeto con método `write(str)`.
+        changes: Resultado de `fingerprint.diff` ({'since', 'profiles', 'interfaces'}).
 
-    # Aviso legal y delimitadores finales.
-    message += f"\n{'='*50}\n"
-    message += "USO AUTORIZADO: Este informe se proporciona únicamente con propósitos educativos y de aprendizaje.\n"
-    message += "Empléelo solo en dispositivos de su propiedad o con permiso previo y explícito del titular.\n"
-    message += f"{'='*50}\n"
+    Las claves nunca aparecen: un cambio de clave se indica sin mostrar valores.
+    """
+    from wifi_analyzer.formatters import table_cell as _cell
 
-    return message
+    write = sink.write
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    computer, user = host_info(platform.system())
+    since = changes.get('since')
+    rule = '=' * 50
+
+    write("".join([
+        "\nREPORTE DE CAMBIOS WI-FI\n",
+        f"Fecha y hora: {timestamp}\n",
+        f"Equipo: {computer}\n",
+        f"Usuario: {user}\n",
+        f"Comparado con: {since or 'sin analisis previo (todo aparece como nuevo)'}\n\n",
+    ]))
+
+    empty = True
+    for group, heading in DIFF_GROUPS:
+        entries = changes.get(group)
+        if not entries or not (entries['added'] or entries['removed'] or entries['changed']):
+            continue
+        empty = False
+        write(f"{heading}\n")
+        for name in entries['added']:
+            write(f"  + {name}\n")
+        for name in entries['removed']:
+            write(f"  - {name}\n")
+        for name, fields in entries['changed'].items():
+            write(f"  ~ {name}\n")
+            for field, (old, new) in fields.items():
+                label = DIFF_FIELD_LABELS.get(field, field)
+                if field == 'key_hash':
+                    write(f"      {label}: modificada\n")
+                else:
+                    write(f"      {label}: {_cell(old)} -> {_cell(new)}\n")
+        write("\n")
+    if empty:
+        write("Sin cambios desde el analisis anterior.\n")
+
+    write(_legal_notice(rule))
 
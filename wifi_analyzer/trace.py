@@ -0,0 +1,153 @@
+"""Instrumentación de comandos externos y etapas del análisis.
+
+Con la instrumentación activa (`enable()`), cada comando lanzado por
+`commands.run()` y cada etapa marcada con `stage()`/`traced()` registra su duración,
+código de salida, bytes de salida y si se agotó el tiempo. Los registros pueden
+resumirse en una tabla (`summary()`) o exportarse como línea de tiempo en
+formato Chrome Trace (`export_chrome_trace()`, abrir en chrome://tracing o
+Perfetto). Desactivada, el costo es una comprobación booleana por llamada.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_events = []
+_enabled = False
+_origin = time.perf_counter()
+
+
+def enable() -> None:
+    global _enabled, _origin
+    with _lock:
+        _events.clear()
+        _origin = time.perf_counter()
+        _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def events() -> list[dict]:
+    with _lock:
+        return list(_events)
+
+
+def record(kind: str, name: str, started: float, duration: float, **fields) -> None:
+    """Añade un evento (tiempos en segundos de `time.perf_counter`)."""
+    if not _enabled:
+        return
+    event = {
+        'kind': kind,
+        'name': name,
+        'start': started - _origin,
+        'duration': duration,
+        'thread': threading.current_thread().name,
+        'tid': threading.get_ident(),
+        **fields,
+    }
+    with _lock:
+        _events.append(event)
+
+
+@contextmanager
+def stage(name: str):
+    """Marca una etapa del análisis (analyze, extras, format, save, send)."""
+    if not _enabled:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record('stage', name, started, time.perf_counter() - started)
+
+
+def traced(name: str):
+    """Decorador equivalente a envolver la función en `stage(name)`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _command_key(command: str) -> str:
+    """Herramienta y subcomando (`nmcli connection show`), sin opciones ni sus valores."""
+    words = []
+    skip = False
+    for part in command.split():
+        if skip:
+            skip = False
+            continue
+        if part.startswith('-'):
+            # Opciones con valor en nmcli/ip (-f CAMPOS, -g CAMPOS)
+            skip = part in ('-f', '-g', '--fields', '--get-values')
+            continue
+        words.append(part)
+        if len(words) == 3:
+            break
+    return ' '.join(words)
+
+
+def summary() -> str:
+    """Tabla de texto con etapas y comandos agregados por herramienta."""
+    evs = events()
+    lines = [f"{'tipo':<8} {'nombre':<34} {'n':>5} {'total(s)':>9} {'max(s)':>8} {'bytes':>10} {'fallos':>7}"]
+    groups = {}
+    for ev in evs:
+        if ev['kind'] == 'stage':
+            key = ('etapa', ev['name'])
+        else:
+            # Se agrupa por herramienta y subcomando para no listar cada perfil
+            key = ('comando', _command_key(ev['name']))
+        g = groups.setdefault(key, {'n': 0, 'total': 0.0, 'max': 0.0, 'bytes': 0, 'fails': 0})
+        g['n'] += 1
+        g['total'] += ev['duration']
+        g['max'] = max(g['max'], ev['duration'])
+        g['bytes'] += ev.get('out_bytes', 0)
+        if ev['kind'] == 'command' and ev.get('returncode') != 0:
+            g['fails'] += 1
+    for (kind, name), g in sorted(groups.items(), key=lambda kv: (kv[0][0] != 'etapa', -kv[1]['total'])):
+        lines.append(f"{kind:<8} {name[:34]:<34} {g['n']:>5} {g['total']:>9.3f} {g['max']:>8.3f} "
+                     f"{g['bytes']:>10} {g['fails']:>7}")
+    return "\n".join(lines)
+
+
+def export_chrome_trace(path: str) -> None:
+    """Escribe los eventos en formato Chrome Trace (JSON)."""
+    pid = os.getpid()
+    trace_events = []
+    threads = {}
+    for ev in events():
+        threads.setdefault(ev['tid'], ev['thread'])
+        args = {k: v for k, v in ev.items()
+                if k not in ('kind', 'name', 'start', 'duration', 'thread', 'tid')}
+        trace_events.append({
+            'name': ev['name'],
+            'cat': ev['kind'],
+            'ph': 'X',
+            'ts': round(ev['start'] * 1e6),
+            'dur': round(ev['duration'] * 1e6),
+            'pid': pid,
+            'tid': ev['tid'],
+            'args': args,
+        })
+    # Metadatos para mostrar el nombre de cada hilo en el visor
+    for tid, name in threads.items():
+        trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                             'args': {'name': name}})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
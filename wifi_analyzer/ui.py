@@ -6,11 +6,193 @@ mostrar/guardar el reporte y enviarlo por correo.
 """
 
 import os
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk
 from tkinter import scrolledtext, filedialog, messagebox
 from email.utils import parseaddr
 
+from wifi_analyzer import formatters
+from wifi_analyzer import monitor as monitor_mod
+from wifi_analyzer import report as report_mod
+from wifi_analyzer.records import format_interfaces
+
+
+class _TaskRunner:
+    """Ejecuta un trabajo a la vez en un hilo de fondo.
+
+    Tkinter no es seguro entre hilos: el trabajo nunca toca widgets y
+    entrega sus resultados (y avances intermedios vía `post`) a una cola
+    que se vacía en el hilo principal mediante `root.after`.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, root, on_busy=None):
+        self.root = root
+        self.on_busy = on_busy
+        self.cancel_event = threading.Event()
+        self.busy = False
+        self._queue = queue.Queue()
+
+    def post(self, callback, *args):
+        """Programa `callback(*args)` en el hilo de Tk (seguro desde cualquier hilo)."""
+        self._queue.put((callback, args))
+
+    def submit(self, work, on_done=None, on_error=None) -> bool:
+        """Lanza `work()` en segundo plano; False si ya hay un trabajo activo."""
+        if self.busy:
+            return False
+        self.busy = True
+        self.cancel_event.clear()
+        if self.on_busy is not None:
+            self.on_busy(True)
+
+        def _run():
+            try:
+                result = work()
+            except Exception as e:
+                self.post(self._finish, on_error, e)
+            else:
+                self.post(self._finish, on_done, result)
+
+        threading.Thread(target=_run, name='wifi-gui-task', daemon=True).start()
+        self.root.after(self.POLL_MS, self._poll)
+        return True
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _finish(self, callback, value):
+        self.busy = False
+        if self.on_busy is not None:
+            self.on_busy(False)
+        if callback is not None:
+            callback(value)
+
+    def _poll(self):
+        try:
+            while True:
+                callback, args = self._queue.get_nowait()
+                callback(*args)
+        except queue.Empty:
+            pass
+        if self.busy or not self._queue.empty():
+            self.root.after(self.POLL_MS, self._poll)
+
+
+class _ReportIndex:
+    """Índice en memoria de las líneas de un reporte para filtrarlas al instante.
+
+    Se construye una vez por reporte (en el hilo de fondo): cada línea guarda
+    su versión en minúsculas y el bloque al que pertenece (tabla de perfiles
+    o sección adicional), de modo que un filtro devuelve las líneas que
+    coinciden agrupadas bajo su título, sin volver a generar el reporte.
+    Si el nuevo texto amplía el anterior (se siguen escribiendo letras), solo
+    se buscan las coincidencias previas.
+    """
+
+    _TITLES = frozenset(t for titles in report_mod.SECTION_TITLES.values() for t in titles.values())
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lines = text.splitlines()
+        self.lowered = [line.lower() for line in self.lines]
+        # Por línea: índice del bloque; por bloque: líneas de encabezado
+        self.block_of = []
+        self.block_heads = []
+        block = -1
+        table = False
+        for n, line in enumerate(self.lines):
+            stripped = line.strip()
+            heading = (0 < n < len(self.lines) - 1 and stripped
+                       and self.lines[n - 1].startswith('=====')
+                       and self.lines[n + 1].startswith('====='))
+            if heading or stripped in self._TITLES or stripped.startswith("INFORMACIÓN ADICIONAL:"):
+                block += 1
+                self.block_heads.append([n])
+                # Solo los bloques con título entre reglas contienen la tabla de perfiles
+                table = bool(heading)
+            elif table and stripped[:1] in ('+', '|') and len(self.block_heads[block]) < 4:
+                # Borde superior, fila de encabezado y borde: se muestran siempre
+                self.block_heads[block].append(n)
+            self.block_of.append(block)
+        self._last_query = None
+        self._last_matches = range(len(self.lines))
+
+    def search(self, query: str) -> list[int]:
+        """Números de línea que contienen `query` (sin distinguir mayúsculas)."""
+        query = query.strip().lower()
+        if not query:
+            return list(range(len(self.lines)))
+        candidates = range(len(self.lines))
+        if self._last_query and query.startswith(self._last_query):
+            candidates = self._last_matches
+        lowered = self.lowered
+        matches = [n for n in candidates if query in lowered[n]]
+        self._last_query, self._last_matches = query, matches
+        return matches
+
+    def render(self, query: str) -> tuple[list[str], int]:
+        """Líneas a mostrar para `query` y número de coincidencias."""
+        if not query.strip():
+            return self.lines, len(self.lines)
+        matches = self.search(query)
+        out = []
+        current = None
+        for n in matches:
+            block = self.block_of[n]
+            heads = self.block_heads[block] if block >= 0 else ()
+            if block != current:
+                if out:
+                    out.append("")
+                out.extend(self.lines[h] for h in heads)
+                current = block
+            if n not in heads:
+                out.append(self.lines[n])
+        return out, len(matches)
+
+
+class _ChunkedRenderer:
+    """Inserta texto largo en un widget por bloques programados con `root.after`.
+
+    Cada bloque inserta `CHUNK_LINES` líneas y cede el control al bucle de
+    Tk, por lo que la ventana sigue respondiendo con reportes de cientos de
+    KB. Un nuevo `render` (o `cancel`) descarta el que estuviera en curso.
+    """
+
+    CHUNK_LINES = 400
+
+    def __init__(self, root, widget):
+        self.root = root
+        self.widget = widget
+        self._job = None
+
+    def cancel(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def render(self, lines, on_done=None):
+        self.cancel()
+        self.widget.delete(1.0, tk.END)
+        self._step(lines, 0, on_done)
+
+    def _step(self, lines, start, on_done):
+        end = start + self.CHUNK_LINES
+        chunk = "\n".join(lines[start:end])
+        if end < len(lines):
+            chunk += "\n"
+        self.widget.insert(tk.END, chunk)
+        if end < len(lines):
+            self._job = self.root.after(1, self._step, lines, end, on_done)
+        else:
+            self._job = None
+            if on_done is not None:
+                on_done()
+
 
 def run_gui(analyzer):
     root = tk.Tk()
@@ -58,57 +240,199 @@ def run_gui(analyzer):
     chk_extra = ttk.Checkbutton(controls, text="Incluir información adicional", variable=include_extra)
     chk_extra.pack(side=tk.LEFT)
 
+    # Solo inventario: el análisis no solicita ninguna clave
+    metadata_only = tk.BooleanVar(value=analyzer.metadata_only)
+    chk_metadata = ttk.Checkbutton(controls, text="Solo metadatos (sin claves)", variable=metadata_only)
+    chk_metadata.pack(side=tk.LEFT, padx=(10, 0))
+
     # Subframe de botones para secciones específicas
     sections_frame = ttk.Frame(root, padding=(10, 0, 10, 0))
     sections_frame.pack(side=tk.TOP, fill=tk.X)
 
-    def show_section(section_key: str):
-        title, content = analyzer.get_optional_section(section_key)
-        output.delete(1.0, tk.END)
-        if title:
-            output.insert(tk.END, f"INFORMACIÓN ADICIONAL: {title}\n\n")
-        if content.strip():
-            output.insert(tk.END, content)
+    def set_busy(busy: bool):
+        state = tk.DISABLED if busy else tk.NORMAL
+        for w in action_buttons:
+            w.configure(state=state)
+        btn_cancel.configure(state=tk.NORMAL if busy else tk.DISABLED)
+        if not busy:
+            progress.stop()
+            progress.configure(mode='determinate', value=0)
+
+    runner = _TaskRunner(root, on_busy=set_busy)
+
+    def start_indeterminate():
+        progress.configure(mode='indeterminate')
+        progress.start(10)
+
+    # Reporte mostrado e índice para el filtro (se reemplazan en cada resultado)
+    current = {'index': None}
+
+    def show_index(index):
+        current['index'] = index
+        apply_filter()
+
+    def apply_filter():
+        index = current['index']
+        if index is None:
+            return
+        query = filter_text.get()
+        lines, matched = index.render(query)
+        if query.strip():
+            filter_status.configure(text=f"{matched} de {len(index.lines)} líneas")
         else:
-            output.insert(tk.END, "No hay información disponible para esta sección.")
+            filter_status.configure(text="")
+        renderer.render(lines)
+
+    def section_work(section_key: str):
+        title, content = analyzer.get_optional_section(section_key)
+        header = f"INFORMACIÓN ADICIONAL: {title}\n\n" if title else ""
+        body = content if content.strip() else "No hay información disponible para esta sección."
+        return _ReportIndex(header + body)
+
+    def show_section(section_key: str):
+        stop_monitor()
+        analyzer.metadata_only = metadata_only.get()
+        if runner.submit(lambda: section_work(section_key), on_done=show_index,
+                         on_error=lambda e: messagebox.showerror("Error", f"Ocurrió un error: {e}")):
+            start_indeterminate()
 
     btn_interfaces = ttk.Button(sections_frame, text="Interfaces", command=lambda: show_section('interfaces'))
     btn_drivers = ttk.Button(sections_frame, text="Drivers", command=lambda: show_section('drivers'))
     btn_ipconfig = ttk.Button(sections_frame, text="IP Config", command=lambda: show_section('ipconfig'))
     btn_mac = ttk.Button(sections_frame, text="Direcciones MAC", command=lambda: show_section('getmac'))
     btn_export = ttk.Button(sections_frame, text="Exportar perfiles", command=lambda: show_section('exports'))
+    btn_monitor = ttk.Button(sections_frame, text="Monitor en vivo", command=lambda: toggle_monitor())
+    # Las secciones se reutilizan durante la sesión; este botón fuerza a recolectarlas de nuevo.
+    btn_refresh = ttk.Button(sections_frame, text="Refrescar", command=analyzer.refresh_optional_info)
 
-    for w in (btn_interfaces, btn_drivers, btn_ipconfig, btn_mac, btn_export):
+    for w in (btn_interfaces, btn_drivers, btn_ipconfig, btn_mac, btn_export, btn_refresh, btn_monitor):
         w.pack(side=tk.LEFT, padx=5, pady=6)
 
+    # Monitor en vivo: un solo proceso de eventos; la vista se actualiza con cada cambio.
+    # La cola de eventos se revisa cada MONITOR_POLL_MS en el hilo de Tk (sin lanzar procesos).
+    MONITOR_POLL_MS = 500
+    live = {'monitor': None, 'job': None, 'log': []}
+
+    def render_monitor():
+        mon = live['monitor']
+        table = format_interfaces(mon.model.records(), monitor_mod.MODEL_FIELDS)
+        text = "MONITOR DE INTERFACES (en vivo)\n\n" + table
+        if live['log']:
+            text += "\n\nCAMBIOS RECIENTES\n" + "\n".join(reversed(live['log']))
+        show_index(_ReportIndex(text))
+
+    def poll_monitor():
+        live['job'] = None
+        mon = live['monitor']
+        if mon is None:
+            return
+        changes = mon.drain()
+        if changes:
+            stamp = time.strftime('%H:%M:%S')
+            live['log'] = (live['log'] + [f"{stamp} {c}" for c in changes])[-50:]
+            render_monitor()
+        if mon.finished:
+            stop_monitor()
+            return
+        live['job'] = root.after(MONITOR_POLL_MS, poll_monitor)
+
+    def stop_monitor():
+        if live['job'] is not None:
+            root.after_cancel(live['job'])
+            live['job'] = None
+        if live['monitor'] is not None:
+            live['monitor'].stop()
+            live['monitor'] = None
+        btn_monitor.configure(text="Monitor en vivo")
+
+    def toggle_monitor():
+        if live['monitor'] is not None:
+            stop_monitor()
+            return
+        source = monitor_mod.default_source()
+        if source is None:
+            messagebox.showinfo("Monitor", "El monitor en vivo requiere `ip` o `nmcli` (Linux).")
+            return
+        mon = monitor_mod.InterfaceMonitor(source, analyzer.get_interface_records)
+
+        def started(_records):
+            live['monitor'], live['log'] = mon, []
+            btn_monitor.configure(text="Detener monitor")
+            render_monitor()
+            live['job'] = root.after(MONITOR_POLL_MS, poll_monitor)
+
+        def failed(e):
+            mon.stop()
+            messagebox.showerror("Error", f"No se pudo iniciar el monitor: {e}")
+
+        # La instantánea inicial lanza comandos: se toma en segundo plano
+        if runner.submit(mon.start, on_done=started, on_error=failed):
+            start_indeterminate()
+
+    def on_profile_done(profile, password, done, total):
+        # Invocado desde hilos del pool: se reenvía al hilo de Tk.
+        def update():
+            renderer.cancel()
+            progress.configure(maximum=total, value=done)
+            output.insert(tk.END, f"[{done}/{total}] {profile}\n")
+            output.see(tk.END)
+        runner.post(update)
+
     def do_analyze():
-        try:
-            output.delete(1.0, tk.END)
-            ok = analyzer.analyze_wifi_profiles()
+        stop_monitor()
+        inc = include_extra.get()
+        analyzer.metadata_only = metadata_only.get()
+
+        def work():
+            ok = analyzer.analyze_wifi_profiles(on_progress=on_profile_done,
+                                                cancel_event=runner.cancel_event)
             if not ok:
-                messagebox.showerror("Error", "No se pudieron obtener perfiles Wi‑Fi.")
+                return None
+            # El índice del filtro se construye aquí, fuera del hilo de Tk
+            return _ReportIndex(analyzer.format_results(include_extra=inc))
+
+        def done(index):
+            if index is None:
+                current['index'] = None
+                renderer.cancel()
+                output.delete(1.0, tk.END)
+                if runner.cancel_event.is_set():
+                    output.insert(tk.END, "Análisis cancelado.")
+                else:
+                    messagebox.showerror("Error", "No se pudieron obtener perfiles Wi‑Fi.")
                 return
-            report = analyzer.format_results(include_extra=include_extra.get())
-            output.insert(tk.END, report)
-        except Exception as e:
-            messagebox.showerror("Error", f"Ocurrió un error: {e}")
+            show_index(index)
+
+        renderer.cancel()
+        output.delete(1.0, tk.END)
+        runner.submit(work, on_done=done,
+                      on_error=lambda e: messagebox.showerror("Error", f"Ocurrió un error: {e}"))
 
     def do_save():
-        try:
-            report = analyzer.format_results(include_extra=include_extra.get())
-            path = filedialog.asksaveasfilename(
-                title="Guardar reporte",
-                defaultextension=".txt",
-                filetypes=[("Texto", "*.txt"), ("Todos", "*.*")],
-                initialfile="wifi_results.txt",
-            )
-            if not path:
-                return
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(report)
-            messagebox.showinfo("Guardado", f"Reporte guardado en:\n{path}")
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo guardar: {e}")
+        if runner.busy:
+            return
+        path = filedialog.asksaveasfilename(
+            title="Guardar reporte",
+            defaultextension=".txt",
+            filetypes=[("Texto", "*.txt"), ("JSON", "*.json"), ("JSON Lines", "*.jsonl"),
+                       ("CSV", "*.csv"), ("Todos", "*.*")],
+            initialfile="wifi_results.txt",
+        )
+        if not path:
+            return
+        inc = include_extra.get()
+        # El formato se elige según la extensión indicada en el diálogo
+        fmt = formatters.format_for_path(path)
+
+        def work():
+            with open(path, "w", encoding="utf-8", newline="" if fmt == "csv" else None) as f:
+                analyzer.write_results(f, include_extra=inc, fmt=fmt)
+            return path
+
+        if runner.submit(work,
+                         on_done=lambda p: messagebox.showinfo("Guardado", f"Reporte guardado en:\n{p}"),
+                         on_error=lambda e: messagebox.showerror("Error", f"No se pudo guardar: {e}")):
+            start_indeterminate()
 
     def do_send_email():
         dlg = tk.Toplevel(root)
@@ -124,6 +448,7 @@ def run_gui(analyzer):
         ttk.Label(frm, text="Tu email:").grid(row=2, column=0, sticky=tk.W, pady=2)
         ttk.Label(frm, text="Tu contraseña:").grid(row=3, column=0, sticky=tk.W, pady=2)
         ttk.Label(frm, text="Destinatario:").grid(row=4, column=0, sticky=tk.W, pady=2)
+        ttk.Label(frm, text="Reporte:").grid(row=5, column=0, sticky=tk.W, pady=2)
 
         ent_smtp = ttk.Entry(frm, width=40)
         ent_port = ttk.Entry(frm, width=10)
@@ -137,12 +462,21 @@ def run_gui(analyzer):
         ent_pass.grid(row=3, column=1, sticky=tk.W)
         ent_rcpt.grid(row=4, column=1, sticky=tk.W)
 
+        # Reporte en el cuerpo o resumen + adjunto comprimido (más liviano de enviar)
+        attach_options = {"En el cuerpo del correo": None,
+                          "Adjunto comprimido (.gz)": 'gzip',
+                          "Adjunto comprimido (.zip)": 'zip'}
+        attach_choice = tk.StringVar(value="En el cuerpo del correo")
+        cmb_attach = ttk.Combobox(frm, textvariable=attach_choice, values=list(attach_options),
+                                  state='readonly', width=30)
+        cmb_attach.grid(row=5, column=1, sticky=tk.W)
+
         ent_port.insert(0, "587")
 
         def load_env_defaults():
             env = {}
             # 1) Variables de entorno del proceso
-            for k in ("SMTP_SERVER", "PORT", "EMAIL_USER", "APP_PASSWORD", "RECIPIENT_EMAIL"):
+            for k in ("SMTP_SERVER", "PORT", "EMAIL_USER", "APP_PASSWORD", "RECIPIENT_EMAIL", "ATTACHMENT"):
                 v = os.environ.get(k)
                 if v:
                     env[k] = v
@@ -157,7 +491,7 @@ def run_gui(analyzer):
                                 continue
                             k, v = line.split('=', 1)
                             k, v = k.strip(), v.strip().strip('"').strip("'")
-                            if k and v and k in ("SMTP_SERVER", "PORT", "EMAIL_USER", "APP_PASSWORD", "RECIPIENT_EMAIL"):
+                            if k and v and k in ("SMTP_SERVER", "PORT", "EMAIL_USER", "APP_PASSWORD", "RECIPIENT_EMAIL", "ATTACHMENT"):
                                 env.setdefault(k, v)
             except Exception:
                 pass
@@ -177,6 +511,9 @@ def run_gui(analyzer):
             if env.get("RECIPIENT_EMAIL"):
                 ent_rcpt.delete(0, tk.END)
                 ent_rcpt.insert(0, env["RECIPIENT_EMAIL"])
+            for label, value in attach_options.items():
+                if value and env.get("ATTACHMENT", "").lower() == value:
+                    attach_choice.set(label)
 
         load_env_defaults()
 
@@ -199,41 +536,91 @@ def run_gui(analyzer):
                 if not _is_valid_email(rcpt):
                     messagebox.showerror("Error", "El destinatario debe ser un correo válido (ej. destinatario@gmail.com).")
                     return
-                # Asegurar que hay datos analizados
-                if not analyzer.profiles_data:
-                    ok = analyzer.analyze_wifi_profiles()
-                    if not ok:
+                inc = include_extra.get()
+                compress = attach_options.get(attach_choice.get())
+
+                def work():
+                    # Asegurar que hay datos analizados
+                    if not analyzer.profiles_data:
+                        ok = analyzer.analyze_wifi_profiles(cancel_event=runner.cancel_event)
+                        if not ok:
+                            return None
+                    return analyzer.send_email(smtp, port, user, pwd, rcpt, include_extra=inc,
+                                               compress=compress)
+
+                def done(ok):
+                    if ok is None:
                         messagebox.showerror("Error", "No se pudieron obtener perfiles Wi‑Fi.")
-                        return
-                ok = analyzer.send_email(smtp, port, user, pwd, rcpt, include_extra=include_extra.get())
-                if ok:
-                    messagebox.showinfo("Éxito", "Correo enviado correctamente.")
-                    dlg.destroy()
-                else:
-                    try:
-                        from wifi_analyzer import email_utils
-                        detail = email_utils.get_last_error().strip()
-                    except Exception:
-                        detail = ""
-                    if detail:
-                        messagebox.showerror("Error", f"No se pudo enviar el correo.\n\nDetalle: {detail}")
+                    elif ok:
+                        messagebox.showinfo("Éxito", "Correo enviado correctamente.")
+                        if dlg.winfo_exists():
+                            dlg.destroy()
                     else:
-                        messagebox.showerror("Error", "No se pudo enviar el correo.")
+                        try:
+                            from wifi_analyzer import email_utils
+                            detail = email_utils.get_last_error().strip()
+                        except Exception:
+                            detail = ""
+                        if detail:
+                            messagebox.showerror("Error", f"No se pudo enviar el correo.\n\nDetalle: {detail}")
+                        else:
+                            messagebox.showerror("Error", "No se pudo enviar el correo.")
+
+                if runner.submit(work, on_done=done,
+                                 on_error=lambda e: messagebox.showerror("Error", f"Error enviando correo: {e}")):
+                    start_indeterminate()
             except Exception as e:
                 messagebox.showerror("Error", f"Error enviando correo: {e}")
 
         btns = ttk.Frame(frm)
-        btns.grid(row=5, column=0, columnspan=2, pady=10)
+        btns.grid(row=6, column=0, columnspan=2, pady=10)
         ttk.Button(btns, text="Enviar", command=send_now).pack(side=tk.LEFT, padx=5)
         ttk.Button(btns, text="Cancelar", command=dlg.destroy).pack(side=tk.LEFT, padx=5)
 
-    ttk.Button(controls, text="Analizar", command=do_analyze).pack(side=tk.LEFT, padx=5)
-    ttk.Button(controls, text="Guardar", command=do_save).pack(side=tk.LEFT, padx=5)
-    ttk.Button(controls, text="Enviar correo", command=do_send_email).pack(side=tk.LEFT, padx=5)
+    btn_analyze = ttk.Button(controls, text="Analizar", command=do_analyze)
+    btn_save = ttk.Button(controls, text="Guardar", command=do_save)
+    btn_email = ttk.Button(controls, text="Enviar correo", command=do_send_email)
+    btn_cancel = ttk.Button(controls, text="Cancelar", command=runner.cancel, state=tk.DISABLED)
+    for w in (btn_analyze, btn_save, btn_email, btn_cancel):
+        w.pack(side=tk.LEFT, padx=5)
+
+    # Progreso del trabajo en segundo plano (determinado durante el análisis)
+    progress = ttk.Progressbar(controls, mode='determinate', length=160)
+    progress.pack(side=tk.LEFT, padx=10)
+
+    # Botones que lanzan trabajos: se deshabilitan mientras hay uno activo
+    action_buttons = (btn_analyze, btn_save, btn_email, chk_metadata, btn_interfaces, btn_drivers,
+                      btn_ipconfig, btn_mac, btn_export, btn_refresh, btn_monitor)
+
+    # Filtro del reporte mostrado (perfil, SSID, interfaz...) sobre el índice en memoria
+    filter_frame = ttk.Frame(root, padding=(10, 0, 10, 0))
+    filter_frame.pack(side=tk.TOP, fill=tk.X)
+    ttk.Label(filter_frame, text="Filtrar:").pack(side=tk.LEFT)
+    filter_text = tk.StringVar()
+    ent_filter = tk.Entry(filter_frame, textvariable=filter_text, width=40, bg=ENTRY_BG, fg=FG,
+                          insertbackground=FG, relief=tk.FLAT)
+    ent_filter.pack(side=tk.LEFT, padx=5, pady=4)
+    ent_filter.bind('<Escape>', lambda _e: filter_text.set(""))
+    filter_status = ttk.Label(filter_frame, text="")
+    filter_status.pack(side=tk.LEFT, padx=5)
+    # Se espera una pausa breve al escribir antes de aplicar el filtro
+    filter_job = {'id': None}
+
+    def on_filter_change(*_args):
+        if filter_job['id'] is not None:
+            root.after_cancel(filter_job['id'])
+        filter_job['id'] = root.after(120, run_filter)
+
+    def run_filter():
+        filter_job['id'] = None
+        apply_filter()
+
+    filter_text.trace_add('write', on_filter_change)
 
     # Área de salida
     output = scrolledtext.ScrolledText(root, wrap=tk.WORD, font=("Courier New", 10))
     output.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    renderer = _ChunkedRenderer(root, output)
     # Colores para texto scrollable en modo oscuro
     output.configure(bg=ENTRY_BG, fg=FG, insertbackground=FG)
     # Ajustar colores del scrollbar (según disponibilidad de tema)
@@ -243,5 +630,10 @@ def run_gui(analyzer):
     except Exception:
         pass
 
+    def on_close():
+        stop_monitor()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()
 
@@ -0,0 +1,96 @@
+"""Ejecución concurrente acotada para consultas al sistema.
+
+Las consultas por perfil (`netsh ... key=clear`, `nmcli -s ...`) son
+independientes entre sí y pasan casi todo su tiempo esperando a un proceso
+externo, por lo que un pool de hilos pequeño reduce la latencia total a la
+de la llamada más lenta.
+"""
+
+# Límite por defecto de procesos simultáneos lanzados por el pool.
+DEFAULT_MAX_WORKERS = 8
+
+
+def map_bounded(func, items, max_workers: int = DEFAULT_MAX_WORKERS,
+                default=None, on_result=None) -> list:
+    """Aplica `func` a cada elemento usando como máximo `max_workers` hilos.
+
+    Parámetros:
+        func: Función de un argumento a aplicar sobre cada elemento.
+        items: Secuencia de elementos de entrada.
+        max_workers: Concurrencia máxima. Con 1 o menos se ejecuta en serie.
+        default: Valor usado cuando `func` lanza una excepción.
+        on_result: Callback opcional `(item, resultado)` invocado a medida
+                   que termina cada elemento (el orden puede variar).
+
+    Retorna:
+        Lista de resultados en el mismo orden que `items`.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def _call(item):
+        try:
+            value = func(item)
+        except Exception:
+            value = default
+        if on_result is not None:
+            on_result(item, value)
+        return value
+
+    workers = min(int(max_workers or 1), len(items))
+    if workers <= 1:
+        return [_call(item) for item in items]
+
+    # Importación diferida: el modo serie y el arranque no cargan el pool
+    from concurrent.futures import ThreadPoolExecutor
+
+    try:
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='wifi-worker')
+    except RuntimeError:
+        # Sin hilos disponibles: modo serie como respaldo.
+        return [_call(item) for item in items]
+
+    with pool:
+        futures = []
+        for item in items:
+            try:
+                futures.append(pool.submit(_call, item))
+            except RuntimeError:
+                break
+        # Los elementos que no se pudieron encolar se procesan en serie.
+        tail = [_call(item) for item in items[len(futures):]]
+        # Recoger en el orden de entrada para un resultado determinista.
+        return [f.result() for f in futures] + tail
+
+
+def gather(tasks: dict, timeout: float | None = None,
+           max_workers: int = DEFAULT_MAX_WORKERS) -> dict:
+    """Ejecuta tareas independientes en paralelo con un plazo global.
+
+    Parámetros:
+        tasks: {clave: función sin argumentos}.
+        timeout: Segundos máximos de espera; None espera a todas.
+        max_workers: Concurrencia máxima.
+
+    Retorna:
+        {clave: resultado} solo de las tareas que terminaron a tiempo y sin
+        error, en el orden de `tasks`. Las tareas que exceden el plazo siguen
+        en segundo plano pero no bloquean al llamador.
+    """
+    if not tasks:
+        return {}
+    from concurrent.futures import ThreadPoolExecutor, wait
+
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)),
+                              thread_name_prefix='wifi-gather')
+    try:
+        futures = {key: pool.submit(fn) for key, fn in tasks.items()}
+        wait(futures.values(), timeout=timeout)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    results = {}
+    for key, future in futures.items():
+        if future.done() and not future.cancelled() and future.exception() is None:
+            results[key] = future.result()
+    return results